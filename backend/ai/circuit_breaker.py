@@ -0,0 +1,102 @@
+"""
+Circuit breaker pentru generările Ollama: după eșecuri consecutive cererile sunt respinse
+imediat (fără să aștepte timeout-ul), iar după reset_timeout o singură cerere de probă
+decide dacă circuitul se închide din nou
+"""
+
+import os
+import time
+from typing import Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Circuitul e deschis: generarea nu a fost încercată"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Circuit Ollama deschis, reîncercare peste {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    closed: cererile trec; failure_threshold eșecuri consecutive deschid circuitul.
+    open: cererile sunt respinse cu CircuitOpenError până trece reset_timeout.
+    half_open: trec cel mult half_open_max_calls cereri de probă; o reușită închide
+    circuitul, un eșec îl redeschide.
+    """
+
+    def __init__(self, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None,
+                 half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold or int(os.getenv("OLLAMA_BREAKER_FAILURES", "5"))
+        self.reset_timeout = reset_timeout or float(os.getenv("OLLAMA_BREAKER_RESET_SECONDS", "15"))
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self.trials_in_flight = 0
+
+        self.opened = 0
+        self.rejected = 0
+        self.successes = 0
+        self.failures = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self.trials_in_flight = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Verifică înaintea unei generări; ridică CircuitOpenError dacă nu e permisă.
+        Returnează True pentru o cerere de probă (half_open), de dat înapoi la record().
+        """
+        state = self.state
+        if state == CLOSED:
+            return False
+        if state == HALF_OPEN and self.trials_in_flight < self.half_open_max_calls:
+            self.trials_in_flight += 1
+            return True
+
+        self.rejected += 1
+        retry_after = max(self.opened_at + self.reset_timeout - time.monotonic(), 0.0)
+        raise CircuitOpenError(retry_after)
+
+    def record(self, ok: Optional[bool], trial: bool = False):
+        """Rezultatul unei generări permise; ok=None (cerere anulată) nu schimbă starea"""
+        if trial:
+            self.trials_in_flight = max(self.trials_in_flight - 1, 0)
+        if ok is None:
+            return
+
+        if ok:
+            self.successes += 1
+            self.consecutive_failures = 0
+            if self._state != CLOSED:
+                self._state = CLOSED
+                print("✅ Circuit Ollama închis: generările reușesc din nou")
+            return
+
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self._state == HALF_OPEN or (self._state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+            self._state = OPEN
+            self.opened_at = time.monotonic()
+            self.opened += 1
+            print(f"🔴 Circuit Ollama deschis după {self.consecutive_failures} eșecuri consecutive")
+
+    def stats(self) -> Dict:
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_s": round(max(self.opened_at + self.reset_timeout - time.monotonic(), 0.0), 1) if state == OPEN else 0.0,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "successes": self.successes,
+            "failures": self.failures
+        }
@@ -0,0 +1,154 @@
+"""
+Asamblarea contextului pentru prompt într-un buget fix de tokeni: fragmentele sunt luate
+în ordinea relevanței, duplicatele aproape identice sunt eliminate, iar un fragment care nu
+mai încape întreg este tăiat la granița frazelor (se păstrează frazele cu termenii întrebării)
+"""
+
+import os
+from typing import Callable, Dict, List, Optional
+
+from .legal_chunker import SENTENCE_RE
+from .text_utils import estimate_tokens, tokenize
+
+class ContextPacker:
+    """
+    Umple bugetul CONTEXT_TOKEN_BUDGET (tokeni estimați, inclusiv antetul fiecărui fragment).
+    Dimensiunea promptului - și odată cu ea timpul de procesare a promptului în Ollama -
+    nu mai depinde de câte rezultate returnează căutarea sau de lungimea lor.
+    """
+
+    def __init__(self, budget_tokens: Optional[int] = None, dedupe_threshold: Optional[float] = None,
+                 min_snippet_tokens: int = 24):
+        self.budget_tokens = budget_tokens or int(os.getenv("CONTEXT_TOKEN_BUDGET", "600"))
+        # Similaritate Jaccard (pe grupuri de 3 cuvinte) peste care un fragment e considerat duplicat
+        self.dedupe_threshold = dedupe_threshold if dedupe_threshold is not None else float(os.getenv("CONTEXT_DEDUP_THRESHOLD", "0.8"))
+        self.min_snippet_tokens = min_snippet_tokens
+
+        self.packed = 0
+        self.tokens_used = 0
+        self.snippets = 0
+        self.trimmed = 0
+        self.duplicates = 0
+        self.over_budget = 0
+
+    def _shingles(self, text: str) -> set:
+        words = tokenize(text, min_length=1)
+        if len(words) < 3:
+            return set(words)
+        return {tuple(words[i:i + 3]) for i in range(len(words) - 2)}
+
+    def _is_duplicate(self, shingles: set, kept: List[set]) -> bool:
+        for other in kept:
+            union = len(shingles | other)
+            if union and len(shingles & other) / union >= self.dedupe_threshold:
+                return True
+        return False
+
+    def _trim(self, text: str, budget: int, query_terms: set, allow_cut: bool = False) -> Optional[str]:
+        """
+        Cele mai relevante fraze (după termenii întrebării, apoi după poziție) care încap în buget,
+        în ordinea din text; "..." marchează frazele omise. Cu allow_cut, dacă nicio frază nu încape,
+        prima frază ca relevanță e tăiată la nivel de cuvânt.
+        """
+        sentences = [sentence for sentence in SENTENCE_RE.split(text) if sentence.strip()]
+        ranked = sorted(
+            range(len(sentences)),
+            key=lambda i: (-len(query_terms.intersection(tokenize(sentences[i]))), i)
+        )
+
+        # Fiecare frază aleasă poate fi precedată de "..." (3 tokeni), plus unul la final
+        chosen, used = [], 3
+        for i in ranked:
+            tokens = estimate_tokens(sentences[i]) + 3
+            if used + tokens <= budget:
+                chosen.append(i)
+                used += tokens
+        if not chosen:
+            if not allow_cut or not sentences:
+                return None
+            words, used = [], 3
+            for word in sentences[ranked[0]].split():
+                used += estimate_tokens(word)
+                if used > budget:
+                    break
+                words.append(word)
+            return " ".join(words) + " ..." if words else None
+
+        chosen.sort()
+        parts = [sentences[chosen[0]]]
+        for previous, current in zip(chosen, chosen[1:]):
+            parts.append(sentences[current] if current == previous + 1 else f"... {sentences[current]}")
+        trimmed = " ".join(parts)
+        if chosen[0] > 0:
+            trimmed = f"... {trimmed}"
+        if chosen[-1] < len(sentences) - 1:
+            trimmed += " ..."
+        return trimmed
+
+    def pack(self, docs: List[Dict], query: str = "", header: Optional[Callable[[Dict, int], str]] = None,
+             text_key: str = "content", budget_tokens: Optional[int] = None) -> Dict:
+        """
+        docs: rezultatele căutării, deja ordonate după relevanță.
+        header(doc, număr): textul care precede fragmentul în prompt (ex. numărul și sursa), numărat
+        în buget; număr este poziția fragmentului în context (de la 1).
+        Returnează {"snippets": [{"doc", "header", "text", "tokens", "trimmed"}], "tokens_used", "budget",
+        "duplicates", "skipped"}.
+        """
+        budget = budget_tokens or self.budget_tokens
+        query_terms = set(tokenize(query))
+        snippets, kept_shingles = [], []
+        used = duplicates = skipped = 0
+
+        for doc in docs:
+            text = (doc.get(text_key) or "").strip()
+            if not text:
+                continue
+
+            shingles = self._shingles(text)
+            if self._is_duplicate(shingles, kept_shingles):
+                duplicates += 1
+                continue
+
+            header_text = header(doc, len(snippets) + 1) if header else ""
+            overhead = estimate_tokens(header_text)
+            remaining = budget - used - overhead
+            if remaining < self.min_snippet_tokens:
+                skipped += 1
+                continue
+
+            tokens = estimate_tokens(text)
+            trimmed = False
+            if tokens > remaining:
+                text = self._trim(text, remaining, query_terms, allow_cut=not snippets)
+                if text is None:
+                    skipped += 1
+                    continue
+                tokens = estimate_tokens(text)
+                trimmed = True
+
+            snippets.append({"doc": doc, "header": header_text, "text": text, "tokens": tokens, "trimmed": trimmed})
+            kept_shingles.append(shingles)
+            used += tokens + overhead
+
+        self.packed += 1
+        self.tokens_used += used
+        self.snippets += len(snippets)
+        self.trimmed += sum(1 for snippet in snippets if snippet["trimmed"])
+        self.duplicates += duplicates
+        self.over_budget += skipped
+
+        return {"snippets": snippets, "tokens_used": used, "budget": budget, "duplicates": duplicates, "skipped": skipped}
+
+    def stats(self) -> Dict:
+        return {
+            "budget_tokens": self.budget_tokens,
+            "prompts": self.packed,
+            "avg_context_tokens": round(self.tokens_used / self.packed, 1) if self.packed else 0.0,
+            "avg_snippets": round(self.snippets / self.packed, 2) if self.packed else 0.0,
+            "trimmed_snippets": self.trimmed,
+            "duplicates_dropped": self.duplicates,
+            "skipped_over_budget": self.over_budget
+        }
+
+# Singleton instance
+context_packer = ContextPacker()
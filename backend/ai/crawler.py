@@ -0,0 +1,184 @@
+"""
+Crawler concurent pentru încărcarea în masă a paginilor web: pool limitat de workeri,
+un singur client httpx, limite de concurență și de rată per host, reîncercări cu backoff
+"""
+
+import asyncio
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+class Crawler:
+    """
+    Descarcă o listă de URL-uri cu cel mult max_workers cereri simultane în total și
+    per_host_concurrency / per_host_rate per server, ca să nu supraîncărcăm site-urile primăriilor.
+    Starea per host este comună tuturor crawl-urilor care rulează în același timp.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, max_workers: Optional[int] = None, per_host_concurrency: Optional[int] = None,
+                 per_host_rate: Optional[float] = None, max_retries: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("CRAWLER_MAX_WORKERS", "16"))
+        self.per_host_concurrency = per_host_concurrency or int(os.getenv("CRAWLER_PER_HOST_CONCURRENCY", "4"))
+        # cereri pe secundă per host (0 = fără limită)
+        self.per_host_rate = per_host_rate if per_host_rate is not None else float(os.getenv("CRAWLER_PER_HOST_RATE", "5"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("CRAWLER_MAX_RETRIES", "3"))
+        self.backoff_base = float(os.getenv("CRAWLER_BACKOFF_BASE", "0.5"))
+        self.max_backoff = float(os.getenv("CRAWLER_MAX_BACKOFF", "30"))
+        self.timeout = float(os.getenv("CRAWLER_TIMEOUT", "30"))
+        self.user_agent = os.getenv("CRAWLER_USER_AGENT", "AvanChat-Legislativ/1.0 (+crawler)")
+
+        self._hosts: Dict[str, Dict] = {}
+        self._loop = None
+
+        # Metrici
+        self.total_requests = 0
+        self.total_retries = 0
+        self.total_failures = 0
+        self.total_bytes = 0
+
+    def _host_state(self, host: str) -> Dict:
+        """Semaforul și următorul slot de timp liber pentru un host (recreate la schimbarea event loop-ului)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._hosts = {}
+            self._loop = loop
+
+        state = self._hosts.get(host)
+        if state is None:
+            state = {"semaphore": asyncio.Semaphore(self.per_host_concurrency), "next_slot": 0.0}
+            self._hosts[host] = state
+        return state
+
+    async def _wait_for_rate_slot(self, state: Dict):
+        """Rezervă următorul slot liber pentru host și așteaptă până la el"""
+        if self.per_host_rate <= 0:
+            return
+        now = time.monotonic()
+        slot = max(now, state["next_slot"])
+        state["next_slot"] = slot + 1.0 / self.per_host_rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Backoff exponențial cu jitter; Retry-After (în secunde) are prioritate"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.strip().isdigit():
+                return min(float(retry_after), self.max_backoff)
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay + random.uniform(0, delay / 2), self.max_backoff)
+
+    def new_client(self) -> httpx.AsyncClient:
+        """Client cu pool de conexiuni dimensionat după numărul de workeri"""
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": self.user_agent},
+            limits=httpx.Limits(max_connections=self.max_workers, max_keepalive_connections=self.max_workers)
+        )
+
+    async def fetch(self, client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        Descarcă un URL respectând limitele hostului. Erorile de rețea, 429 și 5xx sunt reîncercate.
+        Returnează {"url", "success", "status_code", "response", "attempts"} sau {"success": False, "error"}
+        """
+        state = self._host_state(urlparse(url).netloc)
+        error = ""
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            async with state["semaphore"]:
+                await self._wait_for_rate_slot(state)
+                self.total_requests += 1
+                try:
+                    response = await client.get(url, headers=headers)
+                except httpx.HTTPError as e:
+                    error = str(e) or e.__class__.__name__
+
+            if response is not None:
+                if response.status_code in self.RETRY_STATUSES and attempt < self.max_retries:
+                    error = f"HTTP {response.status_code}"
+                else:
+                    self.total_bytes += len(response.content)
+                    if response.status_code >= 400:
+                        self.total_failures += 1
+                        return {"url": url, "success": False, "status_code": response.status_code,
+                                "error": f"HTTP {response.status_code}", "attempts": attempt + 1}
+                    return {"url": url, "success": True, "status_code": response.status_code,
+                            "response": response, "attempts": attempt + 1}
+
+            if attempt < self.max_retries:
+                self.total_retries += 1
+                await asyncio.sleep(self._retry_delay(attempt, response))
+
+        self.total_failures += 1
+        return {"url": url, "success": False, "error": error, "attempts": self.max_retries + 1}
+
+    async def crawl(self, urls: List[str],
+                    handler: Optional[Callable[[str, httpx.Response], Awaitable[Optional[Dict]]]] = None,
+                    progress: Optional[Callable[[int, int, Dict], None]] = None,
+                    headers: Optional[Callable[[str], Optional[Dict[str, str]]]] = None) -> List[Dict]:
+        """
+        Descarcă toate URL-urile cu un pool de workeri și un client comun.
+        handler(url, response) procesează pagina; dict-ul returnat e adăugat la rezultat.
+        progress(done, total, result) este apelat după fiecare URL (implicit: log la fiecare ~10%).
+        headers(url) dă headerele suplimentare ale cererii (ex. If-None-Match pentru GET condiționat).
+        Rezultatele păstrează ordinea URL-urilor primite.
+        """
+        results: List[Optional[Dict]] = [None] * len(urls)
+        pending = iter(enumerate(urls))
+        done = 0
+        started = time.perf_counter()
+
+        async def worker(client: httpx.AsyncClient):
+            nonlocal done
+            for index, url in pending:
+                page_started = time.perf_counter()
+                result = await self.fetch(client, url, headers(url) if headers else None)
+                response = result.pop("response", None)
+
+                if result["success"] and handler is not None:
+                    try:
+                        result.update(await handler(url, response) or {})
+                    except Exception as e:
+                        result.update({"success": False, "error": str(e)})
+
+                result["elapsed_ms"] = round((time.perf_counter() - page_started) * 1000, 1)
+                results[index] = result
+                done += 1
+                (progress or self._log_progress)(done, len(urls), result)
+
+        if urls:
+            async with self.new_client() as client:
+                workers = min(self.max_workers, len(urls))
+                await asyncio.gather(*(worker(client) for _ in range(workers)))
+
+        elapsed = time.perf_counter() - started
+        successful = sum(1 for result in results if result and result["success"])
+        print(f"🕸️ Crawl: {successful}/{len(urls)} pagini în {elapsed:.1f}s ({len(urls) / elapsed if elapsed else 0:.1f} pagini/s)")
+        return results
+
+    def _log_progress(self, done: int, total: int, result: Dict):
+        if done == total or done % max(1, total // 10) == 0:
+            print(f"📥 Crawl: {done}/{total} URL-uri procesate")
+
+    def stats(self) -> Dict:
+        return {
+            "max_workers": self.max_workers,
+            "per_host_concurrency": self.per_host_concurrency,
+            "per_host_rate": self.per_host_rate,
+            "hosts": len(self._hosts),
+            "total_requests": self.total_requests,
+            "total_retries": self.total_retries,
+            "total_failures": self.total_failures,
+            "total_bytes": self.total_bytes
+        }
+
+# Singleton instance
+crawler = Crawler()
@@ -0,0 +1,189 @@
+"""
+Snapshot pe disc pentru documentele sistemului RAG integrat.
+Fișier append-only: fiecare document (cu chunk-uri și termenii indexați) este
+scris la încărcare, iar la pornire fișierul este citit prin mmap.
+"""
+
+import asyncio
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import deque
+from typing import Dict, Iterator, List, Optional
+
+MAGIC = b"AVRAG01\n"
+RECORD_HEADER = struct.Struct("<II")  # lungime payload comprimat, crc32
+
+class DocumentStore:
+    """
+    Format: MAGIC urmat de înregistrări [header][payload JSON comprimat zlib].
+    Înregistrările sunt {"op": "put", "doc": ..., "terms": ...}, {"op": "delete", "id": ...} sau
+    {"op": "meta", "id": ..., "fields": ...} (câmpuri actualizate fără rescrierea documentului).
+    O înregistrare incompletă la final (scriere întreruptă) este ignorată și tăiată.
+
+    După start(), scrierile trec printr-o coadă golită de un task de fundal: serializarea,
+    compresia și fsync-ul rulează într-un thread, cu un singur fsync pentru toate
+    înregistrările adunate între timp. Fără start() (scripturi, teste) scrierea e imediată.
+    """
+
+    def __init__(self, path: str, retry_interval: float = 5.0):
+        self.path = path
+        self.retry_interval = retry_interval
+        self.records = 0  # înregistrări în fișier (pentru decizia de compactare)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._pending = deque()
+        self._file_lock = threading.Lock()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+        self.flushes = 0
+        self.flush_errors = 0
+
+    def load(self) -> Iterator[Dict]:
+        """Citește toate înregistrările valide din snapshot"""
+        self.records = 0
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+
+        valid_end = len(MAGIC)
+        with open(self.path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:len(MAGIC)] != MAGIC:
+                    raise ValueError(f"Fișierul {self.path} nu este un snapshot valid")
+
+                offset = len(MAGIC)
+                size = len(mm)
+                while offset + RECORD_HEADER.size <= size:
+                    length, checksum = RECORD_HEADER.unpack_from(mm, offset)
+                    start = offset + RECORD_HEADER.size
+                    end = start + length
+                    if end > size:
+                        break
+
+                    payload = mm[start:end]
+                    if zlib.crc32(payload) != checksum:
+                        break
+
+                    yield json.loads(zlib.decompress(payload))
+                    self.records += 1
+                    offset = valid_end = end
+
+                truncated = valid_end < size
+
+        if truncated:
+            print(f"⚠️ Snapshot incomplet, trunchiat la {valid_end} bytes: {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_end)
+
+    def append_document(self, doc_data: Dict, chunk_terms: List[Dict[str, int]]):
+        """Scrie un document nou (sau o versiune nouă a unui document existent)"""
+        self._write({"op": "put", "doc": doc_data, "terms": chunk_terms})
+
+    def append_metadata(self, doc_id: str, fields: Dict):
+        """Actualizează câmpuri ale unui document (ex. ETag), fără chunk-uri și termeni"""
+        self._write({"op": "meta", "id": doc_id, "fields": fields})
+
+    def append_delete(self, doc_id: str):
+        """Marchează un document ca șters"""
+        self._write({"op": "delete", "id": doc_id})
+
+    def _write(self, record: Dict):
+        if self._writer_task is None:
+            self._append([record])
+            return
+        self._pending.append(record)
+        self._wake.set()
+
+    # === Write-behind ===
+
+    async def start(self):
+        """Pornește task-ul de scriere în fundal"""
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def stop(self):
+        """Oprește task-ul de scriere și scrie înregistrările rămase"""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        await self.flush()
+
+    async def _writer_loop(self):
+        while True:
+            try:
+                # Cu înregistrări rămase după o eroare, reîncearcă periodic
+                await asyncio.wait_for(self._wake.wait(), timeout=self.retry_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Scrie înregistrările din coadă (un singur fsync pe batch), în ordinea în care au venit"""
+        if not self._pending:
+            return
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            while self._pending:
+                batch = list(self._pending)
+                self._pending.clear()
+                try:
+                    await asyncio.to_thread(self._append, batch)
+                    self.flushes += 1
+                except Exception as e:
+                    # Păstrează înregistrările pentru următoarea încercare
+                    self.flush_errors += 1
+                    self._pending.extendleft(reversed(batch))
+                    print(f"⚠️ Eroare scriere snapshot {self.path}: {e}")
+                    break
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def compact(self, documents: List[Dict], chunk_terms: Dict[str, List[Dict[str, int]]]):
+        """Rescrie snapshot-ul doar cu documentele curente (înlocuire atomică)"""
+        tmp_path = f"{self.path}.tmp"
+        with self._file_lock:
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(MAGIC)
+                    for doc_data in documents:
+                        f.write(self._encode({"op": "put", "doc": doc_data, "terms": chunk_terms.get(doc_data["id"], [])}))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self.records = len(documents)
+
+    def _append(self, records: List[Dict]):
+        data = b"".join(self._encode(record) for record in records)
+        with self._file_lock:
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "ab") as f:
+                if new_file:
+                    f.write(MAGIC)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self.records += len(records)
+
+    def _encode(self, record: Dict) -> bytes:
+        payload = zlib.compress(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 1)
+        return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
@@ -4,6 +4,16 @@ import os
 from collections import Counter
 import re
 
+from .text_utils import fold_diacritics
+
+_WORD_RE = re.compile(r'\w+')
+_DIGIT_RE = re.compile(r'\d')
+
+# Caracterele ASCII pe care _clean_text le înlocuiește cu spațiu ([^\w\s])
+_ASCII_PUNCTUATION_TABLE = str.maketrans({
+    chr(code): ' ' for code in range(128) if not re.match(r'[\w\s]', chr(code))
+})
+
 class SimpleEmbeddings:
     """Embeddings simplu pentru MVP - fără dependencies complexe"""
     
@@ -20,11 +30,21 @@ class SimpleEmbeddings:
     
     def embed_texts(self, texts: List[str]) -> list:
         """Creează embeddings pentru o listă de texte"""
-        embeddings = []
-        for text in texts:
-            embedding = self._text_to_vector(text)
-            embeddings.append(embedding)
-        return embeddings
+        return self.embed_batch(texts).tolist()
+    
+    def embed_batch(self, texts: List[str], vector_size: int = 50, dtype=np.float64,
+                    batch_size: int = 256) -> np.ndarray:
+        """
+        Creează embeddings pentru un batch de texte ca matrice NumPy (n_texte x vector_size).
+        Rezultatele sunt identice cu _text_to_vector, dar numărarea cuvintelor cheie,
+        simbolurile și normalizarea se fac vectorizat pe tot batch-ul.
+        """
+        matrix = np.zeros((len(texts), vector_size), dtype=np.float64)
+        
+        for start in range(0, len(texts), batch_size):
+            self._fill_batch(texts[start:start + batch_size], matrix[start:start + batch_size], vector_size)
+        
+        return matrix if dtype == np.float64 else matrix.astype(dtype)
     
     def embed_query(self, query: str) -> list:
         """Creează embedding pentru o întrebare"""
@@ -69,18 +89,74 @@ class SimpleEmbeddings:
             
         return vector
     
+    def _fill_batch(self, texts: List[str], out: np.ndarray, vector_size: int):
+        """Completează rândurile din out pentru un sub-batch de texte"""
+        if not texts:
+            return
+        
+        raw = np.array(texts, dtype=str)
+        # Lowercase + diacritice (ca în _clean_text). Înlocuirea punctuației cu spații
+        # nu schimbă aparițiile cuvintelor cheie, care sunt formate doar din litere
+        folded_texts = [fold_diacritics(text) for text in texts]
+        folded = np.array(folded_texts, dtype=str)
+        
+        # Primul set de features: numărul aparițiilor cuvintelor cheie, pe tot batch-ul
+        keywords = self.fiscal_keywords[:vector_size//2]
+        for i, keyword in enumerate(keywords):
+            out[:, i] = np.char.count(folded, keyword)
+        
+        # Al doilea set: features generale
+        feature_columns = []
+        start_idx = len(self.fiscal_keywords)
+        if start_idx < vector_size:
+            # Lungimea textului (normalizată)
+            word_counts = np.fromiter((self._count_words(text) for text in folded_texts),
+                                      dtype=np.float64, count=len(texts))
+            out[:, start_idx] = np.minimum(word_counts / 100.0, 1.0)
+            feature_columns.append(start_idx)
+            start_idx += 1
+        
+        if start_idx < vector_size:
+            # Numărul cifrelor (pentru sume, procente)
+            digit_counts = np.fromiter((self._count_digits(text) for text in texts),
+                                       dtype=np.float64, count=len(texts))
+            out[:, start_idx] = np.minimum(digit_counts / 10.0, 1.0)
+            feature_columns.append(start_idx)
+            start_idx += 1
+        
+        if start_idx < vector_size:
+            # Prezența simbolurilor de procent sau monedă
+            has_symbol = np.zeros(len(texts), dtype=bool)
+            for sym in ['%', 'lei', 'ron', 'euro']:
+                has_symbol |= np.char.find(raw, sym) >= 0
+            out[:, start_idx] = has_symbol
+            feature_columns.append(start_idx)
+        
+        # Normalizare. Suma cuvintelor cheie e un întreg exact, iar restul valorilor se
+        # adună cu sum() în aceeași ordine ca în _text_to_vector, ca rotunjirea să fie identică
+        keyword_totals = out[:, :len(keywords)].sum(axis=1)
+        rows = np.column_stack([keyword_totals] + [out[:, col] for col in feature_columns])
+        totals = np.array([sum(row) for row in rows.tolist()], dtype=np.float64)
+        
+        nonzero = totals > 0
+        out[nonzero] /= totals[nonzero, None]
+    
+    def _count_words(self, folded_text: str) -> int:
+        """Numărul de cuvinte din _clean_text(text), calculat fără regex pentru text ASCII"""
+        if folded_text.isascii():
+            return len(folded_text.translate(_ASCII_PUNCTUATION_TABLE).split())
+        return len(_WORD_RE.findall(folded_text))
+    
+    def _count_digits(self, text: str) -> int:
+        """Numărul de cifre din text (echivalent cu re.findall(r'\\d', text))"""
+        if text.isascii():
+            return sum(map(text.count, '0123456789'))
+        return len(_DIGIT_RE.findall(text))
+    
     def _clean_text(self, text: str) -> str:
         """Curăță și normalizează textul"""
-        # Conversie la lowercase
-        text = text.lower()
-        
-        # Înlocuiește diacriticele românești
-        replacements = {
-            'ă': 'a', 'â': 'a', 'î': 'i', 'ș': 's', 'ț': 't',
-            'ş': 's', 'ţ': 't'
-        }
-        for old, new in replacements.items():
-            text = text.replace(old, new)
+        # Conversie la lowercase și înlocuirea diacriticelor românești
+        text = fold_diacritics(text)
         
         # Păstrează doar litere, cifre și spații
         text = re.sub(r'[^\w\s]', ' ', text)
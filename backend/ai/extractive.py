@@ -0,0 +1,76 @@
+"""
+Răspunsuri extractive, fără LLM: frazele din fragmentele găsite la căutare care acoperă cel
+mai bine termenii întrebării. Folosite când Ollama e indisponibil sau supraîncărcat.
+"""
+
+import math
+from typing import Callable, Dict, List, Optional
+
+from .legal_chunker import SENTENCE_RE
+from .text_utils import tokenize
+
+DEGRADED_NOTICE = "Asistentul AI este momentan suprasolicitat. Din documentele oficiale disponibile:"
+
+def _default_source(doc: Dict) -> str:
+    return doc.get("source", "")
+
+def extractive_answer(question: str, docs: List[Dict], source_of: Callable[[Dict], str] = _default_source,
+                      max_sentences: int = 3, max_chars: int = 600, text_key: str = "content") -> Optional[Dict]:
+    """
+    docs: rezultatele căutării, ordonate după relevanță.
+    Frazele sunt punctate după termenii întrebării pe care îi conțin (termenii rari între
+    frazele candidate contează mai mult), cu un mic avantaj pentru documentele mai relevante.
+    Returnează {"response", "sources"} sau None dacă nicio frază nu conține termenii întrebării.
+    """
+    query_terms = set(tokenize(question))
+    if not query_terms:
+        return None
+
+    candidates = []
+    seen = set()
+    for rank, doc in enumerate(docs):
+        for position, sentence in enumerate(SENTENCE_RE.split(doc.get(text_key) or "")):
+            sentence = " ".join(sentence.split())
+            key = sentence.lower()
+            if len(sentence) < 20 or key in seen:
+                continue
+            seen.add(key)
+            candidates.append((rank, position, sentence, query_terms.intersection(tokenize(sentence)), doc))
+
+    if not candidates:
+        return None
+
+    document_frequency = {
+        term: sum(1 for candidate in candidates if term in candidate[3]) for term in query_terms
+    }
+
+    def score(candidate) -> float:
+        rank, _, _, terms, _ = candidate
+        weight = sum(math.log(1 + len(candidates) / document_frequency[term]) for term in terms)
+        return weight / (1 + 0.1 * rank)
+
+    ranked = sorted((candidate for candidate in candidates if candidate[3]), key=score, reverse=True)
+    chosen, length = [], 0
+    for candidate in ranked:
+        if chosen and length + len(candidate[2]) > max_chars:
+            continue
+        chosen.append(candidate)
+        length += len(candidate[2])
+        if len(chosen) >= max_sentences:
+            break
+
+    if not chosen:
+        return None
+
+    # În ordinea din documente, ca textul să se citească firesc
+    chosen.sort(key=lambda candidate: (candidate[0], candidate[1]))
+    sources = []
+    for candidate in chosen:
+        source = source_of(candidate[4])
+        if source and source not in sources:
+            sources.append(source)
+
+    text = " ".join(candidate[2] for candidate in chosen)
+    if len(text) > max_chars:
+        text = text[:max_chars].rsplit(" ", 1)[0] + " ..."
+    return {"response": text, "sources": sources}
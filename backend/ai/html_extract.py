@@ -0,0 +1,362 @@
+"""
+Extragerea conținutului principal din pagini HTML într-o singură trecere.
+
+Semantica este cea a implementării BeautifulSoup folosite inițial (backend-ul "bs4", păstrat
+ca referință): se elimină tag-urile de navigație/script și elementele cu clase de reclame,
+meniuri etc., se alege primul selector de conținut cu peste 200 de caractere, altfel <body>.
+Backend-ul "stdlib" (implicit) tokenizează cu html.parser ca BeautifulSoup, dar nu construiește
+arborele: evenimentele start/end/text sunt procesate direct. "lxml" e opțional și mai rapid,
+dar corectează HTML-ul invalid altfel decât html.parser.
+"""
+
+import codecs
+import html
+import os
+import re
+from html.entities import html5 as HTML5_ENTITIES
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Union
+
+DROP_TAGS = frozenset(['script', 'style', 'nav', 'header', 'footer', 'aside', 'meta', 'link'])
+DROP_CLASS_NAMES = ['advertisement', 'ads', 'social', 'share', 'comments', 'sidebar', 'menu']
+DROP_CLASS_RE = re.compile('|'.join(DROP_CLASS_NAMES), re.I)
+
+# Strategii de extragere în ordinea priorității
+CONTENT_SELECTORS = [
+    'article', '.main-content', '.content', '.post-content', '.article-content',
+    '.entry-content', '#content', '#main', 'main', '.container', '.wrapper'
+]
+MIN_CONTENT_LENGTH = 200
+
+# Elemente fără tag de închidere (ca în BeautifulSoup)
+VOID_TAGS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem',
+    'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame',
+    'image', 'isindex', 'nextid', 'spacer'
+])
+# Textul din aceste elemente are alt tip în BeautifulSoup: get_text() pe un element
+# păstrează doar textul de același tip cu el (textul unui <template> nu apare în <body>)
+STRING_CONTAINER_TAGS = frozenset(['template', 'rt', 'rp', 'script', 'style'])
+PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'textarea'])
+ASCII_SPACES = ' \n\t\x0c\r'
+
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.I)
+_XML_ENCODING_RE = re.compile(rb'^\s*<\?xml[^>]+encoding\s*=\s*["\']([a-zA-Z0-9_.:-]+)', re.I)
+_NUMERIC_REF_RE = {10: re.compile(r'^([0-9]+)(.*)', re.S), 16: re.compile(r'^([0-9a-fA-F]+)(.*)', re.S)}
+
+def _index_selectors(selectors: List[str]) -> Dict[str, Dict[str, List[int]]]:
+    """Selectorii simpli (tag, .clasă, #id) indexați după tip și valoare -> pozițiile lor în listă"""
+    index = {'tag': {}, 'class': {}, 'id': {}}
+    for position, selector in enumerate(selectors):
+        if selector.startswith('.'):
+            index['class'].setdefault(selector[1:], []).append(position)
+        elif selector.startswith('#'):
+            index['id'].setdefault(selector[1:], []).append(position)
+        else:
+            index['tag'].setdefault(selector, []).append(position)
+    return index
+
+_SELECTOR_INDEX = _index_selectors(CONTENT_SELECTORS)
+
+def decode_html(data: Union[bytes, str]) -> str:
+    """Decodare bytes -> text: BOM, charset declarat, UTF-8, apoi windows-1252"""
+    if isinstance(data, str):
+        return data
+
+    for bom, encoding in ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be')):
+        if data.startswith(bom):
+            return data[len(bom):].decode(encoding, errors='replace')
+
+    head = data[:4096]
+    declared = _XML_ENCODING_RE.search(head) or _CHARSET_RE.search(head)
+    candidates = [declared.group(1).decode('ascii').lower()] if declared else []
+    for encoding in candidates + ['utf-8']:
+        try:
+            return data.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return data.decode('windows-1252', errors='replace')
+
+class ContentSink:
+    """
+    Primește evenimentele parserului și reține doar ce trebuie pentru rezultat:
+    textul vizibil (în afara elementelor eliminate), intervalul primului element potrivit
+    fiecărui selector, intervalul primului <body> și textul primului <title>.
+    Textul dintre două tag-uri e comasat ca în BeautifulSoup (doar spații -> " " sau rând nou).
+    """
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.kinds: List[Optional[str]] = []  # containerul fiecărui text (None = text obișnuit)
+        self.pending: List[str] = []
+        self.stack: List[list] = []  # [tag, elimină, container, păstrează spații, capturi, e titlul]
+        self.containers: List[str] = []
+        self.dropped_depth = 0
+        self.preserve_depth = 0
+
+        self.matches: List[Optional[list]] = [None] * len(CONTENT_SELECTORS)  # [start, end, tip] în parts
+        self.body: Optional[list] = None
+        self.title_parts: Optional[List[str]] = None
+        self.in_title = False
+
+    def start(self, tag: str, attrs: Dict[str, str]):
+        self.flush()
+
+        title_entry = tag == 'title' and self.title_parts is None
+        if title_entry:
+            self.title_parts = []
+            self.in_title = True
+
+        classes = (attrs.get('class') or '').split()
+        drop = tag in DROP_TAGS or bool(classes) and (
+            any(DROP_CLASS_RE.search(value) for value in classes) or bool(DROP_CLASS_RE.search(' '.join(classes)))
+        )
+
+        container = tag in STRING_CONTAINER_TAGS
+        string_kind = tag if container else None
+
+        captures = []
+        if not drop and self.dropped_depth == 0:
+            position = len(self.parts)
+            candidates = _SELECTOR_INDEX['tag'].get(tag, [])
+            for class_name in classes:
+                candidates = candidates + _SELECTOR_INDEX['class'].get(class_name, [])
+            if 'id' in attrs:
+                candidates = candidates + _SELECTOR_INDEX['id'].get(attrs['id'], [])
+            for index in candidates:
+                if self.matches[index] is None:
+                    self.matches[index] = [position, None, string_kind]
+                    captures.append(self.matches[index])
+            if tag == 'body' and self.body is None:
+                self.body = [position, None, string_kind]
+                captures.append(self.body)
+
+        preserve = tag in PRESERVE_WHITESPACE_TAGS
+        self.dropped_depth += drop
+        self.preserve_depth += preserve
+        if container:
+            self.containers.append(tag)
+        self.stack.append([tag, drop, container, preserve, captures, title_entry])
+
+    def end(self, tag: str):
+        """Închide cel mai recent element deschis cu acest nume (și pe cele din interiorul lui)"""
+        self.flush()
+        for position in range(len(self.stack) - 1, -1, -1):
+            if self.stack[position][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > position:
+            self._pop()
+
+    def _pop(self):
+        _, drop, container, preserve, captures, title_entry = self.stack.pop()
+        end = len(self.parts)
+        for capture in captures:
+            capture[1] = end
+        self.dropped_depth -= drop
+        self.preserve_depth -= preserve
+        if container:
+            self.containers.pop()
+        if title_entry:
+            self.in_title = False
+
+    def data(self, text: str):
+        self.pending.append(text)
+
+    def flush(self, plain: bool = False):
+        """Încheie textul curent (apelat la fiecare tag, comentariu sau declarație)"""
+        if not self.pending:
+            return
+        text = ''.join(self.pending)
+        self.pending = []
+
+        if not self.preserve_depth and not text.strip(ASCII_SPACES):
+            text = '\n' if '\n' in text else ' '
+
+        kind = None if plain or not self.containers else self.containers[-1]
+        if self.in_title and kind is None:
+            self.title_parts.append(text)
+        if self.dropped_depth == 0:
+            self.parts.append(text)
+            self.kinds.append(kind)
+
+    def cdata(self, text: str):
+        self.flush()
+        self.pending.append(text)
+        self.flush(plain=True)
+
+    def close(self) -> Dict[str, Optional[str]]:
+        self.flush()
+        while self.stack:
+            self._pop()
+
+        def text(span):
+            start, end, kind = span
+            return ''.join(part for part, part_kind in zip(self.parts[start:end], self.kinds[start:end])
+                           if part_kind == kind)
+
+        content_text = ""
+        for span in self.matches:
+            if span is not None:
+                content_text = text(span)
+                if len(content_text.strip()) > MIN_CONTENT_LENGTH:
+                    break
+
+        # Fallback - ia tot din body
+        if not content_text or len(content_text.strip()) < MIN_CONTENT_LENGTH:
+            content_text = text(self.body if self.body is not None else [0, len(self.parts), None])
+
+        title = ''.join(self.title_parts).strip() if self.title_parts is not None else None
+        return {"title": title, "text": content_text}
+
+class _StdlibParser(HTMLParser):
+    """Tokenizarea html.parser, cu aceleași conversii de entități ca BeautifulSoup"""
+
+    def __init__(self, sink: ContentSink):
+        super().__init__(convert_charrefs=False)
+        self.sink = sink
+        self.already_closed: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        self.sink.start(tag, {key: value or '' for key, value in attrs})
+        if tag in VOID_TAGS:
+            self.sink.end(tag)
+            self.already_closed.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.sink.start(tag, {key: value or '' for key, value in attrs})
+        self.sink.end(tag)
+
+    def handle_endtag(self, tag):
+        # </br> după <br> e redundant, ca în BeautifulSoup
+        if tag in self.already_closed:
+            self.already_closed.remove(tag)
+        else:
+            self.sink.end(tag)
+
+    def handle_data(self, data):
+        self.sink.data(data)
+
+    def handle_entityref(self, name):
+        character = HTML5_ENTITIES.get(name + ';')
+        self.sink.data(character if character is not None else f"&{name}")
+
+    def handle_charref(self, name):
+        base = 16 if name[:1] in ('x', 'X') else 10
+        digits = name[1:] if base == 16 else name
+        match = _NUMERIC_REF_RE[base].match(digits)
+        if match is None:
+            self.sink.data(digits)
+            return
+        character = html.unescape(f"&#{'x' if base == 16 else ''}{match.group(1)};")
+        self.sink.data(character + match.group(2))
+
+    def handle_comment(self, data):
+        self.sink.flush()
+
+    def handle_decl(self, decl):
+        self.sink.flush()
+
+    def handle_pi(self, data):
+        self.sink.flush()
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            self.sink.cdata(data[len('CDATA['):])
+        else:
+            self.sink.flush()
+
+def _extract_stdlib(markup: str) -> Dict[str, Optional[str]]:
+    sink = ContentSink()
+    parser = _StdlibParser(sink)
+    parser.feed(markup)
+    parser.close()
+    return sink.close()
+
+class _LxmlTarget:
+    """Adaptor pentru interfața target a parserului lxml"""
+
+    def __init__(self, sink: ContentSink):
+        self.sink = sink
+
+    def start(self, tag, attrib):
+        self.sink.start(tag, dict(attrib))
+
+    def end(self, tag):
+        self.sink.end(tag)
+
+    def data(self, data):
+        self.sink.data(data)
+
+    def close(self):
+        return self.sink.close()
+
+def _extract_lxml(markup: str) -> Dict[str, Optional[str]]:
+    from lxml import etree
+
+    parser = etree.HTMLParser(target=_LxmlTarget(ContentSink()))
+    parser.feed(markup)
+    return parser.close()
+
+def _extract_bs4(markup: str) -> Dict[str, Optional[str]]:
+    """Implementarea de referință, cu arbore BeautifulSoup complet"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(markup, 'html.parser')
+    title_tag = soup.find('title')
+    title = title_tag.get_text().strip() if title_tag else None
+
+    # Elimină script-uri, stiluri, și alte elemente irelevante
+    for tag in soup.find_all(list(DROP_TAGS)):
+        tag.decompose()
+
+    # Elimină divuri comune pentru ads și social media
+    for class_name in DROP_CLASS_NAMES:
+        for tag in soup.find_all(attrs={'class': re.compile(class_name, re.I)}):
+            tag.decompose()
+
+    # Încearcă să găsească conținutul principal
+    content_text = ""
+    for selector in CONTENT_SELECTORS:
+        content_element = soup.select_one(selector)
+        if content_element:
+            content_text = content_element.get_text()
+            if len(content_text.strip()) > MIN_CONTENT_LENGTH:
+                break
+
+    # Fallback - ia tot din body
+    if not content_text or len(content_text.strip()) < MIN_CONTENT_LENGTH:
+        body = soup.find('body')
+        content_text = body.get_text() if body else soup.get_text()
+
+    return {"title": title, "text": content_text}
+
+BACKENDS: Dict[str, Callable[[str], Dict[str, Optional[str]]]] = {
+    "stdlib": _extract_stdlib,
+    "lxml": _extract_lxml,
+    "bs4": _extract_bs4
+}
+
+def available_backends() -> List[str]:
+    backends = ["stdlib", "bs4"]
+    try:
+        import lxml.etree  # noqa: F401
+        backends.insert(1, "lxml")
+    except ImportError:
+        pass
+    return backends
+
+def default_backend() -> str:
+    """HTML_EXTRACT_BACKEND: stdlib (implicit), lxml, bs4 sau auto (lxml dacă e instalat)"""
+    backend = os.getenv("HTML_EXTRACT_BACKEND", "stdlib").lower()
+    if backend == "auto":
+        return "lxml" if "lxml" in available_backends() else "stdlib"
+    return backend if backend in BACKENDS else "stdlib"
+
+def extract_html(markup: Union[bytes, str], backend: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """
+    Returnează {"title", "text"}: title este None dacă pagina nu are <title>,
+    iar text este conținutul principal, încă necurățat (se aplică apoi _clean_text)
+    """
+    return BACKENDS[backend or default_backend()](decode_html(markup))
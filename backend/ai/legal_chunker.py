@@ -0,0 +1,249 @@
+"""
+Chunking pentru texte legislative românești: chunk-urile încep la titluri de structură
+(TITLUL, Capitolul, Secțiunea, Art./Articolul), iar articolele prea lungi sunt împărțite
+pe alineate "(1)", apoi pe litere "a)", apoi pe fraze. Fiecare chunk are pozițiile în textul
+sursă, numărul estimat de tokeni, articolul, capitolul și pagina ("--- Pagina N ---").
+"""
+
+import bisect
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .text_utils import estimate_tokens
+
+PAGE_MARKER_RE = re.compile(r'--- Pagina (\d+) ---')
+_PAGE_MARKERS_AROUND_RE = re.compile(r'\s*--- Pagina \d+ ---\s*')
+_LEADING_NOISE_RE = re.compile(r'(?:\s|--- Pagina \d+ ---)*')
+_TRAILING_NOISE_RE = re.compile(r'(?:\s|--- Pagina \d+ ---)*$')
+
+# Titluri care încep o unitate nouă. "Art. 5" trebuie urmat de separator ("Art. 5. -", "Art. 5 (1)"),
+# ca să nu fie confundat cu o trimitere ("potrivit Art. 5 din lege"); trimiterile cu litere mici sunt ignorate.
+_NUMBER = r'(?:[IVXLC]+\b|\d+(?!\d))'
+_NOT_AFTER_LETTER = r'(?<![^\W\d_])'  # textul extras din HTML poate lipi titlul de cifra dinainte ("1Art. 2.")
+HEADING_RE = re.compile(
+    rf'(?P<title>{_NOT_AFTER_LETTER}TITLUL\s+{_NUMBER})'
+    rf'|(?P<chapter>{_NOT_AFTER_LETTER}(?:CAPITOLUL|Capitolul|CAP\.|Cap\.)\s*{_NUMBER})'
+    rf'|(?P<section>{_NOT_AFTER_LETTER}(?:SECȚIUNEA|SECŢIUNEA|Secțiunea|Secţiunea)\s+(?:a\s+)?{_NUMBER}(?:-a)?)'
+    rf'|(?P<article>{_NOT_AFTER_LETTER}(?:ARTICOLUL|Articolul)\s+\d+(?:\^\d+)?(?!\d)'
+    rf'|{_NOT_AFTER_LETTER}(?:Art|ART)\.\s*\d+(?:\^\d+)?(?=\s*(?:[.:\-–—](?!\d)|\()))'
+)
+# Un titlu găsit la capătul textului primit poate fi incomplet ("Articolul 1" din "Articolul 12")
+HEADING_LOOKAHEAD = 40
+
+# Subdiviziuni pentru articolele lungi, de la cea mai mare la cea mai mică
+PARAGRAPH_RE = re.compile(r'(?<!alin\.)(?<!alin\. )(?<!alineatul )(?<![\w(])\(\d+\)(?=\s)')
+LETTER_RE = re.compile(r'(?<!lit\. )(?<!litera )(?<=\s)[a-zăâîșț]\)(?=\s)')
+# Sfârșit de frază: nu după abrevieri ("art.", "alin.", "nr.") și doar înaintea unei majuscule, cifre sau "("
+SENTENCE_RE = re.compile(
+    r'(?<!\bart\.)(?<!\bArt\.)(?<!\bART\.)(?<!\balin\.)(?<!\blit\.)(?<!\bnr\.)(?<!\bNr\.)(?<!\bpct\.)'
+    r'(?<=[.!?;])\s+(?=[A-ZĂÂÎȘȚŞŢ0-9(„"])'
+)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _split_points(pattern, text: str, at_end: bool = False) -> List[int]:
+    return [match.end() if at_end else match.start() for match in pattern.finditer(text)]
+
+_SPLITTERS = [
+    lambda text: _split_points(PARAGRAPH_RE, text),
+    lambda text: _split_points(LETTER_RE, text),
+    lambda text: _split_points(SENTENCE_RE, text, at_end=True)
+]
+
+class LegalChunker:
+    """
+    Chunker incremental: feed() primește textul pe bucăți (ex. pagină cu pagină) și returnează
+    chunk-urile complete, finish() le returnează pe cele rămase. Rezultatul nu depinde de cum
+    este împărțit textul la feed(), cu excepția textelor fără titluri, tăiate la o frază (sau între
+    cuvinte, dacă nu există fraze) după ~16 x max_tokens caractere ca să nu țină tot documentul în memorie.
+
+    Unitățile (textul de la un titlu la următorul) sunt grupate cât timp chunk-ul curent are sub
+    min_tokens, fără a depăși max_tokens - un titlu de capitol rămâne lipit de primul său articol.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, min_tokens: Optional[int] = None):
+        self.max_tokens = max_tokens or int(os.getenv("CHUNK_MAX_TOKENS", "350"))
+        self.min_tokens = min_tokens if min_tokens is not None else int(os.getenv("CHUNK_MIN_TOKENS", "60"))
+        self.max_unit_chars = self.max_tokens * 16
+
+        self.buffer = ""
+        self.offset = 0  # poziția în textul sursă a lui buffer[0]
+        self.unit_start = 0  # unitatea în curs de citire
+        self.scan_from = 0
+        self.chapter = ""
+        self.article = ""
+        self.unit_context = ("", "")  # (capitol, articol) pentru unitatea în curs
+        self.current: Optional[Dict] = None  # chunk-ul în curs de grupare
+        self.pages: List[Tuple[int, int]] = []  # (poziție, număr pagină)
+
+    def feed(self, text: str) -> List[Dict]:
+        previous_length = len(self.buffer)
+        self.buffer += text
+        for match in PAGE_MARKER_RE.finditer(self.buffer, max(0, previous_length - 20)):
+            position = self.offset + match.start()
+            if not self.pages or position > self.pages[-1][0]:
+                self.pages.append((position, int(match.group(1))))
+        return self._scan(final=False)
+
+    def finish(self) -> List[Dict]:
+        chunks = self._scan(final=True)
+        if self.current:
+            chunks.extend(self._emit(self.current))
+            self.current = None
+        self.offset += len(self.buffer)
+        self.buffer = ""
+        return chunks
+
+    def _text(self, start: int, end: int) -> str:
+        return self.buffer[start - self.offset:end - self.offset]
+
+    def _tokens(self, start: int, end: int) -> int:
+        return estimate_tokens(PAGE_MARKER_RE.sub(' ', self._text(start, end)))
+
+    def _scan(self, final: bool) -> List[Dict]:
+        chunks = []
+        end_of_buffer = self.offset + len(self.buffer)
+        limit = end_of_buffer if final else end_of_buffer - HEADING_LOOKAHEAD
+
+        while True:
+            match = HEADING_RE.search(self.buffer, self.scan_from - self.offset)
+            if match is None or self.offset + match.end() > limit:
+                break
+            start = self.offset + match.start()
+            if start > self.unit_start:
+                chunks.extend(self._add_unit(self.unit_start, start))
+
+            label = ' '.join(match.group().split())
+            if match.lastgroup in ("title", "chapter"):
+                self.chapter = label if match.lastgroup == "chapter" else ""
+                self.article = ""
+            elif match.lastgroup == "section":
+                self.article = ""
+            else:
+                self.article = label
+            self.unit_start = start
+            self.unit_context = (self.chapter, self.article)
+            self.scan_from = self.offset + match.end()
+
+        if final:
+            if end_of_buffer > self.unit_start:
+                chunks.extend(self._add_unit(self.unit_start, end_of_buffer))
+            self.unit_start = self.scan_from = end_of_buffer
+        elif limit - self.unit_start > self.max_unit_chars:
+            # Text lung fără titluri: închide unitatea la ultima frază, altfel între două cuvinte
+            tail = self._text(self.unit_start, limit)
+            cuts = _split_points(SENTENCE_RE, tail, at_end=True) or _split_points(_WHITESPACE_RE, tail, at_end=True)
+            cut = self.unit_start + (cuts[-1] if cuts else len(tail))
+            chunks.extend(self._add_unit(self.unit_start, cut))
+            self.unit_start = self.scan_from = cut
+
+        # Păstrează în buffer doar textul încă nefolosit
+        keep_from = min(self.unit_start, self.current["start"] if self.current else self.unit_start)
+        if keep_from > self.offset:
+            self.buffer = self.buffer[keep_from - self.offset:]
+            self.offset = keep_from
+        return chunks
+
+    def _add_unit(self, start: int, end: int) -> List[Dict]:
+        chapter, article = self.unit_context
+        tokens = self._tokens(start, end)
+        chunks = []
+
+        if self.current and (self.current["tokens"] >= self.min_tokens
+                             or self.current["tokens"] + tokens > self.max_tokens):
+            chunks.extend(self._emit(self.current))
+            self.current = None
+
+        if self.current is None:
+            self.current = {"start": start, "end": end, "tokens": tokens, "chapter": chapter, "article": article}
+        else:
+            self.current["end"] = end
+            self.current["tokens"] += tokens
+            self.current["article"] = self.current["article"] or article
+            self.current["chapter"] = self.current["chapter"] or chapter
+        return chunks
+
+    def _emit(self, group: Dict) -> List[Dict]:
+        if group["tokens"] <= self.max_tokens:
+            spans = [(group["start"], group["end"])]
+        else:
+            spans = self._split_long(group["start"], group["end"], 0)
+
+        chunks = []
+        for start, end in spans:
+            chunk = self._make_chunk(start, end, group["chapter"], group["article"])
+            if chunk:
+                chunks.append(chunk)
+        return chunks
+
+    def _split_long(self, start: int, end: int, level: int) -> List[Tuple[int, int]]:
+        """Împarte un interval prea lung pe alineate / litere / fraze, apoi grupează bucățile"""
+        text = self._text(start, end)
+        cuts = []
+        while level < len(_SPLITTERS) and not cuts:
+            cuts = [start + point for point in _SPLITTERS[level](text) if 0 < point < len(text)]
+            level += 1
+        if not cuts:
+            return self._split_words(start, end)
+
+        spans = []
+        current = None
+        for piece_start, piece_end in zip([start] + cuts, cuts + [end]):
+            tokens = self._tokens(piece_start, piece_end)
+            if tokens > self.max_tokens:
+                if current:
+                    spans.append(tuple(current[:2]))
+                    current = None
+                spans.extend(self._split_long(piece_start, piece_end, level))
+                continue
+            if current and current[2] + tokens > self.max_tokens:
+                spans.append(tuple(current[:2]))
+                current = None
+            if current is None:
+                current = [piece_start, piece_end, tokens]
+            else:
+                current[1] = piece_end
+                current[2] += tokens
+        if current:
+            spans.append(tuple(current[:2]))
+        return spans
+
+    def _split_words(self, start: int, end: int) -> List[Tuple[int, int]]:
+        spans = []
+        span_start, tokens = start, 0
+        for match in re.finditer(r'\S+', self._text(start, end)):
+            word_tokens = estimate_tokens(match.group())
+            if tokens and tokens + word_tokens > self.max_tokens:
+                spans.append((span_start, start + match.start()))
+                span_start, tokens = start + match.start(), 0
+            tokens += word_tokens
+        spans.append((span_start, end))
+        return spans
+
+    def _make_chunk(self, start: int, end: int, chapter: str, article: str) -> Optional[Dict]:
+        raw = self._text(start, end)
+        leading = _LEADING_NOISE_RE.match(raw).end()
+        trailing = _TRAILING_NOISE_RE.search(raw, leading).start()
+        text = _PAGE_MARKERS_AROUND_RE.sub('\n', raw[leading:trailing]).strip()
+        if not text:
+            return None
+
+        start, end = start + leading, start + trailing
+        page_index = bisect.bisect_right(self.pages, (start, float('inf'))) - 1
+        return {
+            "text": text,
+            "start": start,
+            "end": end,
+            "tokens": estimate_tokens(text),
+            "article": article,
+            "chapter": chapter,
+            "page": self.pages[page_index][1] if page_index >= 0 else None
+        }
+
+def chunk_legal_text(text: str, max_tokens: Optional[int] = None, min_tokens: Optional[int] = None) -> List[Dict]:
+    """
+    Împarte un text întreg în chunk-uri {"text", "start", "end", "tokens", "article", "chapter", "page"}
+    """
+    chunker = LegalChunker(max_tokens, min_tokens)
+    return chunker.feed(text) + chunker.finish()
@@ -2,45 +2,43 @@
 Client simplu pentru Ollama
 """
 
-import httpx
 from typing import Dict, Optional
 
+from .ollama_client import ollama_manager
+
+# Trimis separat ("system") și identic la fiecare cerere: prefixul rămâne în cache-ul KV al modelului
+SYSTEM_PROMPT = """Ești un asistent AI pentru primării din România. 
+Răspunde în română la întrebări despre taxe și impozite locale.
+Fii concis și util."""
+
 class LlamaClient:
     def __init__(self):
-        self.base_url = "http://localhost:11434"
+        self.base_url = ollama_manager.base_url
         self.model = "llama3.2:3b"
         
     async def generate_response(self, prompt: str) -> Dict:
         try:
-            system_prompt = """Ești un asistent AI pentru primării din România. 
-Răspunde în română la întrebări despre taxe și impozite locale.
-Fii concis și util."""
-            
-            full_prompt = f"{system_prompt}\n\nÎntrebare: {prompt}\n\nRăspuns:"
-            
             payload = {
                 "model": self.model,
-                "prompt": full_prompt,
-                "stream": False
+                "system": SYSTEM_PROMPT,
+                "prompt": prompt,
+                "stream": False,
+                "keep_alive": ollama_manager.keep_alive
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/generate",
-                    json=payload
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return {
-                        "success": True,
-                        "response": result.get("response", "").strip()
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "response": "Nu am putut genera răspuns"
-                    }
+            response = await ollama_manager.generate(payload, timeout=30.0)
+            
+            if response.status_code == 200:
+                result = response.json()
+                return {
+                    "success": True,
+                    "response": result.get("response", "").strip()
+                }
+            else:
+                return {
+                    "success": False,
+                    "response": "Nu am putut genera răspuns"
+                }
         except Exception as e:
             return {
                 "success": False,
@@ -49,9 +47,8 @@ Fii concis și util."""
     
     async def check_connection(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/api/version")
-                return response.status_code == 200
+            response = await ollama_manager.get("/api/version", timeout=5.0)
+            return response.status_code == 200
         except:
             return False
 
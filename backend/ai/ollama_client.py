@@ -0,0 +1,328 @@
+"""
+Client Ollama partajat pe durata aplicației: pool de conexiuni keep-alive,
+limită configurabilă de generări simultane, distribuirea lor pe mai multe
+instanțe Ollama (vezi ai.ollama_router) și circuit breaker (ai.circuit_breaker)
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+import httpx
+
+from services.metrics import chat_stage_seconds
+
+from .circuit_breaker import CircuitBreaker
+from .ollama_router import OllamaRouter
+
+_QUEUE_WAIT = chat_stage_seconds.labels("generation_queue")
+_GENERATION = chat_stage_seconds.labels("generation")
+
+def _parse_keep_alive(value: str):
+    """Ollama acceptă o durată ("30m") sau un număr de secunde (-1 = modelul nu se descarcă)"""
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+class OllamaClientManager:
+    """
+    Un singur httpx.AsyncClient pentru toate apelurile către Ollama.
+    Generările trec printr-un semafor, iar timpul de așteptare în coadă este măsurat.
+    Fiecare generare merge la backend-ul ales de router; o eroare de conexiune (cererea nu a
+    ajuns la Ollama) e reîncercată pe alt backend.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, max_concurrent_generations: Optional[int] = None,
+                 base_urls: Optional[List[str]] = None):
+        self.router = OllamaRouter([base_url.rstrip("/")] if base_url else base_urls)
+        self.breaker = CircuitBreaker()
+        # Limita e per backend: pool-ul primește în total max_concurrent_generations x backend-uri
+        self.max_concurrent_generations = max_concurrent_generations or int(os.getenv("OLLAMA_MAX_CONCURRENT_GENERATIONS", "4"))
+        self.max_connections = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "20"))
+        self.max_keepalive_connections = int(os.getenv("OLLAMA_MAX_KEEPALIVE_CONNECTIONS", "10"))
+        self.keepalive_expiry = float(os.getenv("OLLAMA_KEEPALIVE_EXPIRY", "60"))
+        self.timeout = float(os.getenv("OLLAMA_TIMEOUT", "30"))
+        # Cât timp rămâne modelul încărcat după ultima cerere (ex. "30m", "-1" = mereu)
+        self.keep_alive = _parse_keep_alive(os.getenv("OLLAMA_KEEP_ALIVE", "30m"))
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+
+        # Metrici coadă generări
+        self.waiting = 0
+        self.in_flight = 0
+        self.total_generations = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+        # Metrici evaluare prompt (tokeni procesați efectiv vs. tokeni din prompt)
+        self.prompt_eval_responses = 0
+        self.prompt_tokens = 0
+        self.prompt_tokens_evaluated = 0
+        self.prompt_eval_seconds = 0.0
+
+    @property
+    def base_url(self) -> str:
+        """Primul backend din pool (compatibilitate cu codul care așteaptă o singură adresă)"""
+        return self.router.backends[0].url
+
+    @property
+    def total_concurrent_generations(self) -> int:
+        return self.max_concurrent_generations * len(self.router)
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        """
+        Creează clientul și semaforul pentru event loop-ul curent (la prima utilizare).
+        Clientul rămâne legat de acel loop: conexiunile din pool și locurile ocupate din semafor
+        nu pot fi mutate pe alt loop, deci folosirea din alt loop cere mai întâi shutdown().
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is not loop:
+            raise RuntimeError(
+                "Clientul Ollama este legat de alt event loop; apelați shutdown() pe acel loop "
+                "înainte de a-l folosi din altul"
+            )
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.total_concurrent_generations)
+            self._loop = loop
+        return self._client
+
+    async def startup(self):
+        """Deschide pool-ul de conexiuni (apelat la pornirea aplicației)"""
+        self._ensure_client()
+        urls = ", ".join(backend.url for backend in self.router.backends)
+        print(f"🔌 Client Ollama pornit: {urls} (max {self.max_concurrent_generations} generări simultane per backend)")
+
+    async def shutdown(self):
+        """Închide conexiunile (apelat la oprirea aplicației)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+            self._loop = None
+            print("🔌 Client Ollama oprit")
+
+    @asynccontextmanager
+    async def generation_slot(self):
+        """
+        Așteaptă un loc liber pentru generare; timpul de așteptare și cel de generare
+        (cât e ținut locul) ajung în chat_stage_seconds
+        """
+        self._ensure_client()
+        semaphore = self._semaphore
+
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        wait = time.perf_counter() - started
+        _QUEUE_WAIT.observe(wait)
+        self.total_generations += 1
+        self.total_wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+        self.in_flight += 1
+        granted = time.perf_counter()
+        try:
+            yield
+        finally:
+            _GENERATION.observe(time.perf_counter() - granted)
+            self.in_flight -= 1
+            semaphore.release()
+
+    async def probe_backends(self) -> List[Dict]:
+        """GET /api/version pe toate backend-urile (apelat periodic de services.health_monitor)"""
+        return await self.router.probe(self._ensure_client())
+
+    def _next_attempt(self, backend, tried: tuple) -> Optional[tuple]:
+        """După o eroare de conexiune: backend-urile încercate, sau None dacă nu mai rămâne niciunul"""
+        self.router.release(backend, ok=False)
+        tried += (backend,)
+        if len(tried) >= len(self.router):
+            return None
+        self.router.failovers += 1
+        return tried
+
+    async def generate(self, payload: dict, timeout: Optional[float] = None) -> httpx.Response:
+        """
+        POST /api/generate (fără stream) pe backend-ul ales de router.
+        Cu circuitul deschis ridică imediat CircuitOpenError, fără să intre în coadă.
+        """
+        trial = self.breaker.allow()
+        ok = None
+        try:
+            response = await self._post_generate(payload, timeout)
+            ok = response.status_code < 500
+            return response
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            ok = False
+            raise
+        finally:
+            self.breaker.record(ok, trial)
+
+    async def _post_generate(self, payload: dict, timeout: Optional[float]) -> httpx.Response:
+        async with self.generation_slot():
+            client = self._ensure_client()
+            tried = ()
+            while True:
+                backend = self.router.acquire(tried)
+                started = time.perf_counter()
+                try:
+                    response = await client.post(f"{backend.url}/api/generate", json=payload, timeout=timeout or self.timeout)
+                except httpx.ConnectError:
+                    tried = self._next_attempt(backend, tried)
+                    if tried is None:
+                        raise
+                    continue
+                except asyncio.CancelledError:
+                    self.router.release(backend, ok=None)
+                    raise
+                except Exception:
+                    self.router.release(backend, ok=False)
+                    raise
+
+                self.router.observe(backend, time.perf_counter() - started)
+                self.router.release(backend, ok=response.status_code < 500)
+                return response
+
+    @asynccontextmanager
+    async def stream_generate(self, payload: dict, timeout: Optional[float] = None):
+        """
+        POST /api/generate în mod stream; locul de generare (și backend-ul) e ținut
+        până la finalul stream-ului. Cu circuitul deschis ridică imediat CircuitOpenError.
+        """
+        trial = self.breaker.allow()
+        ok = None
+        try:
+            async with self._open_stream(payload, timeout) as response:
+                ok = response.status_code < 500
+                yield response
+        except asyncio.CancelledError:
+            ok = None
+            raise
+        except httpx.HTTPError:
+            ok = False
+            raise
+        except Exception:
+            # Eroare la deschiderea stream-ului; erorile din codul apelant nu contează ca eșec
+            if ok is None:
+                ok = False
+            raise
+        finally:
+            self.breaker.record(ok, trial)
+
+    @asynccontextmanager
+    async def _open_stream(self, payload: dict, timeout: Optional[float]):
+        async with self.generation_slot():
+            client = self._ensure_client()
+            tried = ()
+            while True:
+                backend = self.router.acquire(tried)
+                started = time.perf_counter()
+                request = client.build_request("POST", f"{backend.url}/api/generate", json=payload, timeout=timeout or self.timeout)
+                try:
+                    response = await client.send(request, stream=True)
+                    break
+                except httpx.ConnectError:
+                    tried = self._next_attempt(backend, tried)
+                    if tried is None:
+                        raise
+                except asyncio.CancelledError:
+                    self.router.release(backend, ok=None)
+                    raise
+                except Exception:
+                    self.router.release(backend, ok=False)
+                    raise
+
+            self.router.observe(backend, time.perf_counter() - started)
+            ok = response.status_code < 500
+            try:
+                yield response
+            except asyncio.CancelledError:
+                ok = None
+                raise
+            except httpx.HTTPError:
+                ok = False
+                raise
+            finally:
+                await response.aclose()
+                self.router.release(backend, ok=ok)
+
+    async def get(self, path: str, timeout: float = 5.0) -> httpx.Response:
+        """GET simplu (ex. /api/version) la un backend din rotație, fără a ocupa un loc de generare"""
+        backend = self.router.pick()
+        try:
+            return await self._ensure_client().get(f"{backend.url}{path}", timeout=timeout)
+        except httpx.HTTPError:
+            self.router.record_failure(backend)
+            raise
+
+    def record_prompt_eval(self, result: Dict, estimated_prompt_tokens: int = 0):
+        """
+        Înregistrează câți tokeni de prompt a procesat Ollama (prompt_eval_count) dintr-un răspuns
+        final. Lungimea promptului este len(context) - eval_count când Ollama returnează contextul,
+        altfel estimarea primită. Diferența este partea servită din cache-ul KV (prefixul comun
+        al promptului de sistem sau contextul sesiunii).
+        """
+        evaluated = result.get("prompt_eval_count")
+        if evaluated is None:
+            return
+        context = result.get("context")
+        if context and result.get("eval_count") is not None:
+            prompt_tokens = len(context) - result["eval_count"]
+        else:
+            prompt_tokens = estimated_prompt_tokens
+
+        self.prompt_eval_responses += 1
+        self.prompt_tokens += max(prompt_tokens, evaluated)
+        self.prompt_tokens_evaluated += evaluated
+        self.prompt_eval_seconds += result.get("prompt_eval_duration", 0) / 1e9
+
+    def prompt_eval_stats(self) -> Dict:
+        saved = self.prompt_tokens - self.prompt_tokens_evaluated
+        responses = self.prompt_eval_responses
+        return {
+            "responses": responses,
+            "prompt_tokens": self.prompt_tokens,
+            "prompt_tokens_evaluated": self.prompt_tokens_evaluated,
+            "prompt_tokens_saved": saved,
+            "saved_ratio": round(saved / self.prompt_tokens, 4) if self.prompt_tokens else 0.0,
+            "avg_prompt_eval_ms": round(self.prompt_eval_seconds / responses * 1000, 2) if responses else 0.0
+        }
+
+    def stats(self) -> Dict:
+        """Metrici pentru coada de generări"""
+        return {
+            "base_url": self.base_url,
+            "max_concurrent_generations": self.max_concurrent_generations,
+            "total_concurrent_generations": self.total_concurrent_generations,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "total_generations": self.total_generations,
+            "avg_wait_ms": round(self.total_wait_seconds / self.total_generations * 1000, 2) if self.total_generations else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+            "keep_alive": self.keep_alive,
+            "prompt_eval": self.prompt_eval_stats(),
+            "router": self.router.stats(),
+            "circuit_breaker": self.breaker.stats()
+        }
+
+# Singleton instance
+ollama_manager = OllamaClientManager()
@@ -0,0 +1,173 @@
+"""
+Router pentru mai multe instanțe Ollama (OLLAMA_BASE_URLS): fiecare generare merge la backend-ul
+cel mai puțin încărcat, după generările în curs și latența recentă. Backend-urile care eșuează
+repetat sunt scoase din rotație; probe() le verifică pe toate prin GET /api/version
+(apelat periodic de services.health_monitor).
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+def _base_urls_from_env() -> List[str]:
+    urls = os.getenv("OLLAMA_BASE_URLS") or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    return [url.strip().rstrip("/") for url in urls.split(",") if url.strip()]
+
+class OllamaBackend:
+    """Starea unei instanțe Ollama din pool"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.in_flight = 0
+        self.ewma_latency: Optional[float] = None  # None = încă nemăsurat
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0  # 0 = în rotație
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    @property
+    def ejected(self) -> bool:
+        return self.ejected_until > 0
+
+    def load(self, default_latency: float) -> float:
+        """Costul estimat al unei generări noi: (în curs + 1) x latența medie recentă"""
+        latency = self.ewma_latency if self.ewma_latency is not None else default_latency
+        return (self.in_flight + 1) * latency
+
+class OllamaRouter:
+    """
+    Alegerea e făcută pe (generări în curs + 1) x EWMA latență: o instanță mai lentă (CPU, model
+    mai mare) primește mai puține cereri decât una rapidă. Latența măsurată e timpul până la
+    primirea răspunsului (antetele, pentru stream); un backend încă nemăsurat primește media
+    celorlalte, ca să fie încercat și el.
+
+    După eject_after eșecuri consecutive (eroare de conexiune, timeout, 5xx) backend-ul e scos din
+    rotație. probe() îl readuce când /api/version răspunde; fără probe, revine singur după
+    eject_seconds, pentru o singură încercare. Dacă toate sunt scoase, se folosește cel scos primul.
+    """
+
+    def __init__(self, base_urls: Optional[List[str]] = None, ewma_alpha: Optional[float] = None,
+                 eject_after: Optional[int] = None, eject_seconds: Optional[float] = None):
+        self.ewma_alpha = ewma_alpha or float(os.getenv("OLLAMA_ROUTER_EWMA_ALPHA", "0.3"))
+        self.eject_after = eject_after or int(os.getenv("OLLAMA_ROUTER_EJECT_AFTER", "3"))
+        self.eject_seconds = eject_seconds or float(os.getenv("OLLAMA_ROUTER_EJECT_SECONDS", "30"))
+
+        urls = base_urls or _base_urls_from_env()
+        # Aceeași adresă de două ori ar dubla ponderea backend-ului
+        self.backends = [OllamaBackend(url) for url in dict.fromkeys(urls)]
+
+        self.reinstated = 0
+        self.failovers = 0
+
+    def __len__(self) -> int:
+        return len(self.backends)
+
+    def healthy(self) -> int:
+        """Numărul de backend-uri aflate în rotație"""
+        return sum(1 for backend in self.backends if not backend.ejected)
+
+    def pick(self, exclude: tuple = ()) -> OllamaBackend:
+        """Backend-ul cel mai puțin încărcat, fără a-l marca ocupat"""
+        now = time.monotonic()
+        candidates = [backend for backend in self.backends if backend not in exclude] or self.backends
+
+        available = []
+        for backend in candidates:
+            if backend.ejected and backend.ejected_until <= now:
+                # Timpul de excludere a expirat: o încercare, la primul eșec iese din nou
+                backend.ejected_until = 0.0
+                backend.consecutive_failures = self.eject_after - 1
+            if not backend.ejected:
+                available.append(backend)
+
+        if not available:
+            return min(candidates, key=lambda backend: backend.ejected_until)
+        measured = [backend.ewma_latency for backend in self.backends if backend.ewma_latency is not None]
+        default_latency = sum(measured) / len(measured) if measured else 1.0
+        return min(available, key=lambda backend: (backend.load(default_latency), backend.requests))
+
+    def acquire(self, exclude: tuple = ()) -> OllamaBackend:
+        backend = self.pick(exclude)
+        backend.in_flight += 1
+        backend.requests += 1
+        return backend
+
+    def observe(self, backend: OllamaBackend, elapsed: float):
+        """Actualizează latența medie cu timpul până la răspuns"""
+        if backend.ewma_latency is None:
+            backend.ewma_latency = elapsed
+        else:
+            backend.ewma_latency += self.ewma_alpha * (elapsed - backend.ewma_latency)
+
+    def release(self, backend: OllamaBackend, ok: Optional[bool] = True):
+        """Încheie o cerere; ok=None (ex. cerere anulată de client) nu contează nici ca reușită, nici ca eșec"""
+        backend.in_flight -= 1
+        if ok:
+            self.record_success(backend)
+        elif ok is not None:
+            self.record_failure(backend)
+
+    def record_success(self, backend: OllamaBackend):
+        backend.consecutive_failures = 0
+        if backend.ejected:
+            backend.ejected_until = 0.0
+            self.reinstated += 1
+            print(f"✅ Backend Ollama readus în rotație: {backend.url}")
+
+    def record_failure(self, backend: OllamaBackend):
+        backend.failures += 1
+        backend.consecutive_failures += 1
+        if backend.ejected:
+            # Încă nu răspunde: rămâne în afara rotației
+            backend.ejected_until = time.monotonic() + self.eject_seconds
+        elif backend.consecutive_failures >= self.eject_after:
+            backend.ejected_until = time.monotonic() + self.eject_seconds
+            backend.ejections += 1
+            print(f"⚠️ Backend Ollama scos din rotație pentru {self.eject_seconds:.0f}s: {backend.url}")
+
+    async def probe(self, client: httpx.AsyncClient, timeout: float = 3.0) -> List[Dict]:
+        """
+        GET /api/version pe fiecare backend: cele scoase din rotație revin când răspund,
+        iar cele care nu răspund acumulează eșecuri înainte să primească generări.
+        Returnează [{"url", "ok", "latency_ms"}]
+        """
+        async def check(backend: OllamaBackend) -> Dict:
+            started = time.perf_counter()
+            try:
+                response = await client.get(f"{backend.url}/api/version", timeout=timeout)
+                healthy = response.status_code == 200
+            except httpx.HTTPError:
+                healthy = False
+
+            if healthy and backend.ejected:
+                self.record_success(backend)
+            elif not healthy:
+                self.record_failure(backend)
+            return {"url": backend.url, "ok": healthy, "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+        return list(await asyncio.gather(*(check(backend) for backend in self.backends)))
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        return {
+            "backends": [
+                {
+                    "url": backend.url,
+                    "healthy": not backend.ejected,
+                    "ejected_for_s": round(max(backend.ejected_until - now, 0.0), 1) if backend.ejected else 0.0,
+                    "in_flight": backend.in_flight,
+                    "ewma_latency_ms": round(backend.ewma_latency * 1000, 1) if backend.ewma_latency is not None else None,
+                    "requests": backend.requests,
+                    "failures": backend.failures,
+                    "ejections": backend.ejections
+                }
+                for backend in self.backends
+            ],
+            "healthy_backends": self.healthy(),
+            "reinstated": self.reinstated,
+            "failovers": self.failovers
+        }
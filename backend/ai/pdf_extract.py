@@ -0,0 +1,16 @@
+"""
+Extragerea textului din PDF pe intervale de pagini.
+Modul separat și ușor, ca procesele worker să nu importe Chroma sau sistemul RAG.
+"""
+
+from typing import List
+
+from pypdf import PdfReader
+
+def count_pages(pdf_path: str) -> int:
+    return len(PdfReader(pdf_path).pages)
+
+def extract_pages(pdf_path: str, start: int, end: int) -> List[str]:
+    """Textul paginilor [start, end) - rulează într-un proces worker"""
+    reader = PdfReader(pdf_path)
+    return [reader.pages[page_num].extract_text() or "" for page_num in range(start, end)]
@@ -1,5 +1,5 @@
 import os
-import uuid
+import hashlib
 from typing import List, Dict, Any
 import chromadb
 from chromadb.config import Settings
@@ -7,15 +7,37 @@ from pypdf import PdfReader
 import requests
 import json
 from .embeddings import embeddings_model
+from .ollama_client import ollama_manager
+from .context_packer import context_packer
+from .crawler import crawler
+from .html_extract import extract_html
+from .legal_chunker import LegalChunker, chunk_legal_text
+from .pdf_extract import count_pages, extract_pages
+from .text_utils import estimate_tokens
+from services.metrics import ingest_chunks, ingest_embeddings, ingest_pages, ingest_stage_seconds, record_ollama_eval
 from dotenv import load_dotenv
 import re
 import asyncio
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 import httpx
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
 load_dotenv('../.env')
 
+# Trimis în câmpul "system" al cererii Ollama, identic la fiecare întrebare
+SYSTEM_PROMPT = """Ești un asistent AI specializat în legislația fiscală românească pentru primării.
+
+Instrucțiuni:
+1. Răspunde DOAR pe baza informațiilor din context
+2. Dacă nu găsești informația în context, spune că nu ai informația necesară
+3. Citează sursa informației (document, pagină, sau site web)
+4. Răspunde în română, clear și concis
+5. Folosește un ton oficial dar accesibil
+6. Dacă informația vine de pe web, menționează că este de pe site-ul oficial"""
+
 class RAGSystem:
     def __init__(self):
         # Inițializează Chroma DB
@@ -25,8 +47,16 @@ class RAGSystem:
         self.client = chromadb.PersistentClient(path=self.chroma_path)
         
         # Ollama settings
-        self.ollama_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        self.ollama_router = ollama_manager.router  # OLLAMA_BASE_URLS / OLLAMA_BASE_URL
         self.ollama_model = os.getenv("OLLAMA_MODEL", "llama3.2:3b")
+        self.generation_timeout = float(os.getenv("OLLAMA_TIMEOUT", "30"))
+        
+        # Ingestie PDF
+        self.pdf_workers = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1)))
+        self.pdf_pages_per_task = int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+        self.pdf_parallel_min_pages = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "24"))
+        self.add_batch_size = int(os.getenv("CHROMA_ADD_BATCH_SIZE", "256"))
+        self.ingestion_stats = deque(maxlen=100)  # Timpi pe etape pentru ultimele documente
     
     def get_or_create_collection(self, municipality_id: str):
         """Obține sau creează colecția pentru o primărie"""
@@ -44,146 +74,89 @@ class RAGSystem:
         """
         Procesează o pagină HTML de pe orice site web și o adaugă în baza de vectori
         """
+        results = await self.process_multiple_html_urls([url], municipality_id, [custom_title] if custom_title else None)
+        return results["successful"] == 1
+    
+    def process_html_content(self, url: str, html: bytes, municipality_id: str, custom_title: str = None) -> bool:
+        """
+        Extrage textul dintr-o pagină HTML deja descărcată și îl sincronizează cu baza de vectori
+        """
         try:
             print(f"📄 Procesez HTML de pe: {url}")
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extrage titlul
-                title = custom_title
-                if not title:
-                    title_tag = soup.find('title')
-                    title = title_tag.get_text().strip() if title_tag else f"Document web - {urlparse(url).netloc}"
-                
-                # Curăță HTML-ul
-                content_text = self._extract_clean_content(soup, url)
-                
-                if len(content_text.strip()) < 100:
-                    print(f"⚠️ Conținut insuficient pentru {url}")
-                    return False
-                
-                # Împarte textul în chunks
-                chunks = self._split_text(content_text, chunk_size=500, overlap=50)
-                
-                # Creează embeddings
-                embeddings = embeddings_model.embed_texts(chunks)
-                
-                # Adaugă în Chroma
-                collection = self.get_or_create_collection(municipality_id)
-                
-                source_name = f"{urlparse(url).netloc}_{title[:50]}"
-                ids = [f"{source_name}_{i}_{str(uuid.uuid4())[:8]}" for i in range(len(chunks))]
-                metadatas = [
-                    {
-                        "source": title,
-                        "url": url,
-                        "source_type": "html",
-                        "chunk_id": i,
-                        "municipality": municipality_id,
-                        "domain": urlparse(url).netloc
-                    }
-                    for i, chunk in enumerate(chunks)
-                ]
-                
-                collection.add(
-                    embeddings=embeddings,
-                    documents=chunks,
-                    metadatas=metadatas,
-                    ids=ids
-                )
-                
-                print(f"✅ HTML procesat: {title} - {len(chunks)} chunks")
+            page = extract_html(html)
+            
+            # Extrage titlul
+            title = custom_title
+            if not title:
+                title = page["title"] if page["title"] is not None else f"Document web - {urlparse(url).netloc}"
+            
+            # Curăță HTML-ul
+            content_text = self._clean_text(page["text"], url)
+            
+            if len(content_text.strip()) < 100:
+                print(f"⚠️ Conținut insuficient pentru {url}")
+                return False
+            
+            collection = self.get_or_create_collection(municipality_id)
+            source_key = self._source_key("html", url)
+            doc_hash = self._content_hash(content_text.encode("utf-8"))
+            
+            existing = self._existing_chunks(collection, source_key, legacy_where={"url": url})
+            if self._is_unchanged(existing, doc_hash):
+                print(f"♻️ HTML neschimbat, ignorat: {title}")
                 return True
-                
+            
+            # Împarte textul în chunks
+            chunks = self._split_text(content_text)
+            
+            result = self._sync_chunks(
+                collection, source_key, doc_hash, [chunks], existing,
+                lambda chunk, i: {
+                    "source": title,
+                    "url": url,
+                    "source_type": "html",
+                    "chunk_id": i,
+                    "municipality": municipality_id,
+                    "domain": urlparse(url).netloc,
+                    **self._chunk_metadata(chunk)
+                }
+            )
+            
+            print(f"✅ HTML procesat: {title} - {len(chunks)} chunks ({self._describe_sync(result)})")
+            return True
+            
         except Exception as e:
             print(f"❌ Eroare procesare HTML {url}: {e}")
             return False
     
     async def process_multiple_html_urls(self, urls: List[str], municipality_id: str, titles: List[str] = None) -> Dict[str, Any]:
         """
-        Procesează mai multe URL-uri HTML în paralel
+        Procesează mai multe URL-uri HTML prin crawler (workeri limitați, limite per host).
+        Parsarea și scrierea în Chroma rulează în thread-uri, ca să nu blocheze descărcările.
         """
         if titles and len(titles) != len(urls):
             titles = None
-            
-        tasks = []
-        for i, url in enumerate(urls):
-            title = titles[i] if titles else None
-            tasks.append(self.process_html_url(url, municipality_id, title))
+        titles_by_url = dict(zip(urls, titles)) if titles else {}
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def handle(url, response):
+            processed = await asyncio.to_thread(
+                self.process_html_content, url, response.content, municipality_id, titles_by_url.get(url)
+            )
+            return None if processed else {"success": False, "error": "Conținut insuficient"}
         
-        successful = 0
-        failed = 0
-        errors = []
+        results = await crawler.crawl(urls, handle)
         
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                failed += 1
-                errors.append(f"{urls[i]}: {str(result)}")
-            elif result:
-                successful += 1
-            else:
-                failed += 1
-                errors.append(f"{urls[i]}: Conținut insuficient")
+        successful = sum(1 for result in results if result["success"])
+        errors = [f"{result['url']}: {result.get('error', 'Unknown error')}" for result in results if not result["success"]]
         
         return {
             "total_urls": len(urls),
             "successful": successful,
-            "failed": failed,
+            "failed": len(urls) - successful,
             "errors": errors
         }
     
-    def _extract_clean_content(self, soup: BeautifulSoup, url: str) -> str:
-        """
-        Extrage conținutul curat din HTML, eliminând navigația și elementele irelevante
-        """
-        # Elimină script-uri, stiluri, și alte elemente irelevante
-        for tag in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside', 'meta', 'link']):
-            tag.decompose()
-        
-        # Elimină divuri comune pentru ads și social media
-        for class_name in ['advertisement', 'ads', 'social', 'share', 'comments', 'sidebar', 'menu']:
-            for tag in soup.find_all(attrs={'class': re.compile(class_name, re.I)}):
-                tag.decompose()
-        
-        # Încearcă să găsească conținutul principal
-        content_text = ""
-        
-        # Strategii de extragere în ordinea priorității
-        content_selectors = [
-            'article',
-            '.main-content',
-            '.content',
-            '.post-content',
-            '.article-content',
-            '.entry-content',
-            '#content',
-            '#main',
-            'main',
-            '.container',
-            '.wrapper'
-        ]
-        
-        for selector in content_selectors:
-            content_element = soup.select_one(selector)
-            if content_element:
-                content_text = content_element.get_text()
-                if len(content_text.strip()) > 200:  # Conținut substanțial
-                    break
-        
-        # Fallback - ia tot din body dacă nu găsește conținut specific
-        if not content_text or len(content_text.strip()) < 200:
-            body = soup.find('body')
-            content_text = body.get_text() if body else soup.get_text()
-        
-        # Curăță textul
-        return self._clean_text(content_text, url)
-    
     def _clean_text(self, text: str, url: str = "") -> str:
         """
         Curăță și normalizează textul extras
@@ -214,89 +187,269 @@ class RAGSystem:
         return result
     
     def process_pdf(self, pdf_path: str, municipality_id: str, filename: str) -> bool:
-        """Procesează un PDF și îl adaugă în baza de vectori"""
+        """
+        Procesează un PDF și îl adaugă în baza de vectori, în flux:
+        paginile sunt extrase în paralel (process pool), iar chunking-ul, embeddings
+        și scrierea în Chroma se fac incremental, în batch-uri de dimensiune fixă.
+        Un PDF identic cu cel deja indexat este ignorat.
+        """
         try:
-            # Citește PDF
-            reader = PdfReader(pdf_path)
-            full_text = ""
-            
-            for page_num, page in enumerate(reader.pages):
-                text = page.extract_text()
-                full_text += f"\n--- Pagina {page_num + 1} ---\n{text}"
-            
-            # Împarte textul în chunks
-            chunks = self._split_text(full_text, chunk_size=500, overlap=50)
-            
-            # Creează embeddings
-            embeddings = embeddings_model.embed_texts(chunks)
-            
-            # Adaugă în Chroma
+            started = time.perf_counter()
+            timings = {"extract": 0.0, "chunk": 0.0, "embed": 0.0, "store": 0.0}
             collection = self.get_or_create_collection(municipality_id)
             
-            ids = [f"{filename}_{i}_{str(uuid.uuid4())[:8]}" for i in range(len(chunks))]
-            metadatas = [
-                {
+            source_key = self._source_key("pdf", filename)
+            doc_hash = self._file_hash(pdf_path)
+            existing = self._existing_chunks(
+                collection, source_key,
+                legacy_where={"$and": [{"source": filename}, {"source_type": "pdf"}]}
+            )
+            if self._is_unchanged(existing, doc_hash):
+                print(f"♻️ PDF neschimbat, ignorat: {filename}")
+                return True
+            
+            progress = {"pages": 0}
+            result = self._sync_chunks(
+                collection, source_key, doc_hash,
+                self._pdf_chunk_batches(pdf_path, timings, progress), existing,
+                lambda chunk, i: {
                     "source": filename,
                     "source_type": "pdf",
                     "chunk_id": i,
                     "municipality": municipality_id,
-                    "page": self._extract_page_from_chunk(chunk)
-                }
-                for i, chunk in enumerate(chunks)
-            ]
-            
-            collection.add(
-                embeddings=embeddings,
-                documents=chunks,
-                metadatas=metadatas,
-                ids=ids
+                    "page": str(chunk["page"] or ""),
+                    **self._chunk_metadata(chunk)
+                },
+                timings
             )
             
-            print(f"✅ PDF procesat: {filename} - {len(chunks)} chunks")
+            self._report_ingestion(filename, "pdf", progress["pages"], result["chunks"], timings, time.perf_counter() - started)
+            print(f"✅ PDF procesat: {filename} - {result['chunks']} chunks ({self._describe_sync(result)})")
             return True
             
         except Exception as e:
             print(f"❌ Eroare procesare PDF {filename}: {e}")
             return False
     
+    def _pdf_chunk_batches(self, pdf_path: str, timings: Dict[str, float], progress: Dict[str, int]):
+        """Produce batch-uri de cel mult add_batch_size chunks, pe măsură ce paginile sunt extrase"""
+        chunker = LegalChunker()
+        pending = []
+        
+        for page_num, text in self._iter_pdf_pages(pdf_path, timings):
+            progress["pages"] += 1
+            chunk_started = time.perf_counter()
+            pending.extend(chunker.feed(f"\n--- Pagina {page_num + 1} ---\n{text}"))
+            timings["chunk"] += time.perf_counter() - chunk_started
+            
+            while len(pending) >= self.add_batch_size:
+                yield pending[:self.add_batch_size]
+                pending = pending[self.add_batch_size:]
+        
+        chunk_started = time.perf_counter()
+        pending.extend(chunker.finish())
+        timings["chunk"] += time.perf_counter() - chunk_started
+        if pending:
+            yield pending
+    
+    def _iter_pdf_pages(self, pdf_path: str, timings: Dict[str, float]):
+        """
+        Produce (număr pagină, text) în ordine. PDF-urile mari sunt extrase în paralel
+        într-un process pool, cu un număr limitat de intervale de pagini în lucru.
+        """
+        extract_started = time.perf_counter()
+        page_count = count_pages(pdf_path)
+        
+        if self.pdf_workers <= 1 or page_count < self.pdf_parallel_min_pages:
+            reader = PdfReader(pdf_path)
+            timings["extract"] += time.perf_counter() - extract_started
+            for page_num, page in enumerate(reader.pages):
+                extract_started = time.perf_counter()
+                text = page.extract_text() or ""
+                timings["extract"] += time.perf_counter() - extract_started
+                yield page_num, text
+            return
+        
+        ranges = iter([
+            (start, min(start + self.pdf_pages_per_task, page_count))
+            for start in range(0, page_count, self.pdf_pages_per_task)
+        ])
+        
+        with ProcessPoolExecutor(max_workers=self.pdf_workers) as executor:
+            in_flight = deque()
+            for page_range in islice(ranges, self.pdf_workers * 2):
+                in_flight.append((page_range[0], executor.submit(extract_pages, pdf_path, *page_range)))
+            timings["extract"] += time.perf_counter() - extract_started
+            
+            while in_flight:
+                extract_started = time.perf_counter()
+                start, future = in_flight.popleft()
+                texts = future.result()
+                
+                next_range = next(ranges, None)
+                if next_range is not None:
+                    in_flight.append((next_range[0], executor.submit(extract_pages, pdf_path, *next_range)))
+                timings["extract"] += time.perf_counter() - extract_started
+                
+                for offset, text in enumerate(texts):
+                    yield start + offset, text
+    
+    def _source_key(self, source_type: str, source: str) -> str:
+        """Identificator stabil al sursei (URL, nume fișier sau titlu)"""
+        return hashlib.sha256(f"{source_type}:{source}".encode("utf-8")).hexdigest()[:16]
+    
+    def _content_hash(self, data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+    
+    def _file_hash(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _existing_chunks(self, collection, source_key: str, legacy_where: Dict = None) -> Dict[str, Dict]:
+        """
+        Chunk-urile deja indexate pentru o sursă (id -> metadata). Include și chunk-urile
+        vechi cu id aleator (fără source_key), care vor fi înlocuite
+        """
+        existing = {}
+        current = collection.get(where={"source_key": source_key}, include=["metadatas"])
+        existing.update(zip(current["ids"], current["metadatas"]))
+        
+        if legacy_where:
+            legacy = collection.get(where=legacy_where, include=["metadatas"])
+            for chunk_id, metadata in zip(legacy["ids"], legacy["metadatas"]):
+                if "source_key" not in (metadata or {}):
+                    existing[chunk_id] = metadata or {}
+        
+        return existing
+    
+    def _is_unchanged(self, existing: Dict[str, Dict], doc_hash: str) -> bool:
+        return bool(existing) and all(metadata.get("doc_hash") == doc_hash for metadata in existing.values())
+    
+    def _sync_chunks(self, collection, source_key: str, doc_hash: str, chunk_batches, existing: Dict[str, Dict],
+                     make_metadata, timings: Dict[str, float] = None) -> Dict[str, int]:
+        """
+        Sincronizează chunk-urile unei surse cu Chroma, pe baza hash-ului fiecărui chunk:
+        - chunk-urile noi primesc embeddings și sunt adăugate (upsert)
+        - chunk-urile neschimbate își actualizează doar metadata (fără embeddings)
+        - chunk-urile care nu mai există în document sunt șterse
+        Id-ul unui chunk este {source_key}_{hash chunk}, deci re-încărcarea nu creează duplicate.
+        """
+        if timings is None:
+            timings = {"embed": 0.0, "store": 0.0}
+        
+        seen = set()
+        occurrences = {}
+        chunk_index = 0
+        added = kept = 0
+        
+        for batch in chunk_batches:
+            new_ids, new_chunks, new_metadatas = [], [], []
+            kept_ids, kept_metadatas = [], []
+            
+            for chunk in batch:
+                chunk_hash = hashlib.sha256(chunk["text"].encode("utf-8")).hexdigest()[:16]
+                occurrence = occurrences.get(chunk_hash, 0)
+                occurrences[chunk_hash] = occurrence + 1
+                
+                chunk_id = f"{source_key}_{chunk_hash}" + (f"_{occurrence}" if occurrence else "")
+                metadata = make_metadata(chunk, chunk_index)
+                metadata.update({"source_key": source_key, "doc_hash": doc_hash, "chunk_hash": chunk_hash})
+                seen.add(chunk_id)
+                chunk_index += 1
+                
+                if chunk_id in existing:
+                    kept_ids.append(chunk_id)
+                    kept_metadatas.append(metadata)
+                else:
+                    new_ids.append(chunk_id)
+                    new_chunks.append(chunk["text"])
+                    new_metadatas.append(metadata)
+            
+            if new_chunks:
+                embed_started = time.perf_counter()
+                embeddings = embeddings_model.embed_texts(new_chunks)
+                store_started = time.perf_counter()
+                collection.upsert(ids=new_ids, embeddings=embeddings, documents=new_chunks, metadatas=new_metadatas)
+                timings["embed"] += store_started - embed_started
+                timings["store"] += time.perf_counter() - store_started
+                ingest_embeddings.inc(len(new_chunks))
+                added += len(new_ids)
+            
+            if kept_ids:
+                store_started = time.perf_counter()
+                collection.update(ids=kept_ids, metadatas=kept_metadatas)
+                timings["store"] += time.perf_counter() - store_started
+                kept += len(kept_ids)
+        
+        stale = [chunk_id for chunk_id in existing if chunk_id not in seen]
+        for start in range(0, len(stale), self.add_batch_size):
+            collection.delete(ids=stale[start:start + self.add_batch_size])
+        
+        return {"chunks": chunk_index, "added": added, "kept": kept, "deleted": len(stale)}
+    
+    def _describe_sync(self, result: Dict[str, int]) -> str:
+        return f"{result['added']} noi, {result['kept']} neschimbate, {result['deleted']} șterse"
+    
+    def _report_ingestion(self, source: str, source_type: str, pages: int, chunks: int,
+                          timings: Dict[str, float], total_seconds: float):
+        """Afișează și păstrează timpii pe etape pentru un document procesat"""
+        stats = {
+            "source": source,
+            "source_type": source_type,
+            "pages": pages,
+            "chunks": chunks,
+            "total_seconds": round(total_seconds, 3),
+            "stages": {stage: round(seconds, 3) for stage, seconds in timings.items()},
+            "pages_per_second": round(pages / total_seconds, 1) if total_seconds > 0 else 0.0
+        }
+        self.ingestion_stats.append(stats)
+        ingest_pages.labels(source_type).inc(pages)
+        ingest_chunks.labels(source_type).inc(chunks)
+        for stage, seconds in timings.items():
+            ingest_stage_seconds.labels(stage).observe(seconds)
+        stages = " | ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items())
+        print(f"⏱️ {source}: {pages} pagini, {chunks} chunks în {total_seconds:.2f}s ({stages})")
+        return stats
+    
     def process_text_content(self, text_content: str, municipality_id: str, title: str, source_type: str = "text") -> bool:
         """
-        Procesează conținut text direct (pentru cazuri când ai deja textul extras)
+        Procesează conținut text direct (pentru cazuri când ai deja textul extras).
+        Sursa e identificată prin titlu și hash-ul conținutului: același text încărcat din nou
+        nu creează duplicate, iar texte diferite cu același titlu rămân documente separate.
         """
         try:
             if len(text_content.strip()) < 100:
                 print(f"⚠️ Conținut text insuficient pentru {title}")
                 return False
             
-            # Împarte textul în chunks
-            chunks = self._split_text(text_content, chunk_size=500, overlap=50)
+            collection = self.get_or_create_collection(municipality_id)
+            doc_hash = self._content_hash(text_content.encode("utf-8"))
+            source_key = self._source_key(source_type, f"{title}:{doc_hash}")
             
-            # Creează embeddings
-            embeddings = embeddings_model.embed_texts(chunks)
+            # Fără legacy_where: chunk-urile vechi cu același titlu pot aparține altui text
+            existing = self._existing_chunks(collection, source_key)
+            if self._is_unchanged(existing, doc_hash):
+                print(f"♻️ Text neschimbat, ignorat: {title}")
+                return True
             
-            # Adaugă în Chroma
-            collection = self.get_or_create_collection(municipality_id)
+            # Împarte textul în chunks
+            chunks = self._split_text(text_content)
             
-            source_name = title.replace(' ', '_')[:50]
-            ids = [f"{source_name}_{i}_{str(uuid.uuid4())[:8]}" for i in range(len(chunks))]
-            metadatas = [
-                {
+            result = self._sync_chunks(
+                collection, source_key, doc_hash, [chunks], existing,
+                lambda chunk, i: {
                     "source": title,
                     "source_type": source_type,
                     "chunk_id": i,
-                    "municipality": municipality_id
+                    "municipality": municipality_id,
+                    **self._chunk_metadata(chunk)
                 }
-                for i, chunk in enumerate(chunks)
-            ]
-            
-            collection.add(
-                embeddings=embeddings,
-                documents=chunks,
-                metadatas=metadatas,
-                ids=ids
             )
             
-            print(f"✅ Text procesat: {title} - {len(chunks)} chunks")
+            print(f"✅ Text procesat: {title} - {len(chunks)} chunks ({self._describe_sync(result)})")
             return True
             
         except Exception as e:
@@ -337,85 +490,160 @@ class RAGSystem:
             print(f"❌ Eroare căutare: {e}")
             return []
     
-    def generate_response(self, query: str, context_docs: List[Dict]) -> Dict[str, Any]:
-        """Generează răspuns folosind Ollama cu context îmbunătățit"""
-        try:
-            # Construiește contextul cu informații despre surse
-            context = ""
-            sources = []
-            
-            for doc in context_docs:
-                source_info = f"{doc['metadata']['source']}"
-                
-                # Adaugă informații specifice tipului de sursă
-                if doc['metadata'].get('source_type') == 'html':
-                    if doc['metadata'].get('url'):
-                        source_info += f" (web: {doc['metadata']['domain']})"
-                elif doc['metadata'].get('source_type') == 'pdf':
-                    if 'page' in doc['metadata'] and doc['metadata']['page']:
-                        source_info += f", pagina {doc['metadata']['page']}"
-                
-                context += f"\nSursa: {source_info}\nConținut: {doc['content']}\n"
-                sources.append(source_info)
-            
-            # Prompt îmbunătățit pentru model
-            prompt = f"""
-Ești un asistent AI specializat în legislația fiscală românească pentru primării.
-
-Context din documente oficiale (PDF, web, text):
+    def _source_info(self, doc: Dict) -> str:
+        """Descrierea sursei unui fragment: document, site, pagină, articol"""
+        source_info = f"{doc['metadata']['source']}"
+        
+        # Adaugă informații specifice tipului de sursă
+        if doc['metadata'].get('source_type') == 'html':
+            if doc['metadata'].get('url'):
+                source_info += f" (web: {doc['metadata']['domain']})"
+        elif doc['metadata'].get('source_type') == 'pdf':
+            if 'page' in doc['metadata'] and doc['metadata']['page']:
+                source_info += f", pagina {doc['metadata']['page']}"
+        if doc['metadata'].get('article'):
+            source_info += f", {doc['metadata']['article']}"
+        return source_info
+    
+    def _build_prompt(self, query: str, context_docs: List[Dict]):
+        """
+        Construiește promptul și lista de surse; contextul e limitat la bugetul de tokeni
+        al context_packer. Returnează (prompt, sources, packed)
+        """
+        packed = context_packer.pack(
+            context_docs, query,
+            header=lambda doc, number: f"\nSursa: {self._source_info(doc)}\nConținut: \n"
+        )
+        context = ""
+        sources = []
+        
+        for snippet in packed["snippets"]:
+            source_info = self._source_info(snippet["doc"])
+            context += f"\nSursa: {source_info}\nConținut: {snippet['text']}\n"
+            sources.append(source_info)
+        
+        # Instrucțiunile sunt în SYSTEM_PROMPT (prefix stabil, refolosit din cache-ul KV al modelului)
+        prompt = f"""Context din documente oficiale (PDF, web, text):
 {context}
 
 Întrebare: {query}
 
-Instrucțiuni:
-1. Răspunde DOAR pe baza informațiilor din context
-2. Dacă nu găsești informația în context, spune că nu ai informația necesară
-3. Citează sursa informației (document, pagină, sau site web)
-4. Răspunde în română, clear și concis
-5. Folosește un ton oficial dar accesibil
-6. Dacă informația vine de pe web, menționează că este de pe site-ul oficial
-
 Răspuns:
 """
-
-            # Apel la Ollama
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": self.ollama_model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,
-                        "num_predict": 400
-                    }
-                }
+        return prompt, sources, packed
+    
+    def _build_payload(self, prompt: str) -> Dict[str, Any]:
+        return {
+            "model": self.ollama_model,
+            "system": SYSTEM_PROMPT,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": ollama_manager.keep_alive,
+            "options": {
+                "temperature": 0.3,
+                "num_predict": 400
+            }
+        }
+    
+    def _record_usage(self, result: Dict, prompt: str):
+        ollama_manager.record_prompt_eval(result, estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt))
+        record_ollama_eval(result)
+    
+    def _format_response(self, result: Dict, sources: List[str], packed: Dict) -> Dict[str, Any]:
+        context_docs = [snippet["doc"] for snippet in packed["snippets"]]
+        return {
+            "response": result['response'].strip(),
+            "sources": list(set(sources)),
+            "context_used": len(context_docs),
+            "context_tokens": packed["tokens_used"],
+            "source_types": list(set([doc['metadata'].get('source_type', 'unknown') for doc in context_docs]))
+        }
+    
+    def _error_response(self) -> Dict[str, Any]:
+        return {
+            "response": "Scuze, am întâmpinat o problemă tehnică. Încercați din nou.",
+            "sources": [],
+            "context_used": 0,
+            "context_tokens": 0,
+            "source_types": []
+        }
+    
+    def generate_response(self, query: str, context_docs: List[Dict]) -> Dict[str, Any]:
+        """
+        Generează răspuns folosind Ollama cu context îmbunătățit.
+        Varianta sincronă - din endpoint-uri async folosiți generate_response_async
+        """
+        try:
+            prompt, sources, packed = self._build_prompt(query, context_docs)
+            
+            # Apel la Ollama, pe backend-ul ales de router
+            backend = self.ollama_router.acquire()
+            started = time.perf_counter()
+            try:
+                response = requests.post(
+                    f"{backend.url}/api/generate",
+                    json=self._build_payload(prompt),
+                    timeout=self.generation_timeout
+                )
+            except Exception:
+                self.ollama_router.release(backend, ok=False)
+                raise
+            self.ollama_router.observe(backend, time.perf_counter() - started)
+            self.ollama_router.release(backend, ok=response.status_code < 500)
+            
+            if response.status_code == 200:
+                result = response.json()
+                self._record_usage(result, prompt)
+                return self._format_response(result, sources, packed)
+            else:
+                return self._error_response()
+                
+        except Exception as e:
+            print(f"❌ Eroare generare răspuns: {e}")
+            return self._error_response()
+    
+    async def generate_response_async(self, query: str, context_docs: List[Dict], timeout: float = None) -> Dict[str, Any]:
+        """
+        Generează răspunsul fără să blocheze event loop-ul, prin clientul Ollama partajat.
+        Anularea task-ului (ex. clientul s-a deconectat) oprește și cererea către Ollama.
+        """
+        try:
+            prompt, sources, packed = self._build_prompt(query, context_docs)
+            
+            response = await ollama_manager.generate(
+                self._build_payload(prompt),
+                timeout=timeout or self.generation_timeout
             )
             
             if response.status_code == 200:
                 result = response.json()
-                return {
-                    "response": result['response'].strip(),
-                    "sources": list(set(sources)),
-                    "context_used": len(context_docs),
-                    "source_types": list(set([doc['metadata'].get('source_type', 'unknown') for doc in context_docs]))
-                }
+                self._record_usage(result, prompt)
+                return self._format_response(result, sources, packed)
             else:
-                return {
-                    "response": "Scuze, am întâmpinat o problemă tehnică. Încercați din nou.",
-                    "sources": [],
-                    "context_used": 0,
-                    "source_types": []
-                }
+                return self._error_response()
                 
         except Exception as e:
             print(f"❌ Eroare generare răspuns: {e}")
-            return {
-                "response": "Scuze, am întâmpinat o problemă tehnică. Încercați din nou.",
-                "sources": [],
-                "context_used": 0,
-                "source_types": []
-            }
+            return self._error_response()
+    
+    async def search_documents_async(self, query: str, municipality_id: str, n_results: int = 5) -> List[Dict]:
+        """Căutarea în Chroma rulează într-un thread, ca să nu blocheze event loop-ul"""
+        return await asyncio.to_thread(self.search_documents, query, municipality_id, n_results)
+    
+    async def answer_async(self, query: str, municipality_id: str, n_results: int = 5, timeout: float = None) -> Dict[str, Any]:
+        """
+        Pipeline complet async: căutare în documente + generare răspuns.
+        timeout limitează durata totală; la depășire se returnează răspunsul de eroare.
+        """
+        async def pipeline():
+            context_docs = await self.search_documents_async(query, municipality_id, n_results)
+            return await self.generate_response_async(query, context_docs, timeout=timeout)
+        
+        try:
+            return await asyncio.wait_for(pipeline(), timeout=timeout or self.generation_timeout)
+        except asyncio.TimeoutError:
+            print(f"⏱️ Timeout generare răspuns pentru: {query}")
+            return self._error_response()
     
     def list_documents(self, municipality_id: str) -> List[Dict]:
         """
@@ -447,22 +675,19 @@ Răspuns:
             print(f"❌ Eroare listare documente: {e}")
             return []
     
-    def _split_text(self, text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
-        """Împarte textul în chunks cu overlap"""
-        words = text.split()
-        chunks = []
-        
-        for i in range(0, len(words), chunk_size - overlap):
-            chunk = ' '.join(words[i:i + chunk_size])
-            if chunk.strip():
-                chunks.append(chunk.strip())
-                
-        return chunks
+    def _split_text(self, text: str) -> List[Dict]:
+        """Împarte textul în chunks pe structura juridică (articole, alineate), vezi ai.legal_chunker"""
+        return chunk_legal_text(text)
     
-    def _extract_page_from_chunk(self, chunk: str) -> str:
-        """Extrage numărul paginii din chunk"""
-        page_match = re.search(r'--- Pagina (\d+) ---', chunk)
-        return page_match.group(1) if page_match else ""
+    def _chunk_metadata(self, chunk: Dict) -> Dict[str, Any]:
+        """Poziția chunk-ului în document, tokenii estimați și articolul/capitolul din care face parte"""
+        return {
+            "char_start": chunk["start"],
+            "char_end": chunk["end"],
+            "tokens": chunk["tokens"],
+            "article": chunk["article"],
+            "chapter": chunk["chapter"]
+        }
 
 # Singleton instance
 rag_system = RAGSystem()
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Index inversat cu scor BM25 pentru căutarea în chunk-urile documentelor
+"""
+
+import heapq
+import math
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from .text_utils import tokenize
+
+ChunkKey = Tuple[str, int]  # (doc_id, index chunk)
+
+class InvertedIndex:
+    """
+    Index inversat (termen -> postings cu frecvențe) pentru o singură primărie.
+    Costul unei căutări depinde doar de lungimea listelor de postings
+    ale termenilor din întrebare, nu de numărul total de chunk-uri.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[ChunkKey, int]] = {}
+        self.chunk_lengths: Dict[ChunkKey, int] = {}
+        self.doc_chunks: Dict[str, Dict[int, List[str]]] = {}  # doc_id -> index chunk -> termeni (pentru ștergere)
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.chunk_lengths)
+
+    def add_document(self, doc_id: str, chunks: List[str]):
+        """Indexează toate chunk-urile unui document"""
+        for chunk_index, chunk in enumerate(chunks):
+            self.add_chunk_terms(doc_id, chunk_index, Counter(tokenize(chunk)))
+
+    def add_chunk_terms(self, doc_id: str, chunk_index: int, term_freqs: Dict[str, int]):
+        """Adaugă un chunk deja tokenizat (termen -> frecvență)"""
+        key = (doc_id, chunk_index)
+        if key in self.chunk_lengths:
+            return
+
+        length = sum(term_freqs.values())
+        self.chunk_lengths[key] = length
+        self.total_length += length
+
+        self.doc_chunks.setdefault(doc_id, {})[chunk_index] = list(term_freqs)
+        for term, freq in term_freqs.items():
+            self.postings.setdefault(term, {})[key] = freq
+
+    def remove_document(self, doc_id: str):
+        """
+        Elimină din index toate chunk-urile unui document; șterge direct cheile
+        (doc_id, chunk), deci costul depinde doar de mărimea documentului
+        """
+        for chunk_index, terms in self.doc_chunks.pop(doc_id, {}).items():
+            key = (doc_id, chunk_index)
+            for term in terms:
+                postings = self.postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(key, None)
+                if not postings:
+                    del self.postings[term]
+            self.total_length -= self.chunk_lengths.pop(key, 0)
+
+    def search(self, query: str, n_results: int = 3) -> List[Tuple[float, str, int]]:
+        """
+        Returnează top n_results chunk-uri ca (scor, doc_id, index chunk),
+        ordonate descrescător după scorul BM25
+        """
+        n_chunks = len(self.chunk_lengths)
+        if n_chunks == 0 or n_results <= 0:
+            return []
+
+        avg_length = self.total_length / n_chunks or 1.0
+        scores: Dict[ChunkKey, float] = {}
+
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+
+            df = len(postings)
+            idf = math.log(1.0 + (n_chunks - df + 0.5) / (df + 0.5))
+
+            for key, freq in postings.items():
+                norm = self.k1 * (1.0 - self.b + self.b * self.chunk_lengths[key] / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * freq * (self.k1 + 1.0) / (freq + norm)
+
+        top = heapq.nlargest(n_results, scores.items(), key=lambda item: item[1])
+        return [(score, key[0], key[1]) for key, score in top]
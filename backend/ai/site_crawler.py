@@ -0,0 +1,272 @@
+"""
+Crawl pe un site întreg pornind de la un URL sau de la sitemap.xml: BFS pe linkurile
+din același domeniu, limită de adâncime și de pagini, frontieră salvată pe disc pentru reluare
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from html.parser import HTMLParser
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+import httpx
+
+from .crawler import crawler as default_crawler
+
+SKIPPED_EXTENSIONS = (
+    ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".zip", ".rar", ".7z",
+    ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".ico", ".mp3", ".mp4", ".avi",
+    ".css", ".js", ".xml", ".json", ".rss"
+)
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Forma canonică a unui URL pentru deduplicare: absolut, fără fragment, schemă și host
+    cu litere mici, fără port implicit, parametri sortați și fără parametri de tracking
+    """
+    try:
+        url = urljoin(base, url.strip()) if base else url.strip()
+        parsed = urlparse(url)
+        port = parsed.port
+    except ValueError:
+        return None
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return None
+
+    host = parsed.hostname.lower()
+    if port and not (parsed.scheme == "http" and port == 80 or parsed.scheme == "https" and port == 443):
+        host = f"{host}:{port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunparse((parsed.scheme.lower(), host, parsed.path or "/", "", urlencode(query), ""))
+
+def site_key(url: str) -> str:
+    """Domeniul unui URL, fără prefixul www."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+class _LinkParser(HTMLParser):
+    """Colectează href-urile din <a> și <base href> într-o singură trecere"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.base = None
+        self.links: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a" or tag == "base":
+            href = dict(attrs).get("href")
+            if href:
+                if tag == "base":
+                    self.base = self.base or href
+                else:
+                    self.links.append(href)
+
+def extract_links(html: str, page_url: str) -> List[str]:
+    parser = _LinkParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+    base = urljoin(page_url, parser.base) if parser.base else page_url
+    return [link for link in (normalize_url(href, base) for href in parser.links) if link]
+
+def parse_sitemap(content: bytes) -> Dict[str, List[str]]:
+    """Returnează {"pages": [...], "sitemaps": [...]} dintr-un urlset sau sitemapindex"""
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+
+    root = ET.fromstring(content)
+    locs = [element.text.strip() for element in root.iter() if element.tag.endswith("loc") and element.text]
+    if root.tag.endswith("sitemapindex"):
+        return {"pages": [], "sitemaps": locs}
+    return {"pages": locs, "sitemaps": []}
+
+class SiteCrawler:
+    """
+    Parcurge un site în lățime (BFS) și trimite fiecare pagină HTML către handler.
+    Descărcările trec prin Crawler (limite per host, reîncercări). Starea (frontiera și URL-urile
+    văzute) e salvată după fiecare lot; o rulare oprită (restart, buget atins) continuă de unde a rămas,
+    iar fișierul de stare este șters când frontiera se golește.
+    """
+
+    def __init__(self, seed_url: str, handler: Callable[[str, httpx.Response], Awaitable[Optional[Dict]]],
+                 max_pages: Optional[int] = None, max_depth: Optional[int] = None,
+                 state_path: Optional[str] = None, crawler=None):
+        self.seed_url = normalize_url(seed_url)
+        if not self.seed_url:
+            raise ValueError(f"URL invalid: {seed_url}")
+
+        self.handler = handler
+        self.max_pages = max_pages or int(os.getenv("SITE_CRAWL_MAX_PAGES", "500"))
+        self.max_depth = max_depth if max_depth is not None else int(os.getenv("SITE_CRAWL_MAX_DEPTH", "3"))
+        self.max_sitemaps = int(os.getenv("SITE_CRAWL_MAX_SITEMAPS", "50"))
+        self.state_path = state_path
+        self.crawler = crawler or default_crawler
+        self.site = site_key(self.seed_url)
+
+        self.frontier = deque()  # (url, adâncime)
+        self.seen = set()
+        self.stats = {"fetched": 0, "processed": 0, "skipped": 0, "failed": 0, "elapsed_seconds": 0.0}
+        self.errors: List[str] = []
+
+    def is_sitemap(self) -> bool:
+        path = urlparse(self.seed_url).path.lower()
+        return path.endswith(".xml") or path.endswith(".xml.gz")
+
+    def _enqueue(self, url: str, depth: int) -> bool:
+        if url in self.seen or site_key(url) != self.site:
+            return False
+        if urlparse(url).path.lower().endswith(SKIPPED_EXTENSIONS):
+            return False
+        self.seen.add(url)
+        self.frontier.append((url, depth))
+        return True
+
+    def _load_state(self) -> bool:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return False
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Starea crawl-ului nu poate fi citită ({self.state_path}): {e}")
+            return False
+        if state.get("seed_url") != self.seed_url:
+            return False
+
+        self.frontier = deque((url, depth) for url, depth in state["frontier"])
+        self.seen = set(state["seen"])
+        self.stats.update(state.get("stats", {}))
+        return True
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "seed_url": self.seed_url,
+                "frontier": list(self.frontier),
+                "seen": list(self.seen),
+                "stats": self.stats
+            }, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _clear_state(self):
+        if self.state_path and os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+    async def _seed_from_sitemap(self):
+        """Adaugă în frontieră paginile din sitemap (inclusiv sitemap-uri index)"""
+        pending = [self.seed_url]
+        visited = set()
+
+        async with self.crawler.new_client() as client:
+            while pending and len(visited) < self.max_sitemaps:
+                sitemap_url = pending.pop(0)
+                if sitemap_url in visited:
+                    continue
+                visited.add(sitemap_url)
+
+                result = await self.crawler.fetch(client, sitemap_url)
+                if not result["success"]:
+                    self.errors.append(f"{sitemap_url}: {result.get('error', 'Unknown error')}")
+                    continue
+                try:
+                    entries = parse_sitemap(result["response"].content)
+                except (ET.ParseError, OSError) as e:
+                    self.errors.append(f"{sitemap_url}: sitemap invalid ({e})")
+                    continue
+
+                pending.extend(url for url in (normalize_url(loc) for loc in entries["sitemaps"]) if url)
+                for loc in entries["pages"]:
+                    url = normalize_url(loc)
+                    if url:
+                        self._enqueue(url, 0)
+
+        print(f"🗺️ Sitemap: {len(self.frontier)} pagini din {len(visited)} fișiere")
+
+    async def _handle_page(self, url: str, depth: int, response: httpx.Response) -> Dict:
+        content_type = response.headers.get("content-type", "")
+        if "html" not in content_type and content_type:
+            return {"outcome": "skipped"}
+
+        if depth < self.max_depth:
+            links = await asyncio.to_thread(extract_links, response.text, str(response.url))
+            for link in links:
+                self._enqueue(link, depth + 1)
+
+        result = await self.handler(url, response) or {}
+        return {"outcome": "processed", **result}
+
+    async def run(self) -> Dict:
+        """Rulează (sau reia) crawl-ul până la golirea frontierei sau epuizarea bugetului de pagini"""
+        resumed = self._load_state()
+        if resumed:
+            print(f"⏯️ Reiau crawl-ul {self.seed_url}: {len(self.frontier)} URL-uri în frontieră")
+        elif self.is_sitemap():
+            await self._seed_from_sitemap()
+        else:
+            self._enqueue(self.seed_url, 0)
+
+        started = time.perf_counter()
+        fetched_this_run = 0
+
+        while self.frontier and fetched_this_run < self.max_pages:
+            batch_size = min(self.crawler.max_workers * 2, self.max_pages - fetched_this_run)
+            batch = [self.frontier.popleft() for _ in range(min(batch_size, len(self.frontier)))]
+            depths = dict(batch)
+
+            results = await self.crawler.crawl(
+                [url for url, _ in batch],
+                lambda url, response: self._handle_page(url, depths[url], response),
+                progress=lambda done, total, result: None
+            )
+
+            for result in results:
+                fetched_this_run += 1
+                self.stats["fetched"] += 1
+                if not result["success"]:
+                    self.stats["failed"] += 1
+                    self.errors.append(f"{result['url']}: {result.get('error', 'Unknown error')}")
+                elif result.get("outcome") == "skipped":
+                    self.stats["skipped"] += 1
+                else:
+                    self.stats["processed"] += 1
+
+            elapsed = time.perf_counter() - started
+            print(f"🕷️ {self.site}: {self.stats['fetched']} pagini, {len(self.frontier)} în frontieră "
+                  f"({fetched_this_run / elapsed if elapsed else 0:.1f} pagini/s)")
+            self._save_state()
+
+        elapsed = time.perf_counter() - started
+        self.stats["elapsed_seconds"] = round(self.stats["elapsed_seconds"] + elapsed, 3)
+        finished = not self.frontier
+        if finished:
+            self._clear_state()
+        else:
+            self._save_state()
+
+        return {
+            "seed_url": self.seed_url,
+            "resumed": resumed,
+            "finished": finished,
+            "pages_this_run": fetched_this_run,
+            "pages_per_second": round(fetched_this_run / elapsed, 2) if elapsed else 0.0,
+            "frontier": len(self.frontier),
+            "seen": len(self.seen),
+            **self.stats,
+            "errors": self.errors[:50]
+        }
@@ -0,0 +1,40 @@
+"""
+Utilitare de text comune (normalizare diacritice, tokenizare, estimare tokeni LLM)
+"""
+
+import re
+from typing import List
+
+# Diacriticele românești (inclusiv variantele cu sedilă)
+DIACRITICS_TABLE = str.maketrans({
+    'ă': 'a', 'â': 'a', 'î': 'i', 'ș': 's', 'ț': 't',
+    'ş': 's', 'ţ': 't'
+})
+
+_WORD_RE = re.compile(r'\w+')
+_TOKEN_PIECE_RE = re.compile(r'\w+|[^\w\s]')
+
+def fold_diacritics(text: str) -> str:
+    """Lowercase și înlocuiește diacriticele românești"""
+    return text.lower().translate(DIACRITICS_TABLE)
+
+def tokenize(text: str, min_length: int = 3) -> List[str]:
+    """
+    Împarte textul în termeni normalizați pentru căutare.
+    Cuvintele mai scurte de min_length caractere sunt ignorate.
+    """
+    return [word for word in _WORD_RE.findall(fold_diacritics(text)) if len(word) >= min_length]
+
+def normalize_question(text: str) -> str:
+    """
+    Formă canonică a unei întrebări (fără diacritice, punctuație și spații multiple),
+    folosită drept cheie pentru cache
+    """
+    return ' '.join(_WORD_RE.findall(fold_diacritics(text)))
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimare rapidă a numărului de tokeni LLM, fără tokenizer: un token la fiecare
+    ~4 caractere dintr-un cuvânt și unul pentru fiecare semn de punctuație
+    """
+    return sum((len(piece) + 3) // 4 for piece in _TOKEN_PIECE_RE.findall(text))
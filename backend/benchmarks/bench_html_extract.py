@@ -0,0 +1,88 @@
+"""
+Benchmark pentru extragerea conținutului din HTML: compară backend-urile din ai.html_extract
+(stdlib, lxml dacă e instalat) cu implementarea de referință BeautifulSoup ("bs4"),
+pe paginile salvate din benchmarks/fixtures/html.
+
+Rulare (din backend/):
+    python benchmarks/bench_html_extract.py
+    python benchmarks/bench_html_extract.py --repeat 20 --fixtures /cale/spre/pagini
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.html_extract import available_backends, extract_html  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html")
+
+def load_fixtures(directory: str) -> dict:
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.htm*"))):
+        with open(path, "rb") as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+def normalized(page: dict) -> tuple:
+    """Titlul și textul cu spațiile comasate, ca la începutul lui _clean_text"""
+    return page["title"], re.sub(r"\s+", " ", page["text"]).strip()
+
+def run_backend(backend: str, pages: dict, repeat: int) -> dict:
+    outputs = {name: extract_html(data, backend) for name, data in pages.items()}  # încălzire
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for data in pages.values():
+            extract_html(data, backend)
+    elapsed = time.perf_counter() - started
+    total_bytes = sum(len(data) for data in pages.values()) * repeat
+    return {
+        "seconds": elapsed,
+        "pages_per_second": len(pages) * repeat / elapsed,
+        "mb_per_second": total_bytes / elapsed / 1024 / 1024,
+        "outputs": outputs
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extragere HTML")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="director cu pagini HTML salvate")
+    parser.add_argument("--repeat", type=int, default=10, help="de câte ori se parcurge corpusul")
+    parser.add_argument("--backends", default=",".join(available_backends()),
+                        help="listă separată prin virgulă (implicit toate cele disponibile)")
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixtures)
+    if not pages:
+        print(f"❌ Nu există pagini HTML în {args.fixtures}")
+        sys.exit(1)
+    size_mb = sum(len(data) for data in pages.values()) / 1024 / 1024
+    print(f"📚 {len(pages)} pagini ({size_mb:.2f} MB) × {args.repeat} repetări")
+
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    if "bs4" not in backends:
+        backends.append("bs4")
+    results = {backend: run_backend(backend, pages, args.repeat) for backend in backends}
+    reference = results["bs4"]
+
+    print(f"\n{'backend':<8} {'pagini/s':>10} {'MB/s':>8} {'speedup':>8}  echivalent")
+    mismatched = False
+    for backend, result in results.items():
+        differing = [
+            name for name in pages
+            if normalized(result["outputs"][name]) != normalized(reference["outputs"][name])
+        ]
+        mismatched = mismatched or bool(differing)
+        speedup = reference["seconds"] / result["seconds"]
+        status = "✅" if not differing else f"❌ {', '.join(differing)}"
+        print(f"{backend:<8} {result['pages_per_second']:>10.1f} {result['mb_per_second']:>8.2f} "
+              f"{speedup:>7.1f}x  {status}")
+
+    if mismatched:
+        print("\n⚠️ Unele backend-uri produc alt text decât BeautifulSoup (lxml corectează HTML-ul invalid altfel)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Micro-benchmark pentru ingestie și căutare pe un corpus sintetic (benchmarks/corpus.py), la mai
+multe dimensiuni (chunk-uri per primărie). Pentru fiecare dimensiune măsoară timpul și memoria
+maximă alocată în Python (tracemalloc, într-o rulare separată de cea cronometrată) pentru:
+
+    split_text          IntegratedRAGSystem._split_text (chunking juridic)
+    prepare_html        IntegratedRAGSystem._prepare_html_document (extragere, curățare, chunking)
+    embed_texts         SimpleEmbeddings.embed_texts
+    integrated_index    IntegratedRAGSystem._add_document (index BM25)
+    integrated_search   IntegratedRAGSystem.search_documents
+    chroma_ingest       upsert în colecția Chroma (embedding-uri calculate dinainte)
+    chroma_search       RAGSystem.search_documents
+
+Rulează offline: Chroma folosește un director local temporar (sau --chroma-dir), fără telemetrie.
+Memoria Chroma e alocată în afara Python și nu apare în tracemalloc.
+
+Rulare (din backend/):
+    python benchmarks/bench_retrieval.py --output retrieval.json
+    python benchmarks/bench_retrieval.py --scales 10,1000,100000 --skip chroma_ingest,chroma_search
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_documents, generate_questions, to_html  # noqa: E402
+
+FUNCTIONS = ["split_text", "prepare_html", "embed_texts", "integrated_index", "integrated_search",
+             "chroma_ingest", "chroma_search"]
+MUNICIPALITY = "bench"
+
+def peak_memory_mb(run: Callable[[], object]) -> float:
+    """Memoria maximă alocată în Python în timpul apelului (MB)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024 / 1024, 2)
+
+def timed(run: Callable[[], object], repeat: int) -> float:
+    """Cel mai bun timp din repeat rulări (secunde)"""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def throughput(seconds: float, items: int, unit: str, peak_mb: Optional[float]) -> Dict:
+    return {
+        "seconds": round(seconds, 4),
+        f"{unit}_per_second": round(items / seconds, 1) if seconds > 0 else None,
+        "peak_mb": peak_mb
+    }
+
+def query_latencies(search: Callable[[str], object], questions: List[str]) -> Dict:
+    for question in questions[:5]:
+        search(question)  # încălzire
+    latencies = []
+    for question in questions:
+        started = time.perf_counter()
+        search(question)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "queries": len(latencies),
+        "mean_ms": round(total / len(latencies) * 1000, 3),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "p95_ms": round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000, 3),
+        "queries_per_second": round(len(latencies) / total, 1) if total > 0 else None
+    }
+
+def bench_scale(scale: int, args, selected: List[str], modules: Dict) -> Dict:
+    IntegratedRAGSystem = modules["IntegratedRAGSystem"]
+    embeddings = modules["embeddings"]
+    memory = not args.no_memory
+    repeat = args.repeat if scale <= 10000 else 1
+
+    documents = generate_documents(scale, seed=args.seed)
+    questions = generate_questions(args.queries, seed=args.seed)
+    splitter = IntegratedRAGSystem(snapshot_path="")
+    split = [splitter._split_text(document["text"]) for document in documents]
+    chunks = [chunk for document_chunks, _ in split for chunk in document_chunks]
+    result = {"scale": scale, "documents": len(documents), "chunks": len(chunks), "functions": {}}
+    functions = result["functions"]
+
+    if "split_text" in selected:
+        run = lambda: [splitter._split_text(document["text"]) for document in documents]
+        functions["split_text"] = throughput(timed(run, repeat), len(chunks), "chunks",
+                                             peak_memory_mb(run) if memory else None)
+
+    if "prepare_html" in selected:
+        pages = [to_html(document) for document in documents]
+        size_mb = sum(len(page) for page in pages) / 1024 / 1024
+        run = lambda: [splitter._prepare_html_document(f"https://primarie.ro/hcl-{i}", page)
+                       for i, page in enumerate(pages)]
+        seconds = timed(run, repeat)
+        functions["prepare_html"] = {**throughput(seconds, len(pages), "pages", peak_memory_mb(run) if memory else None),
+                                     "mb_per_second": round(size_mb / seconds, 2) if seconds > 0 else None}
+
+    vectors = None
+    if {"embed_texts", "chroma_ingest", "chroma_search"} & set(selected):
+        run = lambda: embeddings.embed_texts(chunks)
+        seconds = timed(run, repeat if "embed_texts" in selected else 1)
+        vectors = embeddings.embed_texts(chunks)
+        if "embed_texts" in selected:
+            functions["embed_texts"] = throughput(seconds, len(chunks), "chunks", peak_memory_mb(run) if memory else None)
+
+    def build_index():
+        system = IntegratedRAGSystem(snapshot_path="")
+        for i, (document, (document_chunks, chunk_info)) in enumerate(zip(documents, split)):
+            system._add_document({
+                "id": f"doc-{i}", "title": document["title"], "content": document["text"],
+                "source_type": "text", "chunks": document_chunks, "chunk_info": chunk_info,
+                "municipality_id": MUNICIPALITY, "created_at": ""
+            }, persist=False)
+        return system
+
+    if "integrated_index" in selected or "integrated_search" in selected:
+        started = time.perf_counter()
+        system = build_index()
+        seconds = time.perf_counter() - started
+        if "integrated_index" in selected:
+            functions["integrated_index"] = throughput(seconds, len(chunks), "chunks",
+                                                       peak_memory_mb(build_index) if memory else None)
+        if "integrated_search" in selected:
+            search = lambda question: system.search_documents(question, MUNICIPALITY, n_results=5)
+            functions["integrated_search"] = query_latencies(search, questions)
+            if memory:
+                functions["integrated_search"]["peak_mb"] = peak_memory_mb(lambda: [search(q) for q in questions])
+        del system
+
+    if "chroma_ingest" in selected or "chroma_search" in selected:
+        rag = modules["rag_system"]
+        municipality = f"{MUNICIPALITY}_{scale}"
+        collection_name = f"docs_{municipality}"
+        try:
+            rag.client.delete_collection(collection_name)
+        except Exception:
+            pass
+        collection = rag.get_or_create_collection(municipality)
+        batch = rag.add_batch_size
+        started = time.perf_counter()
+        for start in range(0, len(chunks), batch):
+            collection.upsert(
+                ids=[f"chunk-{i}" for i in range(start, min(start + batch, len(chunks)))],
+                embeddings=vectors[start:start + batch],
+                documents=chunks[start:start + batch],
+                metadatas=[{"source": "bench", "source_type": "text"}] * len(chunks[start:start + batch])
+            )
+        if "chroma_ingest" in selected:
+            functions["chroma_ingest"] = throughput(time.perf_counter() - started, len(chunks), "chunks", None)
+        if "chroma_search" in selected:
+            search = lambda question: rag.search_documents(question, municipality, n_results=5)
+            functions["chroma_search"] = query_latencies(search, questions)
+        rag.client.delete_collection(collection_name)
+
+    return result
+
+def print_scale(result: Dict):
+    print(f"\n📚 {result['scale']} chunk-uri cerute: {result['documents']} documente, {result['chunks']} chunk-uri")
+    for name, stats in result["functions"].items():
+        if "queries" in stats:
+            line = f"p50 {stats['p50_ms']:.3f} ms | p95 {stats['p95_ms']:.3f} ms | {stats['queries_per_second']} q/s"
+        else:
+            rate = next((f"{value} {key.replace('_per_second', '')}/s" for key, value in stats.items()
+                         if key.endswith("_per_second") and key != "mb_per_second"), "")
+            line = f"{stats['seconds']:.4f} s | {rate}"
+        peak = stats.get("peak_mb")
+        print(f"   {name:<18} {line}" + (f" | vârf {peak} MB" if peak is not None else ""))
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingestie și căutare pe corpus sintetic")
+    parser.add_argument("--scales", default="10,100,1000,10000,100000", help="chunk-uri per primărie, separate prin virgulă")
+    parser.add_argument("--queries", type=int, default=200, help="întrebări per măsurare de căutare")
+    parser.add_argument("--repeat", type=int, default=3, help="rulări per funcție, cel mai bun timp (peste 10000 de chunk-uri: o rulare)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip", default="", help=f"funcții omise, separate prin virgulă ({', '.join(FUNCTIONS)})")
+    parser.add_argument("--no-memory", action="store_true", help="fără rularea separată cu tracemalloc")
+    parser.add_argument("--chroma-dir", help="director Chroma (implicit unul temporar, șters la final)")
+    parser.add_argument("--output", help="scrie rezultatele JSON în fișier")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(",") if scale.strip()]
+    skipped = {name.strip() for name in args.skip.split(",") if name.strip()}
+    unknown = skipped - set(FUNCTIONS)
+    if unknown:
+        parser.error(f"funcții necunoscute: {', '.join(sorted(unknown))}")
+    selected = [name for name in FUNCTIONS if name not in skipped]
+
+    chroma_dir = args.chroma_dir or tempfile.mkdtemp(prefix="bench_chroma_")
+    # Înainte de importuri: main și ai.rag_system citesc configurația la import
+    os.environ["RAG_SNAPSHOT_PATH"] = ""
+    os.environ["SOURCE_REFRESH_INTERVAL"] = "0"
+    os.environ["CHROMA_PERSIST_DIRECTORY"] = chroma_dir
+    os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+    from ai.embeddings import embeddings_model
+    from main import IntegratedRAGSystem
+    modules = {"IntegratedRAGSystem": IntegratedRAGSystem, "embeddings": embeddings_model}
+    if "chroma_ingest" in selected or "chroma_search" in selected:
+        from ai.rag_system import rag_system
+        modules["rag_system"] = rag_system
+
+    results = []
+    try:
+        for scale in scales:
+            result = bench_scale(scale, args, selected, modules)
+            print_scale(result)
+            results.append(result)
+    finally:
+        if not args.chroma_dir:
+            shutil.rmtree(chroma_dir, ignore_errors=True)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"scales": scales, "queries": args.queries, "repeat": args.repeat, "seed": args.seed,
+                   "functions": selected, "memory": not args.no_memory},
+        "results": results
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"\n💾 Rezultate scrise în {args.output}")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
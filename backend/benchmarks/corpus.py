@@ -0,0 +1,141 @@
+"""
+Corpus sintetic de legislație locală (hotărâri de consiliu local cu articole și alineate),
+reproductibil pentru un seed dat. Un articol are ~100-250 de tokeni, deci cu setările implicite
+ale ai.legal_chunker (CHUNK_MIN_TOKENS=60, CHUNK_MAX_TOKENS=350) devine un singur chunk:
+generate_documents(n) produce aproximativ n chunk-uri.
+"""
+
+import random
+from typing import Dict, List
+
+SUBJECTS = [
+    ("impozitul pe clădirile rezidențiale", "clădiri"),
+    ("impozitul pe clădirile nerezidențiale", "clădiri"),
+    ("impozitul pe terenul intravilan", "teren"),
+    ("impozitul pe terenul extravilan", "teren"),
+    ("impozitul pe mijloacele de transport", "transport"),
+    ("taxa pentru eliberarea certificatului de urbanism", "urbanism"),
+    ("taxa pentru eliberarea autorizației de construire", "urbanism"),
+    ("taxa pentru autorizația de desființare", "urbanism"),
+    ("taxa pentru afișarea firmei la locul activității", "reclamă"),
+    ("taxa hotelieră", "cazare"),
+    ("taxa pentru folosirea locurilor publice", "domeniu public"),
+    ("taxa de salubrizare", "salubrizare"),
+    ("taxa pentru eliberarea certificatului de atestare fiscală", "certificate"),
+    ("taxa pentru ocuparea domeniului public cu terase", "domeniu public"),
+    ("taxa specială pentru iluminat public", "iluminat"),
+]
+
+PAYERS = [
+    "persoanele fizice", "persoanele juridice", "proprietarii de imobile", "contribuabilii",
+    "operatorii economici", "asociațiile de proprietari", "unitățile de cazare", "titularii de autorizații",
+]
+
+RULES = [
+    "se calculează prin aplicarea unei cote de {pct}% asupra valorii impozabile stabilite conform anexei {anexa}",
+    "se stabilește la suma de {lei} lei pentru fiecare {unit} sau fracțiune din aceasta",
+    "se plătește anual, în două rate egale, până la {date1} și {date2} inclusiv",
+    "se datorează de {payer} începând cu data de 1 ianuarie a anului următor dobândirii",
+    "se majorează cu {pct}% pentru imobilele neîngrijite, în condițiile regulamentului aprobat",
+    "nu se datorează pentru imobilele aflate în proprietatea instituțiilor publice",
+    "se reduce cu {pct}% pentru {payer} care fac dovada reabilitării termice a imobilului",
+    "se achită la casieria direcției de taxe și impozite locale, prin virament bancar sau online",
+]
+
+FOLLOW_UPS = [
+    "Pentru plata cu anticipație a sumei datorate pentru întregul an, până la {date1}, se acordă o bonificație de {bonus}%.",
+    "Declarația se depune în termen de {days} de zile de la data dobândirii, însoțită de documentele justificative.",
+    "Pentru neplata la termen se datorează majorări de întârziere de {late}% pentru fiecare lună sau fracțiune de lună.",
+    "Sunt scutite {payer} care beneficiază de prevederile legii privind protecția persoanelor cu handicap.",
+    "Nivelurile stabilite se indexează anual cu rata inflației, prin hotărâre a consiliului local.",
+    "Cererile de scutire se soluționează în termen de {days} de zile de la înregistrare.",
+    "Sumele încasate constituie venituri la bugetul local și se utilizează pentru {purpose}.",
+    "Contestațiile se depun în termen de 45 de zile de la comunicarea deciziei de impunere.",
+]
+
+PURPOSES = [
+    "întreținerea drumurilor locale", "modernizarea iluminatului public", "investiții în școli",
+    "serviciile sociale ale comunei", "extinderea rețelei de apă", "amenajarea spațiilor verzi",
+]
+
+UNITS = ["metru pătrat", "200 cm3", "lună", "zi", "hectar", "an fiscal"]
+DATES = ["31 martie", "30 septembrie", "30 iunie", "15 decembrie", "31 mai"]
+
+# Întrebări pentru căutare: subiectul, un detaliu și formulări uzuale ale cetățenilor
+QUESTION_TEMPLATES = [
+    "Cum se calculează {subject}?",
+    "Până când se plătește {subject}?",
+    "Cine datorează {subject} și ce scutiri există?",
+    "Ce bonificație se acordă pentru {subject} plătit anticipat?",
+    "Care sunt majorările de întârziere pentru {subject}?",
+    "Unde depun declarația pentru {topic}?",
+]
+
+def _article(rng: random.Random, number: int) -> str:
+    subject, _ = rng.choice(SUBJECTS)
+    values = {
+        "pct": rng.choice(["0,1", "0,2", "0,5", "1", "1,3", "5", "10", "50"]),
+        "anexa": rng.randint(1, 6),
+        "lei": rng.choice([8, 15, 32, 45, 120, 250, 500]),
+        "unit": rng.choice(UNITS),
+        "date1": DATES[0],
+        "date2": DATES[1],
+        "payer": rng.choice(PAYERS),
+        "bonus": rng.choice([5, 10]),
+        "days": rng.choice([15, 30, 60]),
+        "late": rng.choice(["0,5", "1"]),
+        "purpose": rng.choice(PURPOSES),
+    }
+    paragraphs = []
+    for index in range(rng.randint(2, 4)):
+        rule = rng.choice(RULES).format(**values)
+        follow_up = rng.choice(FOLLOW_UPS).format(**values)
+        text = f"{subject[0].upper()}{subject[1:]} {rule}. {follow_up}"
+        paragraphs.append(f"({index + 1}) {text}")
+    return f"Art. {number}. - " + "\n".join(paragraphs)
+
+def generate_documents(n_chunks: int, seed: int = 0, articles_per_document: int = 20) -> List[Dict]:
+    """
+    Hotărâri sintetice cu n_chunks articole în total: [{"title", "text"}].
+    Același seed produce același corpus.
+    """
+    rng = random.Random(seed)
+    documents = []
+    remaining = n_chunks
+    number = 1
+    while remaining > 0:
+        count = min(articles_per_document, remaining)
+        title = f"HCL {number}/{rng.choice([2022, 2023, 2024])} privind stabilirea impozitelor și taxelor locale"
+        header = (
+            f"HOTĂRÂREA NR. {number}\n"
+            "Consiliul Local, având în vedere prevederile Codului fiscal, HOTĂRĂȘTE:\n"
+            f"CAPITOLUL I - Dispoziții privind {rng.choice(SUBJECTS)[0]}\n"
+        )
+        articles = [_article(rng, index + 1) for index in range(count)]
+        documents.append({"title": title, "text": header + "\n".join(articles)})
+        remaining -= count
+        number += 1
+    return documents
+
+def generate_questions(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed + 1)
+    questions = []
+    for _ in range(n):
+        subject, topic = rng.choice(SUBJECTS)
+        questions.append(rng.choice(QUESTION_TEMPLATES).format(subject=subject, topic=topic))
+    return questions
+
+def to_html(document: Dict) -> bytes:
+    """Pagina unui site de primărie cu documentul: meniu, antet, subsol și script-uri în jurul textului"""
+    paragraphs = "\n".join(f"<p>{line}</p>" for line in document["text"].split("\n"))
+    menu = "".join(f'<li><a href="/pagina-{i}">Secțiunea {i}</a></li>' for i in range(1, 25))
+    return f"""<!DOCTYPE html>
+<html lang="ro"><head><meta charset="utf-8"><title>{document["title"]}</title>
+<script>window.dataLayer = window.dataLayer || []; function gtag(){{dataLayer.push(arguments);}}</script>
+<style>body {{ font-family: Arial; }} .menu li {{ display: inline; }}</style></head>
+<body><header><div class="logo">Primăria Comunei</div><nav><ul class="menu">{menu}</ul></nav></header>
+<main><article><h1>{document["title"]}</h1>
+{paragraphs}
+</article></main>
+<footer><p>Copyright © Primăria Comunei. Toate drepturile rezervate.</p><p>Politica de cookie-uri</p></footer>
+</body></html>""".encode("utf-8")
@@ -0,0 +1,375 @@
+"""
+Test de încărcare end-to-end: pornește aplicația (uvicorn) conectată la un server Ollama simulat
+(benchmarks/stub_ollama.py), încarcă câteva documente fiscale și rulează utilizatori virtuali
+concurenți pe /api/chat și /api/chat/stream, cu un amestec de întrebări fiscale uzuale.
+Raportul (JSON) conține debitul și latențele p50/p95/p99 per endpoint; cu --baseline este
+comparat cu un raport anterior și codul de ieșire e 1 la regresii.
+
+Rulare (din backend/):
+    python benchmarks/load_test.py --users 20 --duration 30 --output rezultate.json
+    python benchmarks/load_test.py --mode stream --token-rate 20 --baseline rezultate.json
+    python benchmarks/load_test.py --url http://localhost:8000   # aplicație deja pornită
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_ollama import add_stub_arguments, start_stub, stub_options  # noqa: E402
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (întrebare, pondere): întrebările frecvente se repetă, restul formează coada lungă
+QUESTIONS = [
+    ("Care este termenul de plată pentru impozitul pe clădiri?", 12),
+    ("Cât este bonificația pentru plata anticipată a impozitelor?", 10),
+    ("Cum se calculează impozitul pe clădirile rezidențiale?", 8),
+    ("Care este cota de impozitare pentru clădirile nerezidențiale?", 6),
+    ("Ce acte îmi trebuie pentru declararea unei clădiri noi?", 6),
+    ("Cât costă taxa pentru eliberarea certificatului de urbanism?", 5),
+    ("Cum se calculează impozitul pe teren intravilan?", 5),
+    ("Ce scutiri de impozit există pentru persoanele cu handicap?", 4),
+    ("Cât este impozitul pe mijloacele de transport sub 1600 cm3?", 4),
+    ("Ce majorări de întârziere se aplică dacă plătesc după termen?", 4),
+    ("Unde pot plăti online taxele locale?", 4),
+    ("Care este taxa pentru autorizația de construire?", 3),
+    ("Ce taxă se plătește pentru firma luminoasă a unui magazin?", 2),
+    ("Cum obțin certificatul de atestare fiscală?", 2),
+    ("Se plătește impozit pentru o clădire demolată în cursul anului?", 2),
+    ("Care este taxa hotelieră și cine o colectează?", 1),
+    ("Ce impozit plătesc pentru o remorcă de peste 12 tone?", 1),
+    ("Cum contest decizia de impunere primită de la primărie?", 1),
+]
+
+DOCUMENTS = [
+    ("HCL 45/2024 - Impozitul pe clădiri", """
+Art. 1. - (1) Impozitul pe clădirile rezidențiale aflate în proprietatea persoanelor fizice se calculează prin aplicarea unei cote de 0,1% asupra valorii impozabile a clădirii.
+(2) Pentru clădirile nerezidențiale cota de impozitare este de 0,5% asupra valorii impozabile.
+Art. 2. - (1) Impozitul pe clădiri se plătește anual, în două rate egale, până la 31 martie și 30 septembrie inclusiv.
+(2) Pentru plata cu anticipație a impozitului, datorat pentru întregul an, până la data de 31 martie, se acordă o bonificație de 10%.
+Art. 3. - Persoanele care dobândesc sau construiesc o clădire au obligația să depună o declarație la direcția de taxe și impozite locale în termen de 30 de zile, însoțită de actul de proprietate și procesul-verbal de recepție.
+Art. 4. - Pentru neplata la termen a impozitelor se datorează majorări de întârziere de 1% pentru fiecare lună sau fracțiune de lună.
+Art. 5. - Persoanele cu handicap grav sau accentuat sunt scutite de la plata impozitului pentru clădirea folosită ca domiciliu.
+"""),
+    ("HCL 46/2024 - Impozitul pe teren și mijloacele de transport", """
+Art. 1. - Impozitul pe terenul intravilan se stabilește în funcție de rangul localității și zona în care este amplasat terenul, conform anexei 1.
+Art. 2. - (1) Impozitul pe mijloacele de transport cu capacitatea cilindrică de până la 1600 cm3 este de 8 lei pentru fiecare 200 cm3 sau fracțiune din aceasta.
+(2) Pentru remorcile, semiremorcile și rulotele cu masa totală autorizată de peste 12 tone impozitul este stabilit conform anexei 2.
+Art. 3. - Impozitul pe teren și impozitul pe mijloacele de transport se plătesc în aceleași termene ca impozitul pe clădiri.
+"""),
+    ("HCL 47/2024 - Taxe pentru certificate, avize și autorizații", """
+Art. 1. - Taxa pentru eliberarea certificatului de urbanism în mediul urban este de 15 lei pentru suprafețe de până la 150 mp.
+Art. 2. - Taxa pentru eliberarea autorizației de construire pentru o clădire rezidențială este de 0,5% din valoarea autorizată a lucrărilor.
+Art. 3. - Taxa pentru afișarea firmei la locul activității este de 32 lei pe metru pătrat, anual.
+Art. 4. - Certificatul de atestare fiscală se eliberează gratuit, în termen de 2 zile lucrătoare de la depunerea cererii.
+Art. 5. - Taxa hotelieră este de 1% din valoarea tarifului de cazare și se colectează de unitățile de cazare.
+Art. 6. - Plata taxelor locale se poate face la casieria primăriei, prin virament bancar sau online pe ghiseul.ro.
+Art. 7. - Decizia de impunere poate fi contestată în termen de 45 de zile de la comunicare, la direcția de taxe și impozite locale.
+"""),
+]
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """Percentila p (0-100) cu interpolare liniară; valorile trebuie să fie sortate"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize(latencies: List[float]) -> Dict:
+    values = sorted(latencies)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 1),
+        "p50_ms": round(percentile(values, 50) * 1000, 1),
+        "p95_ms": round(percentile(values, 95) * 1000, 1),
+        "p99_ms": round(percentile(values, 99) * 1000, 1),
+        "max_ms": round(values[-1] * 1000, 1)
+    }
+
+class Recorder:
+    """Rezultatele cererilor din fereastra măsurată (după încălzire)"""
+
+    def __init__(self):
+        self.measure_from = 0.0
+        self.results: Dict[str, Dict[str, list]] = {}
+
+    def record(self, endpoint: str, started: float, latency: float, status: str, ttft: Optional[float] = None):
+        if started < self.measure_from:
+            return
+        result = self.results.setdefault(endpoint, {"latencies": [], "ttft": [], "statuses": []})
+        result["statuses"].append(status)
+        if status == "ok":
+            result["latencies"].append(latency)
+            if ttft is not None:
+                result["ttft"].append(ttft)
+
+    def report(self, duration: float) -> Dict:
+        endpoints = {}
+        for endpoint, result in self.results.items():
+            statuses = {}
+            for status in result["statuses"]:
+                statuses[status] = statuses.get(status, 0) + 1
+            endpoints[endpoint] = {
+                "requests": len(result["statuses"]),
+                "ok": statuses.get("ok", 0),
+                "statuses": statuses,
+                "throughput_rps": round(statuses.get("ok", 0) / duration, 2),
+                "latency": summarize(result["latencies"]),
+                "ttft": summarize(result["ttft"]) if result["ttft"] else None
+            }
+        return endpoints
+
+def pick_question(rng: random.Random, unique_ratio: float, counter: List[int]) -> str:
+    question = rng.choices([q for q, _ in QUESTIONS], weights=[w for _, w in QUESTIONS])[0]
+    if rng.random() < unique_ratio:
+        # Variantă care ocolește cache-ul de răspunsuri (altă formulare a aceleiași întrebări)
+        counter[0] += 1
+        question = f"{question} Sunt contribuabilul nr. {counter[0]}."
+    return question
+
+async def chat_request(client: httpx.AsyncClient, recorder: Recorder, question: str, session_id: Optional[str]):
+    started = time.perf_counter()
+    try:
+        response = await client.post("/api/chat", json={"content": question, "session_id": session_id})
+        status = "ok" if response.status_code == 200 and response.json().get("response") else str(response.status_code)
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    recorder.record("chat", started, time.perf_counter() - started, status)
+
+async def stream_request(client: httpx.AsyncClient, recorder: Recorder, question: str, session_id: Optional[str]):
+    started = time.perf_counter()
+    ttft = None
+    status = "incomplete"
+    try:
+        async with client.stream("POST", "/api/chat/stream", json={"content": question, "session_id": session_id}) as response:
+            if response.status_code != 200:
+                status = str(response.status_code)
+            else:
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    event = json.loads(line)
+                    if event["type"] == "token" and ttft is None:
+                        ttft = time.perf_counter() - started
+                    elif event["type"] == "done":
+                        # Răspunsul de rezervă sau cel extractiv nu sunt generări reușite
+                        status = "ok" if event.get("success") else ("degraded" if event.get("degraded") else "fallback")
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    recorder.record("stream", started, time.perf_counter() - started, status, ttft)
+
+async def virtual_user(user_id: int, args, client: httpx.AsyncClient, recorder: Recorder, deadline: float,
+                       counter: List[int]):
+    rng = random.Random((args.seed or 0) * 1000 + user_id)
+    session_id = None
+    while time.perf_counter() < deadline:
+        question = pick_question(rng, args.unique_ratio, counter)
+        mode = args.mode if args.mode != "mixed" else rng.choice(("chat", "stream"))
+        if mode == "stream":
+            await stream_request(client, recorder, question, session_id)
+        else:
+            await chat_request(client, recorder, question, session_id)
+        if args.think_time:
+            await asyncio.sleep(rng.expovariate(1 / args.think_time))
+
+async def wait_ready(base_url: str, app: Optional[subprocess.Popen] = None, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=2.0) as client:
+        while time.perf_counter() < deadline:
+            if app is not None and app.poll() is not None:
+                raise RuntimeError("Aplicația s-a oprit la pornire:\n" + app.stderr.read().decode("utf-8", "replace")[-2000:])
+            try:
+                if (await client.get("/api/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Aplicația nu răspunde la {base_url}/api/health")
+
+async def seed_documents(client: httpx.AsyncClient):
+    for title, content in DOCUMENTS:
+        response = await client.post("/api/documents/upload-text", data={
+            "title": title, "content": content.strip(), "municipality_domain": "localhost:8000"
+        })
+        response.raise_for_status()
+
+async def run_load(args, base_url: str) -> Dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users + 10, max_keepalive_connections=args.users + 10)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        if not args.no_seed:
+            await seed_documents(client)
+
+        started = time.perf_counter()
+        recorder.measure_from = started + args.warmup
+        deadline = recorder.measure_from + args.duration
+        counter = [0]
+        users = [
+            asyncio.create_task(virtual_user(i, args, client, recorder, deadline, counter))
+            for i in range(args.users)
+        ]
+        await asyncio.gather(*users)
+        # Cererile pornite înainte de termen se termină după el; debitul se raportează la durata reală
+        measured = time.perf_counter() - recorder.measure_from
+
+        try:
+            server = (await client.get("/api/chat/ai-status")).json()
+        except (httpx.HTTPError, ValueError):
+            server = {}
+
+    return {
+        "measured_seconds": round(measured, 2),
+        "endpoints": recorder.report(measured),
+        "server": {key: server.get(key) for key in ("answer_cache", "admission", "degraded_mode", "request_coalescing")}
+    }
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_app(port: int, ollama_url: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.setdefault("RAG_SNAPSHOT_PATH", "")  # fără snapshot: fiecare rulare pornește de la aceleași documente
+    env.setdefault("SOURCE_REFRESH_INTERVAL", "0")
+    env["OLLAMA_BASE_URL"] = ollama_url
+    env.pop("OLLAMA_BASE_URLS", None)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Regresiile față de raportul de bază: debit mai mic sau p95 mai mare cu peste tolerance"""
+    regressions = []
+    print(f"\n{'endpoint':<8} {'metrică':<16} {'bază':>10} {'acum':>10} {'diferență':>10}")
+    for endpoint, current in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(endpoint)
+        if not previous:
+            continue
+        checks = [
+            ("throughput_rps", previous["throughput_rps"], current["throughput_rps"], False),
+            ("latency.p95_ms", previous["latency"].get("p95_ms"), current["latency"].get("p95_ms"), True),
+        ]
+        if previous.get("ttft") and current.get("ttft"):
+            checks.append(("ttft.p95_ms", previous["ttft"]["p95_ms"], current["ttft"]["p95_ms"], True))
+        for metric, before, after, lower_is_better in checks:
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = change > tolerance if lower_is_better else change < -tolerance
+            print(f"{endpoint:<8} {metric:<16} {before:>10} {after:>10} {change:>+9.1%} {'❌' if worse else ''}")
+            if worse:
+                regressions.append(f"{endpoint} {metric}: {before} -> {after} ({change:+.1%})")
+    return regressions
+
+def print_report(report: Dict):
+    print(f"\n{'endpoint':<8} {'cereri':>7} {'ok':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ttft p95':>9}")
+    for endpoint, result in report["endpoints"].items():
+        latency = result["latency"]
+        ttft = (result["ttft"] or {}).get("p95_ms")
+        print(f"{endpoint:<8} {result['requests']:>7} {result['ok']:>6} {result['throughput_rps']:>8} "
+              f"{latency.get('p50_ms', '-'):>9} {latency.get('p95_ms', '-'):>9} {latency.get('p99_ms', '-'):>9} "
+              f"{ttft if ttft is not None else '-':>9}")
+        errors = {status: count for status, count in result["statuses"].items() if status != "ok"}
+        if errors:
+            print(f"         erori: {errors}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de încărcare end-to-end cu Ollama simulat")
+    parser.add_argument("--users", type=int, default=10, help="utilizatori virtuali concurenți")
+    parser.add_argument("--duration", type=float, default=20.0, help="secunde măsurate")
+    parser.add_argument("--warmup", type=float, default=2.0, help="secunde de încălzire, nemăsurate")
+    parser.add_argument("--mode", choices=("chat", "stream", "mixed"), default="mixed")
+    parser.add_argument("--think-time", type=float, default=0.0, help="pauza medie între întrebări (s)")
+    parser.add_argument("--unique-ratio", type=float, default=0.5,
+                        help="fracțiunea de întrebări reformulate, care ocolesc cache-ul")
+    parser.add_argument("--timeout", type=float, default=60.0, help="timeout per cerere (s)")
+    parser.add_argument("--url", help="aplicație deja pornită (nu mai pornește aplicația și Ollama simulat)")
+    parser.add_argument("--port", type=int, default=0, help="portul aplicației pornite de benchmark (0 = unul liber)")
+    parser.add_argument("--no-seed", action="store_true", help="nu încarcă documentele fiscale de test")
+    parser.add_argument("--output", help="scrie raportul JSON în fișier (implicit doar la stdout)")
+    parser.add_argument("--baseline", help="raport JSON anterior cu care se compară")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="regresie acceptată față de bază (0.15 = 15%%)")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    app = stub = stub_server = None
+    base_url = args.url
+    if base_url is None:
+        stub_server, stub = start_stub(**stub_options(args))
+        ollama_url = f"http://127.0.0.1:{stub_server.server_port}"
+        port = args.port or free_port()
+        app = start_app(port, ollama_url)
+        base_url = f"http://127.0.0.1:{port}"
+        print(f"🤖 Ollama simulat pe {ollama_url}; aplicația pe {base_url}")
+
+    try:
+        asyncio.run(wait_ready(base_url, app))
+        print(f"🚀 {args.users} utilizatori, {args.mode}, {args.duration:g}s (+{args.warmup:g}s încălzire)")
+        result = asyncio.run(run_load(args, base_url))
+    finally:
+        if app is not None:
+            app.terminate()
+            try:
+                app.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                app.kill()
+        if stub_server is not None:
+            stub_server.shutdown()
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "config": {
+            "users": args.users, "duration": args.duration, "warmup": args.warmup, "mode": args.mode,
+            "think_time": args.think_time, "unique_ratio": args.unique_ratio,
+            "stub": stub_options(args) if stub is not None else None, "url": args.url
+        },
+        **result,
+        "stub": stub.stats() if stub is not None else None
+    }
+
+    print_report(report)
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"\n💾 Raport scris în {args.output}")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ Regresii față de bază:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("\n✅ Fără regresii față de bază")
+
+if __name__ == "__main__":
+    main()
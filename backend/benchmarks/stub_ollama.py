@@ -0,0 +1,234 @@
+"""
+Server Ollama simulat pentru benchmark-uri: răspunde la /api/version, /api/tags și
+/api/generate (cu și fără stream) cu latență și viteză de generare configurabile, fără model.
+
+Timpul unei generări = latență fixă + tokenii promptului / prompt_rate (evaluarea promptului)
++ tokenii răspunsului / token_rate. La fel ca Ollama cu OLLAMA_NUM_PARALLEL, cel mult
+max_parallel generări rulează simultan; restul așteaptă.
+
+Rulare (din backend/):
+    python benchmarks/stub_ollama.py --port 11500 --token-rate 30 --latency 0.2
+    OLLAMA_BASE_URL=http://localhost:11500 uvicorn main:app
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+ANSWER = (
+    "Conform hotărârii consiliului local, impozitul pe clădiri se plătește anual în două rate egale, "
+    "până la 31 martie și 30 septembrie. Pentru plata integrală până la 31 martie se acordă o bonificație "
+    "de 10%. Declarația se depune la direcția de taxe și impozite locale, iar plata se poate face la casierie "
+    "sau online. Pentru detalii vă recomand să contactați primăria."
+).split(" ")
+
+class StubOllama:
+    """Configurația și contoarele serverului simulat (partajate de thread-urile handler-ului)"""
+
+    def __init__(self, latency: float = 0.2, token_rate: float = 40.0, tokens: int = 60,
+                 prompt_rate: float = 1000.0, jitter: float = 0.1, max_parallel: int = 4,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.token_rate = token_rate
+        self.tokens = tokens
+        self.prompt_rate = prompt_rate
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.slots = threading.BoundedSemaphore(max_parallel)
+        self.max_parallel = max_parallel
+        self.random = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.active = 0
+        self.max_active = 0
+        self.tokens_generated = 0
+
+    def _jittered(self, seconds: float) -> float:
+        if not self.jitter:
+            return seconds
+        with self.lock:
+            factor = 1 + self.random.uniform(-self.jitter, self.jitter)
+        return max(seconds * factor, 0.0)
+
+    def plan(self, payload: Dict) -> Tuple[int, int, float, float, bool]:
+        """(tokeni prompt, tokeni răspuns, secunde evaluare prompt, secunde per token, eroare)"""
+        text = (payload.get("system") or "") + (payload.get("prompt") or "")
+        prompt_tokens = max(len(text) // 4, 1)
+        num_predict = (payload.get("options") or {}).get("num_predict") or self.tokens
+        response_tokens = min(self.tokens, num_predict)
+        prompt_seconds = self._jittered(self.latency + prompt_tokens / self.prompt_rate)
+        per_token = self._jittered(1 / self.token_rate) if self.token_rate > 0 else 0.0
+        with self.lock:
+            self.requests += 1
+            failed = self.random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return prompt_tokens, response_tokens, prompt_seconds, per_token, failed
+
+    def enter(self):
+        self.slots.acquire()
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def leave(self, tokens: int):
+        with self.lock:
+            self.active -= 1
+            self.tokens_generated += tokens
+        self.slots.release()
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "active": self.active,
+                "max_active": self.max_active,
+                "max_parallel": self.max_parallel,
+                "tokens_generated": self.tokens_generated
+            }
+
+def _final_chunk(prompt_tokens: int, response_tokens: int, prompt_seconds: float, eval_seconds: float) -> Dict:
+    return {
+        "done": True,
+        "prompt_eval_count": prompt_tokens,
+        "prompt_eval_duration": int(prompt_seconds * 1e9),
+        "eval_count": response_tokens,
+        "eval_duration": int(eval_seconds * 1e9),
+        "total_duration": int((prompt_seconds + eval_seconds) * 1e9),
+        "context": list(range(prompt_tokens + response_tokens))
+    }
+
+def make_handler(stub: StubOllama):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, body: Dict):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _write_chunk(self, body: Dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8") + b"\n"
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_GET(self):
+            if self.path == "/api/version":
+                self._send_json(200, {"version": "stub"})
+            elif self.path == "/api/tags":
+                self._send_json(200, {"models": [{"name": "stub:latest"}]})
+            elif self.path == "/stub/stats":
+                self._send_json(200, stub.stats())
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send_json(400, {"error": "invalid json"})
+                return
+            if self.path != "/api/generate":
+                self._send_json(404, {"error": "not found"})
+                return
+
+            prompt_tokens, response_tokens, prompt_seconds, per_token, failed = stub.plan(payload)
+            if failed:
+                self._send_json(500, {"error": "stub: eroare simulată"})
+                return
+
+            stub.enter()
+            generated = 0
+            try:
+                time.sleep(prompt_seconds)
+                started = time.perf_counter()
+                words = [ANSWER[i % len(ANSWER)] for i in range(response_tokens)]
+
+                if payload.get("stream", True):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for i, word in enumerate(words):
+                        time.sleep(per_token)
+                        self._write_chunk({"response": word if i == 0 else " " + word, "done": False})
+                        generated += 1
+                    final = _final_chunk(prompt_tokens, generated, prompt_seconds, time.perf_counter() - started)
+                    self._write_chunk({"response": "", **final})
+                    self.wfile.write(b"0\r\n\r\n")
+                else:
+                    time.sleep(per_token * response_tokens)
+                    generated = response_tokens
+                    final = _final_chunk(prompt_tokens, generated, prompt_seconds, time.perf_counter() - started)
+                    self._send_json(200, {"response": " ".join(words), **final})
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # clientul a renunțat (ex. cerere anulată)
+            finally:
+                stub.leave(generated)
+
+    return Handler
+
+def start_stub(port: int = 0, host: str = "127.0.0.1", **options) -> Tuple[ThreadingHTTPServer, StubOllama]:
+    """Pornește serverul într-un thread de fundal; port=0 alege un port liber (server.server_port)"""
+    stub = StubOllama(**options)
+    server = ThreadingHTTPServer((host, port), make_handler(stub))
+    server.daemon_threads = True
+    server.request_queue_size = 256
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stub
+
+def add_stub_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", type=float, default=0.2, help="latență fixă până la primul token (s)")
+    parser.add_argument("--token-rate", type=float, default=40.0, help="tokeni generați pe secundă per cerere")
+    parser.add_argument("--tokens", type=int, default=60, help="tokeni per răspuns (plafonați de num_predict)")
+    parser.add_argument("--prompt-rate", type=float, default=1000.0, help="tokeni de prompt evaluați pe secundă")
+    parser.add_argument("--jitter", type=float, default=0.1, help="variație relativă a timpilor (0.1 = ±10%%)")
+    parser.add_argument("--max-parallel", type=int, default=4, help="generări simultane (ca OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fracțiunea de cereri care primesc 500")
+    parser.add_argument("--seed", type=int, default=None)
+
+def stub_options(args: argparse.Namespace) -> Dict:
+    return {
+        "latency": args.latency,
+        "token_rate": args.token_rate,
+        "tokens": args.tokens,
+        "prompt_rate": args.prompt_rate,
+        "jitter": args.jitter,
+        "max_parallel": args.max_parallel,
+        "error_rate": args.error_rate,
+        "seed": args.seed
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Server Ollama simulat")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server, stub = start_stub(args.port, args.host, **stub_options(args))
+    print(f"🤖 Ollama simulat pe http://{args.host}:{server.server_port} "
+          f"({args.token_rate:g} tokeni/s, latență {args.latency:g}s, max {args.max_parallel} simultan)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n📊 {json.dumps(stub.stats())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Controlul admiterii pentru generările AI: un număr limitat de generări active, o coadă
+limitată cu timp maxim de așteptare și servire round-robin între primării. Cererile care
+nu pot fi servite la timp sunt respinse imediat (503 + Retry-After), nu după timeout-ul Ollama.
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Dict, Hashable, Optional
+
+class AdmissionRejected(Exception):
+    """Cererea nu a fost admisă: coada e plină ("full"), a așteptat prea mult ("timeout")
+    sau a fost scoasă din coadă în favoarea altei primării ("shed")"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Cerere respinsă ({reason}), reîncercați peste {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """
+    Fiecare primărie are coada ei; un loc eliberat e dat primei cereri din coada următoarei
+    primării (round-robin), deci o primărie aglomerată nu le blochează pe celelalte.
+    Când coada comună e plină, o cerere de la o primărie cu mai puține cereri în așteptare
+    ia locul celei mai noi cereri din cea mai lungă coadă.
+    """
+
+    def __init__(self, max_active: Optional[int] = None, max_queue: Optional[int] = None,
+                 max_wait: Optional[float] = None):
+        self.max_active = max_active or int(os.getenv("ADMISSION_MAX_ACTIVE", "4"))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+        self.max_wait = max_wait or float(os.getenv("ADMISSION_MAX_WAIT", "10"))
+
+        self.active = 0
+        self.queued = 0
+        self._queues: "OrderedDict[Hashable, deque]" = OrderedDict()  # în ordinea round-robin
+
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.shed = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.service_seconds = 2.0  # EWMA durata unei generări, pentru Retry-After
+
+    def retry_after(self) -> int:
+        """Secunde estimate până se eliberează loc pentru toate cererile din coadă"""
+        estimate = (self.queued + 1) / self.max_active * self.service_seconds
+        return min(max(math.ceil(estimate), 1), 60)
+
+    async def acquire(self, key: Hashable):
+        if self.active < self.max_active and self.queued == 0:
+            self.active += 1
+            self._record_wait(0.0)
+            return
+
+        if self.queued >= self.max_queue and not self._shed_for(key):
+            self.rejected_full += 1
+            raise AdmissionRejected("full", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append(future)
+        self.queued += 1
+        started = time.perf_counter()
+
+        try:
+            await asyncio.wait_for(future, timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self._remove(key, future)
+            self.rejected_timeout += 1
+            raise AdmissionRejected("timeout", self.retry_after()) from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Locul a fost acordat chiar în momentul anulării: îl dă mai departe
+                self.release()
+            else:
+                self._remove(key, future)
+            raise
+        # _grant_next() a numărat deja cererea ca activă
+        self._record_wait(time.perf_counter() - started)
+
+    def release(self, service_seconds: Optional[float] = None):
+        self.active -= 1
+        if service_seconds is not None:
+            self.service_seconds += 0.2 * (service_seconds - self.service_seconds)
+        self._grant_next()
+
+    @asynccontextmanager
+    async def slot(self, key: Hashable):
+        """Ține un loc de generare pe durata blocului"""
+        await self.acquire(key)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
+
+    def _record_wait(self, wait: float):
+        self.admitted += 1
+        self.total_wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+    def _grant_next(self):
+        while self.active < self.max_active and self._queues:
+            key, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            self.queued -= 1
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+    def _remove(self, key: Hashable, future: asyncio.Future):
+        queue = self._queues.get(key)
+        if queue is not None and future in queue:
+            queue.remove(future)
+            self.queued -= 1
+            if not queue:
+                del self._queues[key]
+
+    def _shed_for(self, key: Hashable) -> bool:
+        """Face loc în coada plină scoțind cea mai nouă cerere din cea mai lungă coadă"""
+        longest_key = max(self._queues, key=lambda other: len(self._queues[other]), default=None)
+        if longest_key is None or len(self._queues.get(key, ())) + 1 >= len(self._queues[longest_key]):
+            return False
+
+        queue = self._queues[longest_key]
+        future = queue.pop()
+        self.queued -= 1
+        self.shed += 1
+        if not future.done():
+            future.set_exception(AdmissionRejected("shed", self.retry_after()))
+        return True
+
+    def stats(self) -> Dict:
+        return {
+            "active": self.active,
+            "max_active": self.max_active,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "queued_by_municipality": {str(key): len(queue) for key, queue in self._queues.items()},
+            "max_wait_s": self.max_wait,
+            "admitted": self.admitted,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "shed": self.shed,
+            "avg_wait_ms": round(self.total_wait_seconds / self.admitted * 1000, 2) if self.admitted else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+            "avg_generation_ms": round(self.service_seconds * 1000, 1),
+            "retry_after_s": self.retry_after()
+        }
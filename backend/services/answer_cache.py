@@ -0,0 +1,68 @@
+"""
+Cache de răspunsuri per primărie (LRU + TTL)
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from ai.text_utils import normalize_question
+
+class AnswerCache:
+    """
+    Cache LRU cu expirare pentru răspunsurile AI.
+    Cheia conține generația indexului primăriei, deci orice document nou
+    încărcat face ca răspunsurile vechi să nu mai fie servite.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries or int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000"))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("ANSWER_CACHE_TTL", "3600"))
+        self._entries: "OrderedDict[Tuple, Tuple[float, dict]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, question: str, municipality_id: str, generation: int) -> Tuple:
+        return (municipality_id, generation, normalize_question(question))
+
+    def get(self, key: Tuple) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(value)
+
+    def put(self, key: Tuple, value: dict):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, dict(value))
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,105 @@
+"""
+Modul degradat: când LLM-ul e supraîncărcat sau indisponibil, chat-ul răspunde extractiv
+(ai.extractive) în câteva milisecunde, în loc să aștepte timeout-ul Ollama
+"""
+
+import os
+import time
+from typing import Dict, Optional
+
+class DegradedModeController:
+    """
+    Intră în modul degradat când coada de generări trece de enter_queue, latența medie recentă
+    trece de enter_latency, ultimele enter_failures generări au eșuat sau niciun backend Ollama
+    nu e disponibil. Iese (histerezis) doar după min_seconds și când toate semnalele au coborât
+    sub pragurile de ieșire. În modul degradat, câte o cerere la probe_interval secunde merge
+    totuși la LLM, ca latența și eșecurile să fie măsurate din nou.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = enabled if enabled is not None else os.getenv("DEGRADED_MODE", "true").lower() == "true"
+        self.enter_queue = int(os.getenv("DEGRADED_ENTER_QUEUE", "16"))
+        self.exit_queue = int(os.getenv("DEGRADED_EXIT_QUEUE", "4"))
+        self.enter_latency = float(os.getenv("DEGRADED_ENTER_LATENCY", "15"))
+        self.exit_latency = float(os.getenv("DEGRADED_EXIT_LATENCY", "8"))
+        self.enter_failures = int(os.getenv("DEGRADED_ENTER_FAILURES", "3"))
+        self.min_seconds = float(os.getenv("DEGRADED_MIN_SECONDS", "15"))
+        self.probe_interval = float(os.getenv("DEGRADED_PROBE_INTERVAL", "5"))
+
+        self.active = False
+        self.reason = ""
+        self.since = 0.0
+        self.latency: Optional[float] = None  # EWMA durata generărilor reușite
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+        self.last_probe = 0.0
+
+        self.activations = 0
+        self.degraded_answers = 0
+        self.probes = 0
+        self.degraded_seconds = 0.0
+
+    def record_generation(self, elapsed: float, ok: bool):
+        """Rezultatul unei generări LLM (inclusiv al unei sonde)"""
+        if ok:
+            self.consecutive_failures = 0
+            self.latency = elapsed if self.latency is None else self.latency + 0.3 * (elapsed - self.latency)
+        else:
+            self.consecutive_failures += 1
+
+    def update(self, queue_depth: int, backends_available: bool = True) -> bool:
+        """Reevaluează starea după semnalele curente; returnează True dacă modul degradat e activ"""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        latency = self.latency or 0.0
+
+        if not self.active:
+            reason = ""
+            if not backends_available:
+                reason = "backend indisponibil"
+            elif self.consecutive_failures >= self.enter_failures:
+                reason = f"{self.consecutive_failures} generări eșuate"
+            elif queue_depth >= self.enter_queue:
+                reason = f"coadă {queue_depth}"
+            elif latency >= self.enter_latency:
+                reason = f"latență {latency:.1f}s"
+            if reason:
+                self.active, self.reason, self.since = True, reason, now
+                self.activations += 1
+                print(f"🟠 Mod degradat activ ({reason}): răspunsuri extractive")
+        elif (now - self.since >= self.min_seconds and backends_available
+              and self.consecutive_failures == 0 and queue_depth <= self.exit_queue
+              and latency <= self.exit_latency):
+            self.active = False
+            self.degraded_seconds += now - self.since
+            print(f"🟢 Mod degradat încheiat după {now - self.since:.0f}s")
+        return self.active
+
+    def try_probe(self) -> bool:
+        """În modul degradat: True dacă cererea curentă poate merge la LLM ca sondă"""
+        now = time.monotonic()
+        if self.probe_in_flight or now - self.last_probe < self.probe_interval:
+            return False
+        self.probe_in_flight = True
+        self.last_probe = now
+        self.probes += 1
+        return True
+
+    def probe_done(self):
+        self.probe_in_flight = False
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        return {
+            "enabled": self.enabled,
+            "active": self.active,
+            "reason": self.reason if self.active else "",
+            "active_for_s": round(now - self.since, 1) if self.active else 0.0,
+            "latency_ewma_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "activations": self.activations,
+            "degraded_answers": self.degraded_answers,
+            "probes": self.probes,
+            "degraded_seconds": round(self.degraded_seconds + (now - self.since if self.active else 0.0), 1)
+        }
@@ -0,0 +1,107 @@
+"""
+Starea conexiunii cu Ollama verificată periodic în fundal: /api/health și /api/chat/ai-status
+citesc ultimul rezultat în loc să facă la fiecare apel o cerere către Ollama
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+class HealthMonitor:
+    """
+    La fiecare interval secunde verifică toate backend-urile Ollama (GET /api/version, vezi
+    OllamaRouter.probe) și păstrează rezultatul. Dacă ultima verificare e mai veche de
+    3 intervale (monitorul nu rulează), status() verifică din nou; cererile simultane
+    așteaptă aceeași verificare.
+    """
+
+    def __init__(self, ollama_manager, interval: Optional[float] = None):
+        self.ollama_manager = ollama_manager
+        self.interval = interval if interval is not None else float(os.getenv("HEALTH_CHECK_INTERVAL", "5"))
+
+        self._task: Optional[asyncio.Task] = None
+        self._check: Optional[asyncio.Future] = None
+        self._status: Optional[Dict] = None
+        self._checked_at = 0.0
+
+        self.checks = 0
+        self.status_reads = 0
+        self.transitions = 0
+
+    async def start(self):
+        """Pornește verificarea periodică (dacă există client Ollama și intervalul este > 0)"""
+        if self.ollama_manager is not None and self.interval > 0 and self._task is None:
+            await self.check()
+            self._task = asyncio.create_task(self._monitor_loop())
+            print(f"🩺 Verificare Ollama la fiecare {self.interval:.0f}s")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _monitor_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"❌ Eroare verificare Ollama: {e}")
+
+    async def check(self) -> Dict:
+        """Verifică acum backend-urile; apelurile simultane împart aceeași verificare"""
+        if self._check is None:
+            self._check = asyncio.ensure_future(self._run_check())
+        check = self._check
+        try:
+            return await asyncio.shield(check)
+        finally:
+            if self._check is check and check.done():
+                self._check = None
+
+    async def _run_check(self) -> Dict:
+        started = time.perf_counter()
+        backends = await self.ollama_manager.probe_backends()
+        connected = any(backend["ok"] for backend in backends)
+
+        if self._status is not None and self._status["ollama_connected"] != connected:
+            self.transitions += 1
+            print(f"{'🟢' if connected else '🔴'} Ollama {'disponibil' if connected else 'indisponibil'}")
+
+        self.checks += 1
+        self._checked_at = time.monotonic()
+        self._status = {
+            "ollama_connected": connected,
+            "healthy_backends": sum(1 for backend in backends if backend["ok"]),
+            "backends": backends,
+            "check_ms": round((time.perf_counter() - started) * 1000, 1),
+            "checked_at": datetime.now().isoformat()
+        }
+        return self._status
+
+    async def status(self) -> Dict:
+        """Ultima stare cunoscută, cu starea circuitului de generare la momentul citirii"""
+        self.status_reads += 1
+        if self.ollama_manager is None:
+            return {"ollama_connected": False, "healthy_backends": 0, "backends": [], "circuit": None, "checked_at": None}
+
+        status = self._status
+        if status is None or time.monotonic() - self._checked_at > 3 * max(self.interval, 1.0):
+            status = await self.check()
+        return {**status, "circuit": self.ollama_manager.breaker.state}
+
+    def stats(self) -> Dict:
+        return {
+            "interval_seconds": self.interval,
+            "running": self._task is not None,
+            "checks": self.checks,
+            "status_reads": self.status_reads,
+            "transitions": self.transitions,
+            "age_s": round(time.monotonic() - self._checked_at, 1) if self._status is not None else None
+        }
@@ -0,0 +1,240 @@
+"""
+Metrici în format text Prometheus, expuse la GET /metrics.
+Pe calea fierbinte se fac doar incrementări și o căutare binară în limitele histogramei;
+valorile care există deja în stats() ale componentelor (mărimea indexurilor, rata de hit
+a cache-urilor, coada de generări) sunt citite abia la colectare, prin callback-uri.
+"""
+
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+# Secunde: de la o căutare în index (~ms) până la o generare lentă
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 75, 100, 200, 500, 1000, 5000)
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+class _CounterValue:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # ultimul = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+class _Metric:
+    """Metrică cu etichete; labels(...) returnează (și păstrează) valoarea pentru o combinație"""
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, object] = {}
+
+    def labels(self, *values):
+        key = tuple(str(value) for value in values)
+        child = self._values.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: etichete așteptate {self.labelnames}, primite {key}")
+            child = self._values[key] = self._new_value()
+        return child
+
+    def _new_value(self):
+        raise NotImplementedError
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_value(self):
+        return _CounterValue()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def samples(self):
+        return [
+            (f"{self.name}_total", _format_labels(self.labelnames, key), child.value)
+            for key, child in list(self._values.items())
+        ]
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_value(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def samples(self):
+        samples = []
+        for key, child in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(float(bound)),))
+                samples.append((f"{self.name}_bucket", labels, cumulative))
+            labels = _format_labels(self.labelnames, key)
+            samples.append((f"{self.name}_sum", labels, child.sum))
+            samples.append((f"{self.name}_count", labels, child.count))
+        return samples
+
+class CallbackMetric:
+    """
+    Valoare citită la colectare: collect() returnează un număr sau un dict
+    {tuplu de etichete: număr}. Erorile din callback omit metrica, nu tot răspunsul.
+    """
+
+    def __init__(self, name: str, documentation: str, collect: Callable[[], Union[float, Dict[tuple, float]]],
+                 labelnames: Sequence[str] = (), metric_type: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.collect = collect
+        self.labelnames = tuple(labelnames)
+        self.type = metric_type
+
+    def samples(self):
+        values = self.collect()
+        if not isinstance(values, dict):
+            values = {(): values}
+        name = f"{self.name}_total" if self.type == "counter" else self.name
+        return [
+            (name, _format_labels(self.labelnames, tuple(str(value) for value in key)), value)
+            for key, value in values.items() if value is not None
+        ]
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metrica {metric.name} este deja înregistrată")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, collect: Callable, labelnames: Sequence[str] = (),
+                 metric_type: str = "gauge") -> CallbackMetric:
+        return self._register(CallbackMetric(name, documentation, collect, labelnames, metric_type))
+
+    def unregister(self, name: str):
+        self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        """Toate metricile în formatul text de expunere Prometheus (version 0.0.4)"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            try:
+                samples = metric.samples()
+            except Exception as e:
+                print(f"⚠️ Metrica {metric.name} nu a putut fi colectată: {e}")
+                continue
+            family = f"{metric.name}_total" if metric.type == "counter" else metric.name
+            lines.append(f"# HELP {family} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {family} {metric.type}")
+            for name, labels, value in samples:
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+# Metricile comune pipeline-ului de chat, ale clientului Ollama și ale ingestiei
+chat_stage_seconds = metrics.histogram(
+    "chat_stage_seconds",
+    "Durata fiecărei etape a pipeline-ului de chat (retrieval, prompt_build, admission_wait, "
+    "generation_queue, generation, ttft)",
+    ("stage",)
+)
+chat_request_seconds = metrics.histogram(
+    "chat_request_seconds", "Durata totală a cererilor de chat", ("endpoint", "outcome")
+)
+ollama_tokens = metrics.counter(
+    "ollama_tokens", "Tokeni raportați de Ollama (prompt = prompt_eval_count, eval = eval_count)", ("phase",)
+)
+ollama_eval_seconds = metrics.counter(
+    "ollama_eval_seconds", "Timp de evaluare raportat de Ollama (prompt_eval_duration, eval_duration)", ("phase",)
+)
+ollama_tokens_per_second = metrics.histogram(
+    "ollama_tokens_per_second", "Viteza per răspuns: tokeni / durata raportată de Ollama", ("phase",),
+    buckets=TOKENS_PER_SECOND_BUCKETS
+)
+ingest_pages = metrics.counter("ingest_pages", "Pagini procesate la ingestie (HTML, PDF, text)", ("source_type",))
+ingest_chunks = metrics.counter("ingest_chunks", "Chunk-uri indexate la ingestie", ("source_type",))
+ingest_embeddings = metrics.counter("ingest_embeddings", "Embedding-uri calculate la ingestie")
+ingest_stage_seconds = metrics.histogram(
+    "ingest_stage_seconds", "Durata etapelor ingestiei (extract, index, embed, store)", ("stage",)
+)
+
+def record_ollama_eval(result: Dict):
+    """Tokenii și vitezele dintr-un răspuns final Ollama (durate în nanosecunde)"""
+    for phase, count_key, duration_key in (("prompt", "prompt_eval_count", "prompt_eval_duration"),
+                                           ("eval", "eval_count", "eval_duration")):
+        count = result.get(count_key)
+        duration = result.get(duration_key)
+        if count is None or not duration:
+            continue
+        seconds = duration / 1e9
+        ollama_tokens.labels(phase).inc(count)
+        ollama_eval_seconds.labels(phase).inc(seconds)
+        ollama_tokens_per_second.labels(phase).observe(count / seconds)
@@ -0,0 +1,59 @@
+"""
+Coalescing (singleflight) pentru cereri identice aflate în execuție
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+class RequestCoalescer:
+    """
+    Cererile concurente cu aceeași cheie împart un singur task.
+    Task-ul comun este anulat doar când toți cei care îl așteaptă au renunțat.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+
+        self.leaders = 0    # cereri care au pornit o execuție
+        self.followers = 0  # cereri care s-au atașat unei execuții existente
+
+    def in_flight(self, key: Hashable) -> bool:
+        task = self._in_flight.get(key)
+        return task is not None and not task.done()
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable]):
+        """Execută factory() o singură dată pentru toate cererile concurente cu aceeași cheie"""
+        task: Optional[asyncio.Task] = self._in_flight.get(key)
+
+        if task is None or task.done():
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda finished: self._forget(key, finished))
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._in_flight.get(key) is task and self._waiters.get(key, 0) <= 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            if self._in_flight.get(key) is task:
+                self._waiters[key] -= 1
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+            self._waiters.pop(key, None)
+
+    def stats(self):
+        return {
+            "in_flight": len(self._in_flight),
+            "leaders": self.leaders,
+            "followers": self.followers
+        }
@@ -0,0 +1,77 @@
+"""
+Contextul Ollama ("context" din răspunsul /api/generate) păstrat per sesiune de chat (LRU + TTL),
+ca turele următoare să continue din cache-ul KV al modelului în loc să reia conversația de la zero
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+class SessionContextStore:
+    """
+    Dezactivat implicit (OLLAMA_SESSION_CONTEXT=true îl pornește). Răspunsurile cu context depind
+    de conversație, deci turele care îl folosesc ocolesc cache-ul de răspunsuri și coalescing-ul.
+    Un context care depășește max_tokens este abandonat: tura următoare pornește o conversație nouă,
+    ca promptul să nu crească nelimitat.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, max_sessions: Optional[int] = None,
+                 max_tokens: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.enabled = enabled if enabled is not None else os.getenv("OLLAMA_SESSION_CONTEXT", "false").lower() == "true"
+        self.max_sessions = max_sessions or int(os.getenv("OLLAMA_SESSION_CONTEXT_MAX_SESSIONS", "500"))
+        self.max_tokens = max_tokens or int(os.getenv("OLLAMA_SESSION_CONTEXT_MAX_TOKENS", "3000"))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("OLLAMA_SESSION_CONTEXT_TTL", "900"))
+        self._contexts: "OrderedDict[str, tuple]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resets = 0
+
+    def get(self, session_id: str) -> Optional[List[int]]:
+        entry = self._contexts.get(session_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, context = entry
+        if expires_at < time.monotonic():
+            del self._contexts[session_id]
+            self.misses += 1
+            return None
+
+        self._contexts.move_to_end(session_id)
+        self.hits += 1
+        return context
+
+    def put(self, session_id: str, context: Optional[List[int]]):
+        if not context:
+            return
+        if len(context) > self.max_tokens:
+            self._contexts.pop(session_id, None)
+            self.resets += 1
+            return
+
+        self._contexts[session_id] = (time.monotonic() + self.ttl_seconds, context)
+        self._contexts.move_to_end(session_id)
+
+        while len(self._contexts) > self.max_sessions:
+            self._contexts.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, session_id: str):
+        self._contexts.pop(session_id, None)
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "sessions": len(self._contexts),
+            "max_sessions": self.max_sessions,
+            "max_tokens": self.max_tokens,
+            "avg_context_tokens": round(sum(len(context) for _, context in self._contexts.values()) / len(self._contexts), 1) if self._contexts else 0.0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "resets": self.resets
+        }
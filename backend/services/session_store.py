@@ -0,0 +1,279 @@
+"""
+Stocare sesiuni de chat: sesiunile active în memorie (LRU + TTL),
+mesajele scrise asincron, în batch-uri, în PostgreSQL (write-behind)
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+
+class SessionStore:
+    """
+    Înlocuiește dicționarul conversations_db care creștea nelimitat.
+    Adăugarea unui mesaj nu face I/O: mesajul intră într-o coadă scrisă periodic
+    în tabelele Conversation/Message. Sesiunile evacuate din memorie se reîncarcă
+    din baza de date la cerere.
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None, ttl_seconds: Optional[float] = None,
+                 flush_interval: Optional[float] = None, batch_size: Optional[int] = None):
+        self.max_sessions = max_sessions or int(os.getenv("SESSION_MAX_HOT", "10000"))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+        self.flush_interval = flush_interval or float(os.getenv("SESSION_FLUSH_INTERVAL", "2"))
+        self.batch_size = batch_size or int(os.getenv("SESSION_FLUSH_BATCH", "200"))
+        self.max_pending = int(os.getenv("SESSION_MAX_PENDING", "100000"))
+
+        self._sessions: "OrderedDict[str, Dict]" = OrderedDict()
+        self._pending = deque()  # (session_id, municipality, message)
+        self._session_factory = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+        self.evictions = 0
+        self.reloads = 0
+        self.flushed_messages = 0
+        self.flush_errors = 0
+        self.dropped_messages = 0
+
+    @property
+    def persistent(self) -> bool:
+        return self._session_factory is not None
+
+    def enable_persistence(self, session_factory):
+        """Activează scrierea în baza de date (session_factory = SessionLocal din models.database)"""
+        self._session_factory = session_factory
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # === Operații pe calea de chat (fără I/O) ===
+
+    def append_message(self, session_id: str, municipality: Dict, message: Dict):
+        """Adaugă un mesaj în sesiune și îl pune în coada de scriere"""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            entry = {
+                "municipality_domain": municipality["domain"],
+                "messages": [],
+                # O sesiune necunoscută poate exista deja în baza de date (evacuată din memorie)
+                "complete": not self.persistent
+            }
+            self._sessions[session_id] = entry
+            self._evict_overflow()
+
+        entry["messages"].append(message)
+        entry["last_access"] = time.monotonic()
+        self._sessions.move_to_end(session_id)
+
+        if self.persistent:
+            self._pending.append((session_id, municipality, message))
+            while len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                self.dropped_messages += 1
+            if self._wake is not None and len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+    def mark_new(self, session_id: str):
+        """Sesiune creată acum de server - nu are istoric în baza de date"""
+        if session_id in self._sessions:
+            self._sessions[session_id]["complete"] = True
+
+    async def get_conversation(self, session_id: str) -> Optional[Dict]:
+        """
+        Conversația completă. Sesiunile evacuate (sau incomplete) se reîncarcă din baza de date.
+        """
+        entry = self._sessions.get(session_id)
+        if entry is not None and (entry["complete"] or not self.persistent):
+            entry["last_access"] = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            return entry
+
+        if not self.persistent:
+            return None
+
+        # Scrie mai întâi mesajele în așteptare, ca istoricul din baza de date să fie complet
+        await self.flush()
+        try:
+            loaded = await asyncio.to_thread(self._load_conversation, session_id)
+        except Exception as e:
+            print(f"❌ Eroare reîncărcare sesiune {session_id}: {e}")
+            return entry
+
+        if loaded is None:
+            return entry
+
+        self.reloads += 1
+        loaded["complete"] = True
+        loaded["last_access"] = time.monotonic()
+        if entry is not None and not loaded["municipality_domain"]:
+            loaded["municipality_domain"] = entry["municipality_domain"]
+        self._sessions[session_id] = loaded
+        self._sessions.move_to_end(session_id)
+        self._evict_overflow()
+        return loaded
+
+    # === Evacuare ===
+
+    def _evict_overflow(self):
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+
+    def _evict_expired(self):
+        deadline = time.monotonic() - self.ttl_seconds
+        while self._sessions:
+            session_id, entry = next(iter(self._sessions.items()))
+            if entry.get("last_access", 0) >= deadline:
+                break
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+
+    # === Write-behind ===
+
+    async def start(self):
+        """Pornește task-ul de scriere în fundal"""
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        mode = "PostgreSQL write-behind" if self.persistent else "doar memorie"
+        print(f"💬 Session store pornit ({mode}, max {self.max_sessions} sesiuni active)")
+
+    async def stop(self):
+        """Oprește task-ul de scriere și scrie mesajele rămase"""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        await self.flush()
+
+    async def _writer_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            self._evict_expired()
+            await self.flush()
+
+    async def flush(self):
+        """Scrie în baza de date mesajele din coadă, în batch-uri"""
+        if not self.persistent or not self._pending:
+            return
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                try:
+                    await asyncio.to_thread(self._write_batch, batch)
+                    self.flushed_messages += len(batch)
+                except Exception as e:
+                    # Păstrează mesajele pentru următoarea încercare
+                    self.flush_errors += 1
+                    self._pending.extendleft(reversed(batch))
+                    print(f"⚠️ Eroare scriere sesiuni în baza de date: {e}")
+                    break
+
+    def _write_batch(self, batch: List):
+        from models.database import Message
+
+        db = self._session_factory()
+        try:
+            conversation_ids = {}
+            for session_id, municipality, message in batch:
+                if session_id not in conversation_ids:
+                    conversation_ids[session_id] = self._get_or_create_conversation(db, session_id, municipality)
+
+                db.add(Message(
+                    conversation_id=conversation_ids[session_id],
+                    role=message["role"],
+                    content=message["content"],
+                    sources=json.dumps(message.get("sources", []), ensure_ascii=False),
+                    created_at=message["timestamp"]
+                ))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _get_or_create_conversation(self, db, session_id: str, municipality: Dict) -> int:
+        from models.database import Conversation, Municipality
+
+        conversation = db.query(Conversation).filter(Conversation.session_id == session_id).first()
+        if conversation is not None:
+            return conversation.id
+
+        municipality_row = db.get(Municipality, str(municipality["id"]))
+        if municipality_row is None:
+            municipality_row = db.query(Municipality).filter(Municipality.domain == municipality["domain"]).first()
+        if municipality_row is None:
+            municipality_row = Municipality(
+                id=str(municipality["id"]),
+                name=municipality["name"],
+                domain=municipality["domain"]
+            )
+            db.add(municipality_row)
+            db.flush()
+
+        conversation = Conversation(municipality_id=municipality_row.id, session_id=session_id)
+        db.add(conversation)
+        db.flush()
+        return conversation.id
+
+    def _load_conversation(self, session_id: str) -> Optional[Dict]:
+        from models.database import Conversation, Message, Municipality
+
+        db = self._session_factory()
+        try:
+            conversation = db.query(Conversation).filter(Conversation.session_id == session_id).first()
+            if conversation is None:
+                return None
+
+            municipality = db.get(Municipality, conversation.municipality_id) if conversation.municipality_id else None
+            messages = (
+                db.query(Message)
+                .filter(Message.conversation_id == conversation.id)
+                .order_by(Message.created_at, Message.id)
+                .all()
+            )
+
+            loaded_messages = []
+            for row in messages:
+                message = {"role": row.role, "content": row.content, "timestamp": row.created_at}
+                if row.role == "assistant":
+                    message["sources"] = json.loads(row.sources) if row.sources else []
+                loaded_messages.append(message)
+
+            return {
+                "municipality_domain": municipality.domain if municipality else None,
+                "messages": loaded_messages
+            }
+        finally:
+            db.close()
+
+    def stats(self) -> Dict:
+        return {
+            "hot_sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "persistent": self.persistent,
+            "pending_writes": len(self._pending),
+            "flushed_messages": self.flushed_messages,
+            "flush_errors": self.flush_errors,
+            "dropped_messages": self.dropped_messages,
+            "evictions": self.evictions,
+            "reloads": self.reloads
+        }
@@ -0,0 +1,149 @@
+"""
+Reîmprospătare periodică a paginilor web încărcate: GET condiționat (ETag / Last-Modified)
+și re-indexare doar pentru paginile al căror conținut s-a schimbat
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class SourceRefresher:
+    """
+    Verifică documentele HTML ale sistemului RAG. Un 304 sau același hash de conținut
+    înseamnă "neschimbat"; altfel documentul este re-chunkuit și înlocuit în index sub același id.
+    """
+
+    def __init__(self, rag_system, interval: Optional[float] = None):
+        self.rag_system = rag_system
+        # secunde între rulări (0 = doar la cerere)
+        self.interval = interval if interval is not None else float(os.getenv("SOURCE_REFRESH_INTERVAL", "86400"))
+
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self.runs = 0
+        self.last_run: Optional[Dict] = None
+        self.next_run_at: Optional[str] = None
+        self.totals = {"checked": 0, "unchanged": 0, "updated": 0, "failed": 0}
+
+    def _sources(self, municipality_id: Optional[str] = None) -> Dict[str, List[dict]]:
+        """URL -> documentele care îl folosesc (aceeași pagină poate fi încărcată la mai multe primării)"""
+        sources = {}
+        for doc_data in list(self.rag_system.documents.values()):
+            if doc_data.get("source_type") != "html" or not doc_data.get("url"):
+                continue
+            if municipality_id and doc_data["municipality_id"] != municipality_id:
+                continue
+            sources.setdefault(doc_data["url"], []).append(doc_data)
+        return sources
+
+    def _conditional_headers(self, docs: List[dict]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since, doar dacă toate copiile paginii au aceleași validatoare"""
+        headers = {}
+        etags = {doc_data.get("etag", "") for doc_data in docs}
+        if len(etags) == 1 and "" not in etags:
+            headers["If-None-Match"] = etags.pop()
+        last_modified = {doc_data.get("last_modified", "") for doc_data in docs}
+        if len(last_modified) == 1 and "" not in last_modified:
+            headers["If-Modified-Since"] = last_modified.pop()
+        return headers
+
+    async def refresh(self, municipality_id: Optional[str] = None) -> Dict:
+        """Rulează o verificare completă și returnează statisticile ei"""
+        if self._running:
+            return {"success": False, "error": "O reîmprospătare este deja în curs"}
+
+        from ai.crawler import crawler
+
+        self._running = True
+        started = time.perf_counter()
+        run = {
+            "started_at": datetime.now().isoformat(),
+            "checked": 0,
+            "unchanged": 0,
+            "updated": 0,
+            "failed": 0,
+            "errors": []
+        }
+
+        try:
+            sources = self._sources(municipality_id)
+
+            async def handle(url, response):
+                if response.status_code == 304:
+                    return {"outcome": "unchanged"}
+
+                outcome = "unchanged"
+                for doc_data in sources[url]:
+                    result = await self.rag_system.process_html_content(
+                        url, response.content, doc_data["municipality_id"],
+                        custom_title=doc_data["title"] if doc_data.get("custom_title") else None,
+                        response_headers=response.headers
+                    )
+                    if not result["success"]:
+                        return {"success": False, "error": result.get("error", "Unknown error")}
+                    if result["status"] != "unchanged":
+                        outcome = "updated"
+                return {"outcome": outcome}
+
+            results = await crawler.crawl(
+                list(sources), handle,
+                headers=lambda url: self._conditional_headers(sources[url])
+            )
+
+            for result in results:
+                run["checked"] += 1
+                if result["success"]:
+                    run[result["outcome"]] += 1
+                else:
+                    run["failed"] += 1
+                    run["errors"].append(f"{result['url']}: {result.get('error', 'Unknown error')}")
+        finally:
+            self._running = False
+
+        run["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.runs += 1
+        self.last_run = run
+        for key in self.totals:
+            self.totals[key] += run[key]
+
+        print(f"🔄 Reîmprospătare: {run['checked']} verificate, {run['unchanged']} neschimbate, "
+              f"{run['updated']} actualizate, {run['failed']} eșuate în {run['duration_ms'] / 1000:.1f}s")
+        return {"success": True, **run}
+
+    async def start(self):
+        """Pornește reîmprospătarea periodică (dacă intervalul este > 0)"""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+            print(f"🔄 Reîmprospătare surse web la fiecare {self.interval:.0f}s")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self.next_run_at = None
+
+    async def _refresh_loop(self):
+        while True:
+            self.next_run_at = datetime.fromtimestamp(time.time() + self.interval).isoformat()
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"❌ Eroare reîmprospătare surse: {e}")
+
+    def stats(self) -> Dict:
+        return {
+            "interval_seconds": self.interval,
+            "running": self._running,
+            "runs": self.runs,
+            "next_run_at": self.next_run_at,
+            "last_run": self.last_run,
+            "totals": dict(self.totals)
+        }
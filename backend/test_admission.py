@@ -0,0 +1,53 @@
+import asyncio
+
+from services.admission import AdmissionController, AdmissionRejected
+
+def test_admission():
+    async def scenario():
+        admission = AdmissionController(max_active=1, max_queue=4, max_wait=0.5)
+        order = []
+
+        async def request(municipality: str, hold: float = 0.01):
+            try:
+                async with admission.slot(municipality):
+                    order.append(municipality)
+                    await asyncio.sleep(hold)
+                return "ok"
+            except AdmissionRejected as e:
+                return e.reason
+
+        # Primăria "1" ocupă locul și umple coada; "2" apare mai târziu, dar nu așteaptă după toată coada
+        first = asyncio.create_task(request("1", hold=0.05))
+        await asyncio.sleep(0)
+        busy = [asyncio.create_task(request("1")) for _ in range(4)]
+        await asyncio.sleep(0)
+        assert admission.stats()["queued"] == 4
+
+        other = asyncio.create_task(request("2"))
+        await asyncio.sleep(0)
+        results = await asyncio.gather(first, *busy, other)
+
+        # Coada plină: cea mai nouă cerere a primăriei "1" a cedat locul primăriei "2"
+        assert results.count("shed") == 1 and results[-1] == "ok"
+        # Round-robin: "2" e servită imediat după prima cerere a lui "1" din coadă
+        assert order[:3] == ["1", "1", "2"]
+
+        # Aceeași primărie, coadă plină: respingere imediată
+        blocker = asyncio.create_task(request("1", hold=0.2))
+        await asyncio.sleep(0)
+        queued = [asyncio.create_task(request("1", hold=0.2)) for _ in range(4)]
+        await asyncio.sleep(0)
+        assert await request("1") == "full"
+
+        # Așteptare peste max_wait: respingere "timeout"; o cerere anulată în coadă nu ocupă loc
+        queued[-1].cancel()
+        results = await asyncio.gather(blocker, *queued[:-1])
+        assert "timeout" in results
+        assert admission.stats()["queued"] == 0 and admission.stats()["active"] == 0
+        assert admission.retry_after() >= 1
+
+    asyncio.run(scenario())
+    print("✅ Controlul admiterii funcționează!")
+
+if __name__ == "__main__":
+    test_admission()
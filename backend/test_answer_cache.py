@@ -0,0 +1,79 @@
+import asyncio
+import os
+import time
+
+# Înainte de importul main: fără snapshot pe disc și fără reîmprospătare în fundal
+os.environ["RAG_SNAPSHOT_PATH"] = ""
+os.environ["SOURCE_REFRESH_INTERVAL"] = "0"
+
+import main
+from services.answer_cache import AnswerCache
+
+MUNICIPALITY_ID = "cache-test"
+URL = "https://primarie.test/hcl-45"
+
+TEXT = """
+Art. 1. - Impozitul pe clădiri se plătește anual, în două rate egale, până la 31 martie și 30 septembrie inclusiv.
+Art. 2. - Pentru plata cu anticipație a impozitului pe clădiri, până la 31 martie, se acordă o bonificație de 10%.
+"""
+
+def _html(text: str) -> bytes:
+    return f"<html><head><title>HCL 45/2024</title></head><body><p>{text}</p></body></html>".encode("utf-8")
+
+def test_answer_cache():
+    answer = {"success": True, "response": "Până la 31 martie.", "sources": ["HCL 45/2024"]}
+
+    # Întrebările care diferă doar prin diacritice, majuscule și punctuație au aceeași cheie
+    cache = AnswerCache(max_entries=2, ttl_seconds=60)
+    key = cache.make_key("Până când se plătește impozitul?", "1", 0)
+    assert key == cache.make_key("  pana cand SE PLATESTE impozitul ", "1", 0)
+    assert key != cache.make_key("Până când se plătește impozitul?", "2", 0)
+    assert key != cache.make_key("Până când se plătește impozitul?", "1", 1)
+
+    # Valoarea returnată e o copie: modificarea ei nu atinge cache-ul
+    cache.put(key, answer)
+    cached = cache.get(key)
+    cached["response"] = "altceva"
+    assert cache.get(key) == answer
+
+    # LRU: cheia accesată recent rămâne, "a" (cea mai veche folosită) e evacuată
+    cache.put(("a",), {"response": "a"})
+    cache.get(key)
+    cache.put(("b",), {"response": "b"})
+    assert cache.get(("a",)) is None and cache.get(key) is not None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["entries"] == 2
+
+    # TTL: intrările expirate nu mai sunt servite și sunt scoase din cache
+    short = AnswerCache(max_entries=10, ttl_seconds=0.05)
+    short.put(key, answer)
+    assert short.get(key) is not None
+    time.sleep(0.1)
+    assert short.get(key) is None and short.stats()["entries"] == 0
+
+    # Invalidare: un document nou sau actualizat schimbă generația indexului primăriei,
+    # deci răspunsurile păstrate pentru generația veche nu mai sunt găsite
+    question = "Până când se plătește impozitul pe clădiri?"
+    main.answer_cache.put(main._answer_cache_key(question, MUNICIPALITY_ID), answer)
+    assert main.answer_cache.get(main._answer_cache_key(question, MUNICIPALITY_ID)) == answer
+
+    assert main.rag_system.process_text_content(TEXT, MUNICIPALITY_ID, "HCL 45/2024")["success"]
+    assert main.answer_cache.get(main._answer_cache_key(question, MUNICIPALITY_ID)) is None
+
+    created = asyncio.run(main.rag_system.process_html_content(URL, _html(TEXT), MUNICIPALITY_ID))
+    assert created["status"] == "created"
+    main.answer_cache.put(main._answer_cache_key(question, MUNICIPALITY_ID), answer)
+
+    # Aceeași pagină, neschimbată: indexul rămâne același, răspunsul rămâne valid
+    unchanged = asyncio.run(main.rag_system.process_html_content(URL, _html(TEXT), MUNICIPALITY_ID))
+    assert unchanged["status"] == "unchanged"
+    assert main.answer_cache.get(main._answer_cache_key(question, MUNICIPALITY_ID)) == answer
+
+    # Pagina modificată: răspunsul vechi nu mai este servit
+    edited = TEXT.replace("10%", "5%")
+    updated = asyncio.run(main.rag_system.process_html_content(URL, _html(edited), MUNICIPALITY_ID))
+    assert updated["status"] == "updated"
+    assert main.answer_cache.get(main._answer_cache_key(question, MUNICIPALITY_ID)) is None
+    print("✅ Cache-ul de răspunsuri funcționează!")
+
+if __name__ == "__main__":
+    test_answer_cache()
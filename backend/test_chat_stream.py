@@ -0,0 +1,99 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Înainte de importul main: fără snapshot pe disc și fără reîmprospătare în fundal
+os.environ["RAG_SNAPSHOT_PATH"] = ""
+os.environ["SOURCE_REFRESH_INTERVAL"] = "0"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+from fastapi.testclient import TestClient
+
+import main
+from ai.ollama_client import OllamaClientManager
+from stub_ollama import ANSWER, start_stub
+
+DOMAIN = "stream.test"
+MUNICIPALITY_ID = "stream-test"
+
+DOCUMENT = """
+Art. 1. - Impozitul pe clădiri se plătește anual, în două rate egale, până la 31 martie și 30 septembrie inclusiv.
+Art. 2. - Pentru plata cu anticipație a impozitului pe clădiri, până la 31 martie, se acordă o bonificație de 10%.
+"""
+
+def _wait_for(condition, timeout: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+def test_chat_stream():
+    server, stub = start_stub(latency=0.01, token_rate=500, tokens=12, jitter=0)
+    original_manager = main.ollama_manager
+    main.ollama_manager = OllamaClientManager(base_url=f"http://127.0.0.1:{server.server_port}")
+    main.municipalities_db[DOMAIN] = {"id": MUNICIPALITY_ID, "name": "Primăria Stream", "domain": DOMAIN}
+    main.rag_system.process_text_content(DOCUMENT, MUNICIPALITY_ID, "HCL 45/2024 - Impozitul pe clădiri")
+    try:
+        # Framing NDJSON: 'sources' primul, apoi tokenii și 'done' la final
+        with TestClient(main.app) as client:
+            with client.stream("POST", "/api/chat/stream",
+                               json={"content": "Până când se plătește impozitul pe clădiri?", "municipality_domain": DOMAIN}) as response:
+                assert response.status_code == 200
+                assert response.headers["content-type"].startswith("application/x-ndjson")
+                events = [json.loads(line) for line in response.iter_lines() if line]
+
+            assert events[0]["type"] == "sources"
+            assert events[0]["sources"] and events[0]["session_id"]
+            assert events[-1]["type"] == "done" and events[-1]["success"]
+            tokens = [event["content"] for event in events if event["type"] == "token"]
+            assert [event["type"] for event in events[1:-1]] == ["token"] * len(tokens) == ["token"] * 12
+            answer = " ".join(ANSWER[:12])
+            assert "".join(tokens) == answer == events[-1]["response"]
+
+            # Răspunsul complet e salvat în conversație la finalul stream-ului
+            session_id = events[0]["session_id"]
+            history = client.get(f"/api/chat/history/{session_id}").json()["messages"]
+            assert [message["role"] for message in history] == ["user", "assistant"]
+            assert history[1]["content"] == answer and history[1]["sources"] == events[-1]["sources"]
+
+        # Deconectarea clientului închide generatorul stream-ului: generarea din Ollama e anulată,
+        # locurile sunt eliberate și partea generată rămâne în conversație
+        stub.tokens = 500
+        stub.token_rate = 50
+
+        async def disconnect():
+            response = await main.chat_stream_endpoint(main.ChatMessage(
+                content="Ce bonificație primesc pentru plata anticipată?", municipality_domain=DOMAIN
+            ))
+            received = []
+            async for line in response.body_iterator:
+                event = json.loads(line)
+                received.append(event)
+                if event["type"] == "token":
+                    break
+            await response.body_iterator.aclose()
+            await response.background()
+            await main.ollama_manager.shutdown()
+            return received
+
+        received = asyncio.run(disconnect())
+        assert [event["type"] for event in received] == ["sources", "token"]
+        assert main.admission.active == 0 and main.ollama_manager.in_flight == 0
+        assert _wait_for(lambda: stub.stats()["active"] == 0)
+        assert stub.stats()["tokens_generated"] < 500
+
+        conversation = main.conversations_db._sessions[received[0]["session_id"]]
+        assert conversation["messages"][-1]["role"] == "assistant"
+        assert conversation["messages"][-1]["content"] == received[1]["content"]
+        print("✅ Stream-ul de chat funcționează!")
+    finally:
+        main.ollama_manager = original_manager
+        main.municipalities_db.pop(DOMAIN, None)
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_chat_stream()
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+from ai.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from services.health_monitor import HealthMonitor
+
+def rejected(breaker: CircuitBreaker) -> bool:
+    try:
+        breaker.allow()
+    except CircuitOpenError:
+        return True
+    return False
+
+class FakeManager:
+    def __init__(self):
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        self.ok = True
+        self.probes = 0
+
+    async def probe_backends(self):
+        self.probes += 1
+        await asyncio.sleep(0.01)
+        return [{"url": "http://a", "ok": self.ok, "latency_ms": 10.0}]
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    # Eșecuri consecutive deschid circuitul; o reușită între ele resetează numărătoarea
+    breaker.record(False, breaker.allow())
+    breaker.record(True, breaker.allow())
+    breaker.record(False, breaker.allow())
+    assert breaker.state == CLOSED
+    breaker.record(False, breaker.allow())
+    assert breaker.state == OPEN and rejected(breaker)
+
+    # După reset_timeout trece o singură cerere de probă; eșecul ei redeschide circuitul
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    trial = breaker.allow()
+    assert trial and rejected(breaker)
+    breaker.record(False, trial)
+    assert breaker.state == OPEN
+
+    # O probă anulată eliberează locul fără să decidă; o probă reușită închide circuitul
+    time.sleep(0.06)
+    breaker.record(None, breaker.allow())
+    breaker.record(True, breaker.allow())
+    assert breaker.state == CLOSED and breaker.stats()["opened"] == 2
+
+    # Monitorul: verificările simultane sunt una singură, status() citește rezultatul păstrat
+    async def scenario():
+        manager = FakeManager()
+        monitor = HealthMonitor(manager, interval=0.02)
+        results = await asyncio.gather(*(monitor.status() for _ in range(5)))
+        assert manager.probes == 1 and all(result["ollama_connected"] for result in results)
+
+        await monitor.start()
+        manager.ok = False
+        await asyncio.sleep(0.1)
+        status = await monitor.status()
+        await monitor.stop()
+        assert not status["ollama_connected"] and status["circuit"] == CLOSED
+        assert monitor.stats()["transitions"] == 1 and monitor.stats()["status_reads"] == 6
+
+    asyncio.run(scenario())
+    print("✅ Circuit breaker-ul și monitorul de stare funcționează!")
+
+if __name__ == "__main__":
+    test_circuit_breaker()
@@ -0,0 +1,42 @@
+from ai.context_packer import ContextPacker
+from ai.text_utils import estimate_tokens
+
+ARTICLE = ("Art. 5. - (1) Impozitul pe clădiri se calculează prin aplicarea cotei de 0,1% asupra valorii impozabile. "
+           "(2) Plata se face în două rate egale, până la 31 martie și 30 septembrie. "
+           "(3) Pentru plata integrală până la 31 martie se acordă o bonificație de 10%. ")
+
+def test_context_packer():
+    packer = ContextPacker(budget_tokens=120, dedupe_threshold=0.8)
+    docs = [
+        {"content": ARTICLE, "source": "HCL 45"},
+        {"content": ARTICLE.replace("0,1%", "0,2%"), "source": "HCL 45 (copie)"},  # aproape identic
+        {"content": "Taxa pentru eliberarea certificatului de urbanism este de 15 lei. " * 6, "source": "HCL 12"},
+        {"content": "Program cu publicul: luni - vineri, 8 - 16.", "source": "Program"}
+    ]
+
+    packed = packer.pack(docs, "Când se plătește impozitul pe clădiri cu bonificație?", header=lambda doc, number: f"\n{number}. {doc['source']}\n")
+
+    # Bugetul e respectat, iar tokenii raportați sunt cei folosiți
+    assert packed["tokens_used"] <= 120
+    assert packed["tokens_used"] == sum(snippet["tokens"] + estimate_tokens(snippet["header"]) for snippet in packed["snippets"])
+    assert [snippet["header"] for snippet in packed["snippets"][:2]] == ["\n1. HCL 45\n", "\n2. HCL 12\n"]
+    assert all(snippet["tokens"] == estimate_tokens(snippet["text"]) for snippet in packed["snippets"])
+
+    # Duplicatul e eliminat, cel mai relevant fragment e primul și întreg
+    assert packed["duplicates"] == 1
+    assert packed["snippets"][0]["doc"]["source"] == "HCL 45" and not packed["snippets"][0]["trimmed"]
+
+    # Fragmentul care nu mai încape întreg e tăiat la granița frazelor
+    trimmed = [snippet for snippet in packed["snippets"] if snippet["trimmed"]]
+    assert trimmed and trimmed[0]["text"].rstrip(" .").endswith("15 lei")
+
+    # Tăiere orientată pe întrebare: se păstrează fraza despre bonificație
+    small = ContextPacker(budget_tokens=40).pack([{"content": ARTICLE}], "bonificație plata integrală")
+    assert "bonificație" in small["snippets"][0]["text"] and small["tokens_used"] <= 40
+    assert small["snippets"][0]["text"].startswith("...")
+
+    assert packer.stats()["duplicates_dropped"] == 1
+    print("✅ Asamblarea contextului funcționează!")
+
+if __name__ == "__main__":
+    test_context_packer()
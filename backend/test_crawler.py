@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ai.crawler import Crawler
+
+class _Handler(BaseHTTPRequestHandler):
+    active = 0
+    max_active = 0
+    flaky_calls = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with _Handler.lock:
+            _Handler.active += 1
+            _Handler.max_active = max(_Handler.max_active, _Handler.active)
+        try:
+            time.sleep(0.05)
+            if self.path == "/flaky":
+                _Handler.flaky_calls += 1
+                if _Handler.flaky_calls == 1:
+                    self.send_response(503)
+                    self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    return
+            if self.path == "/missing":
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = f"<html><title>{self.path}</title><body>Pagina {self.path}</body></html>".encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with _Handler.lock:
+                _Handler.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+def test_crawler():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        crawler = Crawler(max_workers=8, per_host_concurrency=2, per_host_rate=0, max_retries=2)
+        urls = [f"{base}/page{i}" for i in range(10)] + [f"{base}/flaky", f"{base}/missing"]
+
+        async def handle(url, response):
+            return {"length": len(response.content)}
+
+        results = asyncio.run(crawler.crawl(urls, handle, progress=lambda done, total, result: None))
+
+        # Ordinea rezultatelor urmează ordinea URL-urilor
+        assert [result["url"] for result in results] == urls
+        assert all(result["success"] and result["length"] > 0 for result in results[:10])
+
+        # 503 cu Retry-After este reîncercat, 404 nu
+        assert results[10]["success"] and results[10]["attempts"] == 2
+        assert not results[11]["success"] and results[11]["status_code"] == 404
+
+        # Limita de concurență per host este respectată
+        assert _Handler.max_active <= 2
+        assert crawler.stats()["total_retries"] == 1
+        print("✅ Crawler-ul funcționează!")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_crawler()
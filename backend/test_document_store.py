@@ -0,0 +1,110 @@
+import asyncio
+import os
+import tempfile
+
+# Înainte de importul main: fără snapshot implicit și fără reîmprospătare în fundal
+os.environ["RAG_SNAPSHOT_PATH"] = ""
+os.environ["SOURCE_REFRESH_INTERVAL"] = "0"
+
+from ai.document_store import MAGIC, RECORD_HEADER, DocumentStore
+from main import IntegratedRAGSystem
+
+TEXT = """
+Art. 1. - Impozitul pe clădiri se plătește anual, în două rate egale, până la 31 martie și 30 septembrie inclusiv.
+Art. 2. - Pentru plata cu anticipație a impozitului pe clădiri, până la 31 martie, se acordă o bonificație de 10%.
+Art. 3. - Taxa pentru eliberarea certificatului de urbanism este de 15 lei pentru suprafețe de până la 150 mp.
+"""
+
+def _doc(doc_id: str, title: str = "HCL") -> dict:
+    return {"id": doc_id, "title": title, "content": "", "chunks": [], "municipality_id": "1"}
+
+def _replay(store: DocumentStore) -> dict:
+    live = {}
+    for record in store.load():
+        if record["op"] == "put":
+            live[record["doc"]["id"]] = record["doc"]
+        elif record["op"] == "delete":
+            live.pop(record["id"], None)
+    return live
+
+def test_document_store():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "snapshot.bin")
+
+        # put / delete / versiune nouă: la citire rămâne doar starea finală
+        store = DocumentStore(path)
+        store.append_document(_doc("a", "v1"), [{"impozit": 1}])
+        store.append_document(_doc("b"), [])
+        store.append_delete("b")
+        store.append_document(_doc("a", "v2"), [{"impozit": 2}])
+        assert store.records == 4
+        live = _replay(DocumentStore(path))
+        assert list(live) == ["a"] and live["a"]["title"] == "v2"
+        valid_size = os.path.getsize(path)
+
+        # Înregistrare ruptă la final (scriere întreruptă): ignorată, iar fișierul e trunchiat
+        with open(path, "ab") as f:
+            f.write(RECORD_HEADER.pack(1000, 0) + b"incomplet")
+        reader = DocumentStore(path)
+        assert list(_replay(reader)) == ["a"] and reader.records == 4
+        assert os.path.getsize(path) == valid_size
+
+        # CRC greșit: citirea se oprește la înregistrarea coruptă, care este tăiată
+        store.append_document(_doc("c"), [])
+        with open(path, "r+b") as f:
+            f.seek(valid_size + RECORD_HEADER.size)
+            byte = f.read(1)
+            f.seek(valid_size + RECORD_HEADER.size)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        reader = DocumentStore(path)
+        assert list(_replay(reader)) == ["a"]
+        assert os.path.getsize(path) == valid_size
+
+        # Compactarea rescrie fișierul doar cu documentele curente, prin înlocuire atomică
+        reader.compact([_doc("a", "v2")], {"a": [{"impozit": 2}]})
+        assert reader.records == 1 and not os.path.exists(f"{path}.tmp")
+        with open(path, "rb") as f:
+            assert f.read(len(MAGIC)) == MAGIC
+        assert _replay(DocumentStore(path))["a"]["title"] == "v2"
+
+        # O compactare eșuată nu atinge fișierul existent
+        before = open(path, "rb").read()
+        try:
+            reader.compact([{"id": "x", "obiect": object()}], {})
+            raise AssertionError("compactarea trebuia să eșueze")
+        except TypeError:
+            pass
+        assert open(path, "rb").read() == before and not os.path.exists(f"{path}.tmp")
+
+        # Write-behind: după start(), scrierea nu mai blochează apelantul; stop() scrie tot
+        async def write_behind():
+            background = DocumentStore(path)
+            list(background.load())
+            await background.start()
+            size = os.path.getsize(path)
+            background.append_document(_doc("d"), [])
+            background.append_delete("a")
+            assert background.pending == 2 and os.path.getsize(path) == size
+            await background.stop()
+            assert background.pending == 0 and background.flushes >= 1
+
+        asyncio.run(write_behind())
+        assert list(_replay(DocumentStore(path))) == ["d"]
+
+        # IntegratedRAGSystem repornit din snapshot: aceleași documente și aceleași rezultate
+        rag_path = os.path.join(directory, "rag.bin")
+        rag = IntegratedRAGSystem(snapshot_path=rag_path)
+        kept = rag.process_text_content(TEXT, "1", "HCL 45/2024")["document_id"]
+        removed = rag.process_text_content(TEXT.replace("clădiri", "teren"), "1", "HCL 46/2024")["document_id"]
+        rag._remove_document(removed)
+        questions = ["până când se plătește impozitul pe clădiri", "taxa certificat de urbanism", "impozit teren"]
+        expected = [rag.search_documents(question, "1", n_results=3) for question in questions]
+
+        restarted = IntegratedRAGSystem(snapshot_path=rag_path)
+        assert list(restarted.documents) == [kept]
+        assert [restarted.search_documents(question, "1", n_results=3) for question in questions] == expected
+        assert restarted.get_index_generation("1") > 0
+    print("✅ Snapshot-ul documentelor funcționează!")
+
+if __name__ == "__main__":
+    test_document_store()
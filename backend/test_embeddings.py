@@ -0,0 +1,31 @@
+import random
+
+import numpy as np
+
+from ai.embeddings import embeddings_model
+
+def test_embed_batch_matches_text_to_vector():
+    random.seed(7)
+    vocabulary = [
+        'Taxa', 'IMPOZITUL', 'clădiri', 'terenului', 'plată', 'scadența', 'HCL', 'nr.', '45/2024',
+        '0,2%', 'lei', 'RON', 'euro', 'Primăria', 'București', 'termen:', 'şi', 'ţară', 'İMPOZIT',
+        '-', '(1)', 'art.', '\x1c', '٣', '€', '„taxa”', 'consiliu-local', '\\n', '\\t', 'scutire!', 'cerere,', 'aviz?'
+    ]
+    texts = ['', '   ', 'taxa', 'Taxa pe clădiri: 0,2% din valoarea cadastrală (HCL 45/2024).']
+    texts += [' '.join(random.choice(vocabulary) for _ in range(random.randint(1, 300))) for _ in range(200)]
+
+    matrix = embeddings_model.embed_batch(texts, batch_size=64)
+    expected = [embeddings_model._text_to_vector(text) for text in texts]
+
+    # Rezultatele trebuie să fie identice bit cu bit cu implementarea per text
+    assert matrix.shape == (len(texts), 50)
+    assert matrix.tolist() == expected
+    assert embeddings_model.embed_texts(texts) == expected
+
+    matrix32 = embeddings_model.embed_batch(texts, dtype=np.float32)
+    assert matrix32.dtype == np.float32
+    assert np.allclose(matrix32, matrix, atol=1e-7)
+    print("✅ Embeddings batch identice cu _text_to_vector!")
+
+if __name__ == "__main__":
+    test_embed_batch_matches_text_to_vector()
@@ -0,0 +1,50 @@
+import time
+
+from ai.extractive import extractive_answer
+from services.degraded_mode import DegradedModeController
+
+DOCS = [
+    {
+        "content": "Art. 5. - (1) Impozitul pe clădiri rezidențiale se calculează prin aplicarea unei cote "
+                   "de 0,1% asupra valorii impozabile. (2) Plata impozitului se face în două rate egale, "
+                   "până la 31 martie și 30 septembrie. (3) Declarațiile se depun la registratura primăriei.",
+        "source": "HCL 45/2024"
+    },
+    {
+        "content": "Taxa pentru eliberarea certificatului de urbanism este de 15 lei. "
+                   "Impozitul pe clădiri nerezidențiale are o cotă de 0,5%.",
+        "source": "HCL 12/2024"
+    }
+]
+
+def test_extractive():
+    # Frazele cu termenii întrebării, în ordinea din documente, cu sursele lor
+    answer = extractive_answer("Când se face plata impozitului pe clădiri?", DOCS, max_sentences=2)
+    assert "31 martie" in answer["response"] and "registratura" not in answer["response"]
+    assert answer["sources"][0] == "HCL 45/2024"
+
+    answer = extractive_answer("Cât costă certificatul de urbanism?", DOCS)
+    assert answer["response"].startswith("Taxa pentru eliberarea certificatului") and answer["sources"] == ["HCL 12/2024"]
+    assert extractive_answer("parcări rezidențiale abonament", DOCS[1:]) is None
+
+    # Intră la eșecuri repetate, iese doar după timpul minim și cu semnalele sub pragurile de ieșire
+    mode = DegradedModeController(enabled=True)
+    mode.min_seconds, mode.probe_interval = 0.05, 0.0
+    for _ in range(mode.enter_failures):
+        mode.record_generation(30.0, ok=False)
+    assert mode.update(queue_depth=0)
+
+    assert mode.try_probe() and not mode.try_probe()
+    mode.record_generation(1.0, ok=True)
+    mode.probe_done()
+    assert mode.update(queue_depth=0)  # încă în timpul minim
+    time.sleep(0.06)
+    assert mode.update(queue_depth=mode.exit_queue + 1)  # coada încă peste pragul de ieșire
+    assert not mode.update(queue_depth=0)
+
+    assert mode.update(queue_depth=mode.enter_queue) and mode.stats()["activations"] == 2
+    assert DegradedModeController(enabled=True).update(queue_depth=0, backends_available=False)
+    print("✅ Răspunsurile extractive și modul degradat funcționează!")
+
+if __name__ == "__main__":
+    test_extractive()
@@ -0,0 +1,40 @@
+import glob
+import os
+import re
+
+from ai.html_extract import _extract_bs4, decode_html, extract_html
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "fixtures", "html")
+
+def _normalized(page):
+    return page["title"], re.sub(r"\s+", " ", page["text"]).strip()
+
+def test_html_extract():
+    # Același rezultat ca implementarea BeautifulSoup pe toate paginile salvate
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+    assert paths
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        assert _normalized(extract_html(data, "stdlib")) == _normalized(_extract_bs4(decode_html(data))), path
+
+    # Navigația și reclamele dispar, conținutul principal rămâne
+    text = "Art. 1. Impozitul pe clădiri se plătește în două rate egale. " * 5
+    page = extract_html(
+        f'<html><head><title> HCL 12 </title><script>var x = "<p>";</script></head><body>'
+        f'<nav>Acasă</nav><div class="sidebar-left">Anunțuri</div><article>{text}</article>'
+        f'<footer>Contact</footer></body></html>'
+    )
+    assert page["title"] == "HCL 12"
+    assert page["text"] == text
+
+    # Fără selector de conținut: tot body-ul; fără <title>: None
+    page = extract_html("<body><p>Program</p><div class='ads'>Reclamă</div><p>cu publicul</p></body>")
+    assert page["title"] is None and page["text"] == "Programcu publicul"
+
+    # Charset declarat în pagină
+    assert decode_html('<meta charset="iso-8859-2"><p>Primăria</p>'.encode("iso-8859-2")).endswith("<p>Primăria</p>")
+    print("✅ Extragerea HTML funcționează!")
+
+if __name__ == "__main__":
+    test_html_extract()
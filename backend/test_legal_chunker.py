@@ -0,0 +1,67 @@
+from ai.legal_chunker import LegalChunker, chunk_legal_text
+from ai.text_utils import estimate_tokens
+
+SENTENCE = "Impozitul pe clădiri se calculează prin aplicarea cotei asupra valorii impozabile a clădirii. "
+
+def _law() -> str:
+    long_article = " ".join(f"({i}) {SENTENCE * 4}" for i in range(1, 9))
+    return (
+        "HOTĂRÂREA nr. 45/2024 privind impozitele locale. "
+        "CAPITOLUL I Dispoziții generale "
+        f"Art. 1. - (1) {SENTENCE * 3}potrivit art. 5 alin. (2) din Legea nr. 227/2015. "
+        f"Art. 2. - {long_article}"
+        "CAPITOLUL II Taxe speciale "
+        f"Art. 3. - {SENTENCE * 3}"
+    )
+
+def test_legal_chunker():
+    text = _law()
+    chunks = chunk_legal_text(text, max_tokens=200, min_tokens=40)
+
+    # Fiecare chunk e o bucată exactă din text, cu tokenii estimați
+    for chunk in chunks:
+        assert text[chunk["start"]:chunk["end"]] == chunk["text"]
+        assert chunk["tokens"] == estimate_tokens(chunk["text"]) <= 200
+
+    # Articolele încep chunk-uri noi; trimiterea "art. 5 alin. (2)" nu este un titlu
+    article_1 = [chunk for chunk in chunks if chunk["article"] == "Art. 1"]
+    assert len(article_1) == 1 and "art. 5 alin. (2)" in article_1[0]["text"]
+    assert article_1[0]["text"].endswith("227/2015.")
+
+    # Articolul lung e împărțit pe alineate, fără a trece în articolul următor
+    article_2 = [chunk for chunk in chunks if chunk["article"] == "Art. 2"]
+    assert len(article_2) > 1 and all(chunk["text"].startswith(("Art. 2.", "(")) for chunk in article_2)
+
+    # Titlul de capitol rămâne lipit de primul articol din capitol
+    assert chunks[-1]["text"].startswith("CAPITOLUL II") and chunks[-1]["article"] == "Art. 3"
+    assert chunks[-1]["chapter"] == "CAPITOLUL II"
+
+    # În flux, pagină cu pagină: aceleași chunk-uri, cu numărul paginii și fără marcaje
+    words = text.split(" ")
+    chunker = LegalChunker(max_tokens=200, min_tokens=40)
+    streamed = []
+    for page, start in enumerate(range(0, len(words), 60), 1):
+        streamed += chunker.feed(f"\n--- Pagina {page} ---\n" + " ".join(words[start:start + 60]))
+    streamed += chunker.finish()
+
+    assert [chunk["text"].split() for chunk in streamed] == [chunk["text"].split() for chunk in chunks]
+    assert streamed[0]["page"] == 1 and streamed[-1]["page"] > 1
+    assert all("Pagina" not in chunk["text"] for chunk in streamed)
+
+    # Text lung fără titluri și fără punctuație: tăieturile cad între cuvinte, nu în mijlocul lor
+    run = " ".join(["impozitul clădirilor și terenurilor din intravilan se stabilește anual"] * 60)
+    chunker = LegalChunker(max_tokens=50, min_tokens=10)
+    unpunctuated = []
+    for start in range(0, len(run), 97):
+        unpunctuated += chunker.feed(run[start:start + 97])
+    unpunctuated += chunker.finish()
+    assert len(unpunctuated) > 1
+    for chunk in unpunctuated:
+        assert run[chunk["start"]:chunk["end"]] == chunk["text"] and chunk["tokens"] <= 50
+        assert chunk["start"] == 0 or run[chunk["start"] - 1] == " "
+        assert chunk["end"] == len(run) or run[chunk["end"]] == " "
+    assert " ".join(chunk["text"] for chunk in unpunctuated).split() == run.split()
+    print("✅ Chunking-ul pe articole funcționează!")
+
+if __name__ == "__main__":
+    test_legal_chunker()
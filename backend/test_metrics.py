@@ -0,0 +1,33 @@
+from services.metrics import MetricsRegistry
+
+def test_metrics():
+    registry = MetricsRegistry()
+    stages = registry.histogram("stage_seconds", "Durata etapelor", ("stage",), buckets=(0.01, 0.1, 1.0))
+    requests = registry.counter("requests", "Cereri", ("outcome",))
+    sizes = {"1": 12, "2": 3}
+    registry.callback("index_chunks", "Chunk-uri", lambda: {(m,): n for m, n in sizes.items()}, ("municipality",))
+    registry.callback("broken", "Callback cu eroare", lambda: 1 / 0)
+
+    retrieval = stages.labels("retrieval")
+    for value in (0.005, 0.05, 0.05, 2.0):
+        retrieval.observe(value)
+    requests.labels("answer").inc()
+    requests.labels("answer").inc(2)
+
+    text = registry.render()
+    lines = text.splitlines()
+
+    # Bucket-urile sunt cumulative, cu +Inf egal cu numărul de observații
+    assert 'stage_seconds_bucket{stage="retrieval",le="0.01"} 1' in lines
+    assert 'stage_seconds_bucket{stage="retrieval",le="0.1"} 3' in lines
+    assert 'stage_seconds_bucket{stage="retrieval",le="+Inf"} 4' in lines
+    assert 'stage_seconds_count{stage="retrieval"} 4' in lines
+    assert "# TYPE requests_total counter" in lines and 'requests_total{outcome="answer"} 3' in lines
+    assert 'index_chunks{municipality="1"} 12' in lines
+
+    # Un callback care eșuează nu strică restul răspunsului
+    assert "broken" not in text and text.endswith("\n")
+    print("✅ Metricile Prometheus funcționează!")
+
+if __name__ == "__main__":
+    test_metrics()
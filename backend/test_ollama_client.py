@@ -0,0 +1,67 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+from ai.ollama_client import OllamaClientManager
+from stub_ollama import start_stub
+
+PAYLOAD = {"model": "stub", "prompt": "Până când se plătește impozitul pe clădiri?", "stream": False}
+
+async def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        await asyncio.sleep(0.01)
+    return condition()
+
+def test_ollama_client():
+    server, stub = start_stub(latency=0.3, token_rate=0, tokens=4, jitter=0, max_parallel=8)
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        manager = OllamaClientManager(base_url=url, max_concurrent_generations=2)
+
+        # Cu limita 2, a treia generare așteaptă în coadă până se eliberează un loc
+        async def queued():
+            tasks = [asyncio.create_task(manager.generate(PAYLOAD)) for _ in range(3)]
+            assert await _wait_for(lambda: manager.in_flight == 2 and manager.waiting == 1)
+            assert manager.stats()["waiting"] == 1 and stub.stats()["active"] <= 2
+
+            responses = await asyncio.gather(*tasks)
+            assert all(response.status_code == 200 for response in responses)
+            assert manager.in_flight == 0 and manager.waiting == 0
+            await manager.shutdown()
+
+        asyncio.run(queued())
+        stats = manager.stats()
+        assert stub.stats()["max_active"] == 2
+        assert stats["total_generations"] == 3
+        # Primele două intră imediat; a treia așteaptă cât durează o generare (~0.3 s)
+        assert stats["max_wait_ms"] >= 200 and 0 < stats["avg_wait_ms"] < stats["max_wait_ms"]
+
+        # După shutdown(), managerul poate fi folosit din alt event loop
+        async def reuse():
+            response = await manager.generate(PAYLOAD)
+            await manager.shutdown()
+            return response.status_code
+
+        assert asyncio.run(reuse()) == 200
+
+        # Fără shutdown(), clientul rămâne al loop-ului care l-a creat: alt loop primește eroare
+        bound = OllamaClientManager(base_url=url)
+        asyncio.run(bound.startup())
+        try:
+            asyncio.run(bound.generate(PAYLOAD))
+            raise AssertionError("clientul trebuia să refuze alt event loop")
+        except RuntimeError:
+            pass
+        assert bound.in_flight == 0 and bound.waiting == 0
+        print("✅ Clientul Ollama partajat funcționează!")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_ollama_client()
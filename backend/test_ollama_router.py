@@ -0,0 +1,88 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ai.ollama_client import OllamaClientManager
+
+def _stub_handler(delay: float):
+    """Ollama simulat: /api/generate răspunde după `delay` secunde"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        generations = 0
+
+        def do_GET(self):
+            self._send({"version": "stub"})
+
+        def do_POST(self):
+            json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            Handler.generations += 1
+            time.sleep(delay)
+            self._send({"response": "Taxa pe clădiri este 0,2%.", "done": True})
+
+        def _send(self, data: dict):
+            body = json.dumps(data).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+def _start(handler, port: int = 0):
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def test_ollama_router():
+    fast_handler, slow_handler = _stub_handler(0.02), _stub_handler(0.2)
+    fast, fast_url = _start(fast_handler)
+    slow, slow_url = _start(slow_handler)
+    dead_port = _free_port()
+    dead_url = f"http://127.0.0.1:{dead_port}"
+    revived = None
+
+    try:
+        manager = OllamaClientManager(base_urls=[fast_url, slow_url, dead_url], max_concurrent_generations=4)
+        manager.router.eject_after = 1
+
+        async def scenario():
+            payload = {"model": "stub", "prompt": "impozit", "stream": False}
+            responses = []
+            for _ in range(4):
+                responses += await asyncio.gather(*(manager.generate(payload) for _ in range(6)))
+
+            # Eroarea de conexiune e reîncercată pe alt backend, iar backend-ul oprit iese din rotație
+            assert all(response.status_code == 200 for response in responses)
+            stats = manager.router.stats()
+            dead = stats["backends"][2]
+            assert not dead["healthy"] and dead["ejections"] == 1 and stats["failovers"] >= 1
+
+            # Backend-ul rapid primește mai multe generări decât cel lent
+            assert fast_handler.generations > slow_handler.generations > 0
+
+            # Reverificarea îl readuce în rotație când pornește
+            nonlocal revived
+            revived, _ = _start(_stub_handler(0.01), dead_port)
+            await manager.router.probe(manager._ensure_client())
+            assert manager.router.stats()["backends"][2]["healthy"]
+            await manager.shutdown()
+
+        asyncio.run(scenario())
+        print("✅ Router-ul Ollama funcționează!")
+    finally:
+        for server in (fast, slow, revived):
+            if server is not None:
+                server.shutdown()
+
+if __name__ == "__main__":
+    test_ollama_router()
@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+
+# Chroma într-un director temporar, fără telemetrie (înainte de importul ai.rag_system)
+CHROMA_DIR = tempfile.mkdtemp(prefix="test_chroma_")
+os.environ["CHROMA_PERSIST_DIRECTORY"] = CHROMA_DIR
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+from ai.rag_system import RAGSystem
+
+PAGES = 30
+
+def _page_lines(page: int):
+    lines = [f"Art. {page + 1}. - (1) Impozitul pe cladiri pentru zona {page + 1} se plateste anual,"]
+    lines += [f"in doua rate egale, pana la 31 martie si 30 septembrie, conform anexei {page % 6 + 1} la hotarare."] * 3
+    lines += [f"(2) Pentru plata anticipata pana la 31 martie se acorda o bonificatie de {5 + page % 2 * 5}% din impozit."] * 3
+    return lines
+
+def _write_pdf(path: str, pages: int):
+    """PDF minimal, cu o pagină de text (un articol) pentru fiecare pagină"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        text = " T* ".join(f"({line}) Tj" for line in _page_lines(page))
+        stream = f"BT /F1 10 Tf 14 TL 40 780 Td {text} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents {len(objects)} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(data)
+
+def test_pdf_ingest():
+    try:
+        pdf_path = os.path.join(CHROMA_DIR, "hcl.pdf")
+        _write_pdf(pdf_path, PAGES)
+
+        rag = RAGSystem()
+        rag.pdf_pages_per_task = 4
+        rag.pdf_parallel_min_pages = 8
+        rag.add_batch_size = 7
+
+        def extract(workers: int):
+            rag.pdf_workers = workers
+            timings = {"extract": 0.0, "chunk": 0.0}
+            pages = list(rag._iter_pdf_pages(pdf_path, timings))
+            batches = list(rag._pdf_chunk_batches(pdf_path, timings, {"pages": 0}))
+            return pages, batches
+
+        # Extragerea în process pool păstrează ordinea paginilor și produce aceleași chunk-uri
+        parallel_pages, parallel_batches = extract(workers=3)
+        sequential_pages, sequential_batches = extract(workers=1)
+        assert [page for page, _ in parallel_pages] == list(range(PAGES))
+        assert parallel_pages == sequential_pages
+        assert "Art. 1." in parallel_pages[0][1] and f"Art. {PAGES}." in parallel_pages[-1][1]
+        assert parallel_batches == sequential_batches
+        assert all(len(batch) <= rag.add_batch_size for batch in parallel_batches)
+        chunks = sum(len(batch) for batch in parallel_batches)
+        assert len(parallel_batches) > 1 and chunks >= PAGES
+
+        # Scrierile în Chroma rămân în limita add_batch_size
+        collection = RAGSystem.get_or_create_collection(rag, "pdf")
+        upserts = []
+
+        class RecordingCollection:
+            def __getattr__(self, name):
+                return getattr(collection, name)
+
+            def upsert(self, ids, **kwargs):
+                upserts.append(len(ids))
+                return collection.upsert(ids=ids, **kwargs)
+
+        rag.get_or_create_collection = lambda municipality_id: RecordingCollection()
+        rag.pdf_workers = 3
+        assert rag.process_pdf(pdf_path, "pdf", "hcl.pdf")
+        assert upserts and max(upserts) <= rag.add_batch_size and sum(upserts) == chunks
+        assert collection.count() == chunks
+        assert rag.ingestion_stats[-1]["pages"] == PAGES and rag.ingestion_stats[-1]["chunks"] == chunks
+        print("✅ Ingestia PDF în flux funcționează!")
+    finally:
+        shutil.rmtree(CHROMA_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_pdf_ingest()
@@ -0,0 +1,109 @@
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+# Chroma într-un director temporar, fără telemetrie (înainte de importul ai.rag_system)
+CHROMA_DIR = tempfile.mkdtemp(prefix="test_chroma_")
+os.environ["CHROMA_PERSIST_DIRECTORY"] = CHROMA_DIR
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+import ai.rag_system as rag_module
+from ai.ollama_client import OllamaClientManager
+from ai.rag_system import RAGSystem
+from stub_ollama import start_stub
+
+QUESTION = "Până când se plătește impozitul pe clădiri?"
+DOCS = [{
+    "content": "Art. 1. - Impozitul pe clădiri se plătește anual, în două rate egale, până la 31 martie și 30 septembrie.",
+    "metadata": {"source": "HCL 45/2024", "source_type": "text"}
+}]
+
+async def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        await asyncio.sleep(0.01)
+    return condition()
+
+def test_rag_async():
+    server, stub = start_stub(latency=0.3, token_rate=0, tokens=6, jitter=0, max_parallel=4)
+    original_manager = rag_module.ollama_manager
+    manager = OllamaClientManager(base_url=f"http://127.0.0.1:{server.server_port}")
+    rag_module.ollama_manager = manager
+    try:
+        rag = RAGSystem()
+        search_threads = []
+
+        def search_documents(query, municipality_id, n_results=5):
+            # Căutare blocantă (ca interogarea Chroma)
+            search_threads.append(threading.current_thread())
+            time.sleep(0.2)
+            return DOCS
+
+        rag.search_documents = search_documents
+
+        async def scenario():
+            # Căutarea rulează într-un thread: event loop-ul rămâne liber în timpul ei
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticking = asyncio.create_task(ticker())
+            docs = await rag.search_documents_async(QUESTION, "1")
+            ticking.cancel()
+            assert docs == DOCS and search_threads[-1] is not threading.main_thread()
+            assert ticks >= 5
+
+            # Două întrebări simultane nu se serializează: durata totală ≈ o singură întrebare
+            started = time.perf_counter()
+            single = await rag.answer_async(QUESTION, "1")
+            single_elapsed = time.perf_counter() - started
+            assert single["sources"] == ["HCL 45/2024"] and single["response"]
+
+            started = time.perf_counter()
+            answers = await asyncio.gather(*(rag.answer_async(QUESTION, "1") for _ in range(2)))
+            elapsed = time.perf_counter() - started
+            assert all(answer == single for answer in answers)
+            assert elapsed < single_elapsed * 1.5 and stub.stats()["max_active"] == 2
+
+            # Timeout: wait_for întrerupe pipeline-ul și se returnează răspunsul de rezervă
+            stub.latency = 1.0
+            started = time.perf_counter()
+            answer = await rag.answer_async(QUESTION, "1", timeout=0.4)
+            assert time.perf_counter() - started < 1.0
+            assert answer == rag._error_response()
+            assert manager.in_flight == 0
+
+            # Anularea (clientul s-a deconectat) închide cererea către Ollama și eliberează locul
+            requests = stub.stats()["requests"]
+            task = asyncio.create_task(rag.answer_async(QUESTION, "1", timeout=10))
+            assert await _wait_for(lambda: manager.in_flight == 1 and stub.stats()["requests"] == requests + 1)
+            task.cancel()
+            try:
+                await task
+                raise AssertionError("task-ul trebuia anulat")
+            except asyncio.CancelledError:
+                pass
+            assert manager.in_flight == 0 and manager.router.backends[0].in_flight == 0
+            assert await _wait_for(lambda: stub.stats()["active"] == 0)
+            await manager.shutdown()
+
+        asyncio.run(scenario())
+        print("✅ Generarea async funcționează!")
+    finally:
+        rag_module.ollama_manager = original_manager
+        server.shutdown()
+        shutil.rmtree(CHROMA_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_rag_async()
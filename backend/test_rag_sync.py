@@ -0,0 +1,120 @@
+import os
+import shutil
+import sys
+import tempfile
+import uuid
+
+# Chroma într-un director temporar, fără telemetrie (înainte de importul ai.rag_system)
+CHROMA_DIR = tempfile.mkdtemp(prefix="test_chroma_")
+os.environ["CHROMA_PERSIST_DIRECTORY"] = CHROMA_DIR
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+from ai.embeddings import embeddings_model
+from ai.rag_system import RAGSystem
+from corpus import generate_documents, to_html
+
+URL = "https://primarie.test/hcl-1"
+
+class RecordingCollection:
+    """Colecția Chroma, cu evidența scrierilor (id-uri adăugate, actualizate și șterse)"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.reset()
+
+    def reset(self):
+        self.upserted, self.updated, self.deleted = [], [], []
+
+    def upsert(self, ids, **kwargs):
+        self.upserted.extend(ids)
+        return self.collection.upsert(ids=ids, **kwargs)
+
+    def update(self, ids, **kwargs):
+        self.updated.extend(ids)
+        return self.collection.update(ids=ids, **kwargs)
+
+    def delete(self, ids=None, **kwargs):
+        self.deleted.extend(ids or [])
+        return self.collection.delete(ids=ids, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+def test_rag_sync():
+    try:
+        rag = RAGSystem()
+        collections = {}
+
+        def get_or_create_collection(municipality_id):
+            if municipality_id not in collections:
+                collections[municipality_id] = RecordingCollection(RAGSystem.get_or_create_collection(rag, municipality_id))
+            return collections[municipality_id]
+
+        rag.get_or_create_collection = get_or_create_collection
+        collection = get_or_create_collection("1")
+
+        # Prima încărcare: toate chunk-urile sunt noi, cu id-uri derivate din hash-ul conținutului
+        document = generate_documents(5)[0]
+        assert rag.process_html_content(URL, to_html(document), "1")
+        chunks = collection.count()
+        assert chunks == len(collection.upserted) > 1
+        assert collection.updated == [] and collection.deleted == []
+        source_key = rag._source_key("html", URL)
+        assert all(chunk_id.startswith(f"{source_key}_") for chunk_id in collection.upserted)
+
+        # Același conținut: documentul e recunoscut ca neschimbat, nicio scriere
+        collection.reset()
+        assert rag.process_html_content(URL, to_html(document), "1")
+        assert collection.upserted == [] and collection.updated == [] and collection.deleted == []
+
+        # Document editat: doar chunk-ul modificat primește embedding nou, cel vechi e șters
+        before = set(collection.get(where={"source_key": source_key})["ids"])
+        edited = dict(document, text=document["text"].replace("Art. 3. - (1)", "Art. 3. - (1) Prin excepție,"))
+        collection.reset()
+        assert rag.process_html_content(URL, to_html(edited), "1")
+        assert len(collection.upserted) == 1 and len(collection.deleted) == 1
+        assert len(collection.updated) == chunks - 1
+        after = set(collection.get(where={"source_key": source_key})["ids"])
+        assert after == (before - set(collection.deleted)) | set(collection.upserted)
+        assert collection.count() == chunks
+
+        # Chunk-urile identice din același document primesc sufixul _n
+        collection.reset()
+        result = rag._sync_chunks(collection, "repetat", "hash", [[{"text": "Art. 1. Text"}, {"text": "Art. 1. Text"}]], {},
+                                  lambda chunk, i: {"chunk_id": i})
+        assert result == {"chunks": 2, "added": 2, "kept": 0, "deleted": 0}
+        assert collection.upserted[1] == f"{collection.upserted[0]}_1"
+
+        # Chunk-urile vechi cu id aleator (fără source_key) sunt înlocuite la prima re-încărcare
+        legacy_url = "https://primarie.test/hcl-vechi"
+        legacy_texts = ["Text vechi, indexat înainte de id-urile stabile."] * 2
+        collection.add(
+            ids=[str(uuid.uuid4()) for _ in legacy_texts],
+            embeddings=embeddings_model.embed_texts(legacy_texts),
+            documents=legacy_texts,
+            metadatas=[{"source": "HCL vechi", "url": legacy_url, "source_type": "html", "chunk_id": i}
+                       for i in range(len(legacy_texts))]
+        )
+        collection.reset()
+        assert rag.process_html_content(legacy_url, to_html(document), "1")
+        assert len(collection.deleted) == 2
+        assert collection.get(where={"url": legacy_url})["ids"] == collection.get(
+            where={"source_key": rag._source_key("html", legacy_url)})["ids"]
+
+        # Texte: același titlu cu conținut diferit rămân documente separate; același text nu se dublează
+        text_collection = get_or_create_collection("2")
+        first, second = generate_documents(2, seed=1)[0]["text"], generate_documents(2, seed=2)[0]["text"]
+        assert rag.process_text_content(first, "2", "Anunț")
+        assert rag.process_text_content(second, "2", "Anunț")
+        count = text_collection.count()
+        assert len({metadata["source_key"] for metadata in text_collection.get()["metadatas"]}) == 2
+        text_collection.reset()
+        assert rag.process_text_content(first, "2", "Anunț")
+        assert text_collection.upserted == [] and text_collection.count() == count
+        print("✅ Sincronizarea chunk-urilor cu Chroma funcționează!")
+    finally:
+        shutil.rmtree(CHROMA_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_rag_sync()
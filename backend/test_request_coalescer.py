@@ -0,0 +1,117 @@
+import asyncio
+import os
+import sys
+
+# Înainte de importul main: fără snapshot pe disc și fără reîmprospătare în fundal
+os.environ["RAG_SNAPSHOT_PATH"] = ""
+os.environ["SOURCE_REFRESH_INTERVAL"] = "0"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+import httpx
+
+import main
+from ai.ollama_client import OllamaClientManager
+from services.request_coalescer import RequestCoalescer
+from stub_ollama import start_stub
+
+DOMAIN = "coalesce.test"
+
+def test_request_coalescer():
+    async def scenario():
+        coalescer = RequestCoalescer()
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"response": "răspuns"}
+
+        # Cererile identice concurente împart o singură execuție
+        results = await asyncio.gather(*(coalescer.run("q", generate) for _ in range(5)))
+        assert len(calls) == 1 and all(result == {"response": "răspuns"} for result in results)
+        assert coalescer.stats() == {"in_flight": 0, "leaders": 1, "followers": 4}
+
+        # O eroare a execuției comune ajunge la toți cei care o așteaptă
+        async def failing():
+            await asyncio.sleep(0.02)
+            raise ValueError("Ollama indisponibil")
+
+        results = await asyncio.gather(*(coalescer.run("err", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert not coalescer.in_flight("err") and coalescer.stats()["in_flight"] == 0
+
+        # Anularea celui care a pornit execuția nu o oprește cât timp mai sunt alții care așteaptă
+        calls.clear()
+        leader = asyncio.create_task(coalescer.run("shared", generate))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(coalescer.run("shared", generate))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await follower == {"response": "răspuns"} and len(calls) == 1
+        assert leader.cancelled() and not coalescer.in_flight("shared")
+
+        # Când renunță toți, execuția comună e anulată și cheia nu rămâne agățată
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def slow():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.create_task(coalescer.run("slow", slow)) for _ in range(2)]
+        await started.wait()
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        assert not coalescer.in_flight("slow") and coalescer.stats()["in_flight"] == 0
+
+        # Execuția anulată din exterior ajunge ca CancelledError la cei care o așteaptă
+        gate = asyncio.Event()
+
+        async def blocked():
+            await gate.wait()
+
+        first = asyncio.create_task(coalescer.run("cancel", blocked))
+        second = asyncio.create_task(coalescer.run("cancel", blocked))
+        await asyncio.sleep(0)
+        coalescer._in_flight["cancel"].cancel()
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        assert all(isinstance(result, asyncio.CancelledError) for result in results)
+        assert not coalescer.in_flight("cancel")
+
+        # Prin /api/chat: o singură generare în Ollama, dar fiecare cerere are sesiunea și istoricul ei
+        server, stub = start_stub(latency=0.3, token_rate=500, tokens=8, jitter=0)
+        original_manager = main.ollama_manager
+        main.ollama_manager = OllamaClientManager(base_url=f"http://127.0.0.1:{server.server_port}")
+        try:
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                question = {"content": "Cine colectează taxa hotelieră?", "municipality_domain": DOMAIN}
+                responses = await asyncio.gather(*(client.post("/api/chat", json=question) for _ in range(3)))
+                bodies = [response.json() for response in responses]
+                assert stub.stats()["requests"] == 1
+                assert len({body["session_id"] for body in bodies}) == 3
+                assert len({body["response"] for body in bodies}) == 1
+
+                for body in bodies:
+                    history = (await client.get(f"/api/chat/history/{body['session_id']}")).json()["messages"]
+                    assert [message["role"] for message in history] == ["user", "assistant"]
+                    assert history[1]["content"] == body["response"]
+            assert main.request_coalescer.stats()["in_flight"] == 0
+        finally:
+            await main.ollama_manager.shutdown()
+            main.ollama_manager = original_manager
+            main.municipalities_db.pop(DOMAIN, None)
+            server.shutdown()
+
+    asyncio.run(scenario())
+    print("✅ Coalescing-ul cererilor funcționează!")
+
+if __name__ == "__main__":
+    test_request_coalescer()
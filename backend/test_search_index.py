@@ -0,0 +1,37 @@
+from ai.search_index import InvertedIndex
+
+def test_search_index():
+    index = InvertedIndex()
+    index.add_document("hcl", [
+        "Taxa pe clădiri se calculează prin aplicarea cotei asupra valorii impozabile.",
+        "Impozitul pe mijloacele de transport se plătește anual până la 31 martie.",
+        "Taxa pe clădiri pentru persoane juridice este între 0,2% și 1,3%."
+    ])
+    index.add_document("anunt", ["Programul casieriei primăriei este de luni până vineri."])
+
+    # Căutarea ignoră diacriticele și ordonează după scorul BM25
+    results = index.search("taxa pe cladiri juridice", n_results=2)
+    assert [(doc_id, chunk) for _, doc_id, chunk in results] == [("hcl", 2), ("hcl", 0)]
+    assert results[0][0] > results[1][0]
+
+    assert index.search("programul casieriei", n_results=3)[0][1:] == ("anunt", 0)
+    assert index.search("xyz", n_results=3) == []
+
+    # Ștergerea unui document îl elimină complet din index, fără să atingă celelalte
+    index.remove_document("hcl")
+    assert len(index) == 1
+    assert index.search("taxa cladiri", n_results=3) == []
+    assert "hcl" not in index.doc_chunks
+    assert all(key[0] == "anunt" for postings in index.postings.values() for key in postings)
+    assert index.total_length == index.chunk_lengths[("anunt", 0)]
+    assert index.search("programul casieriei", n_results=3)[0][1:] == ("anunt", 0)
+
+    # Re-indexarea și ștergerea repetată nu lasă postings goale
+    index.add_document("hcl", ["Taxa pe clădiri se plătește anual."])
+    index.remove_document("hcl")
+    index.remove_document("hcl")
+    assert "cladiri" not in index.postings and len(index) == 1
+    print("✅ Indexul inversat funcționează!")
+
+if __name__ == "__main__":
+    test_search_index()
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Înainte de importul main: fără snapshot pe disc și fără reîmprospătare în fundal
+os.environ["RAG_SNAPSHOT_PATH"] = ""
+os.environ["SOURCE_REFRESH_INTERVAL"] = "0"
+
+import httpx
+
+import main
+from ai.ollama_client import OllamaClientManager
+from services.session_context import SessionContextStore
+
+class _ContextHandler(BaseHTTPRequestHandler):
+    """Ollama simulat: contextul returnat = contextul primit + un token nou pentru fiecare tură"""
+    protocol_version = "HTTP/1.1"
+    payloads = []
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        _ContextHandler.payloads.append(payload)
+        context = payload.get("context", []) + [len(_ContextHandler.payloads)]
+        body = json.dumps({"response": "Până la 31 martie.", "done": True, "context": context,
+                           "prompt_eval_count": 10, "eval_count": 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_session_context():
+    store = SessionContextStore(enabled=True, max_sessions=2, max_tokens=10)
+
+    # Contextul sesiunii e returnat la tura următoare; cel mai vechi e evacuat (LRU)
+    store.put("a", [1, 2, 3])
+    store.put("b", [4, 5])
+    assert store.get("a") == [1, 2, 3]
+    store.put("c", [6])
+    assert store.get("b") is None and store.get("a") == [1, 2, 3]
+
+    # Un context prea lung e abandonat: conversația continuă de la zero
+    store.put("a", list(range(11)))
+    assert store.get("a") is None and store.stats()["resets"] == 1
+
+    # Tokenii de prompt din cache = lungimea promptului (context - tokeni generați) - tokenii evaluați
+    manager = OllamaClientManager(base_url="http://localhost:1")
+    manager.record_prompt_eval({"prompt_eval_count": 120, "eval_count": 20, "context": list(range(140))})
+    manager.record_prompt_eval({"prompt_eval_count": 30, "eval_count": 20, "context": list(range(160))})
+    manager.record_prompt_eval({"prompt_eval_count": 50}, estimated_prompt_tokens=80)
+    manager.record_prompt_eval({"response": "fără metrici"})
+    stats = manager.prompt_eval_stats()
+    assert stats["responses"] == 3
+    assert stats["prompt_tokens"] == 120 + 140 + 80
+    assert stats["prompt_tokens_saved"] == 110 + 30
+    print("✅ Contextul sesiunii și metricile de evaluare a promptului funcționează!")
+
+def test_session_context_chat():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ContextHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    original_manager, original_contexts = main.ollama_manager, main.session_contexts
+    main.ollama_manager = OllamaClientManager(base_url=f"http://127.0.0.1:{server.server_address[1]}")
+    main.session_contexts = SessionContextStore(enabled=True)
+
+    async def conversation():
+        transport = httpx.ASGITransport(app=main.app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                # Prima tură (fără session_id): fără context trimis, dar contextul răspunsului e păstrat
+                first = (await client.post("/api/chat", json={"content": "Până când plătesc impozitul pe clădiri?"})).json()
+                second = (await client.post("/api/chat", json={"content": "Și pentru teren?",
+                                                               "session_id": first["session_id"]})).json()
+                third = (await client.post("/api/chat", json={"content": "Și pentru teren?"})).json()
+            return first, second, third
+        finally:
+            await main.ollama_manager.shutdown()
+
+    try:
+        first, second, third = asyncio.run(conversation())
+        first_payload, second_payload, third_payload = _ContextHandler.payloads
+        assert "context" not in first_payload
+        # A doua tură continuă din contextul primei ture; o conversație nouă nu preia nimic
+        assert second["session_id"] == first["session_id"] and second_payload["context"] == [1]
+        assert third["session_id"] != first["session_id"] and "context" not in third_payload
+        assert main.session_contexts.get(first["session_id"]) == [1, 2]
+        assert main.session_contexts.stats()["sessions"] == 2
+
+        # Promptul de sistem e trimis separat, cu keep_alive
+        assert all(payload["system"] == main.SYSTEM_PROMPT for payload in _ContextHandler.payloads)
+        assert all(payload["keep_alive"] == main.ollama_manager.keep_alive for payload in _ContextHandler.payloads)
+        print("✅ Contextul sesiunii continuă conversația din prima tură!")
+    finally:
+        main.ollama_manager, main.session_contexts = original_manager, original_contexts
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_session_context()
+    test_session_context_chat()
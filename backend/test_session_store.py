@@ -0,0 +1,114 @@
+import asyncio
+import os
+import tempfile
+from datetime import datetime
+
+# Înainte de importul main: fără snapshot pe disc și fără reîmprospătare în fundal
+os.environ["RAG_SNAPSHOT_PATH"] = ""
+os.environ["SOURCE_REFRESH_INTERVAL"] = "0"
+
+from fastapi.testclient import TestClient
+
+import main
+from services.session_store import SessionStore
+
+# models.database creează engine-ul la import; testul folosește propriul SQLite în locul PostgreSQL
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.database import Base, Message
+
+MUNICIPALITY = main.municipalities_db["localhost:8000"]
+
+def _message(role: str, content: str) -> dict:
+    message = {"role": role, "content": content, "timestamp": datetime.now()}
+    if role == "assistant":
+        message["sources"] = ["HCL 45/2024"]
+    return message
+
+def test_session_store():
+    # LRU: sesiunea folosită cel mai demult este evacuată prima
+    async def lru():
+        store = SessionStore(max_sessions=2, ttl_seconds=60)
+        store.append_message("a", MUNICIPALITY, _message("user", "1"))
+        store.append_message("b", MUNICIPALITY, _message("user", "2"))
+        assert await store.get_conversation("a") is not None
+        store.append_message("c", MUNICIPALITY, _message("user", "3"))
+        assert "a" in store and "b" not in store and "c" in store
+        assert store.stats()["evictions"] == 1
+
+        # TTL: task-ul de fundal scoate sesiunile inactive
+        expiring = SessionStore(max_sessions=10, ttl_seconds=0.05, flush_interval=0.02)
+        expiring.append_message("a", MUNICIPALITY, _message("user", "1"))
+        await expiring.start()
+        await asyncio.sleep(0.2)
+        await expiring.stop()
+        assert len(expiring) == 0 and expiring.stats()["evictions"] == 1
+
+    asyncio.run(lru())
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/sessions.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def stored_messages() -> int:
+            db = session_factory()
+            try:
+                return db.query(Message).count()
+            finally:
+                db.close()
+
+        # Write-behind: adăugarea nu scrie în baza de date; batch-ul plin trezește scrierea
+        async def write_behind():
+            store = SessionStore(max_sessions=10, ttl_seconds=60, flush_interval=30, batch_size=3)
+            store.enable_persistence(session_factory)
+            await store.start()
+            store.append_message("s1", MUNICIPALITY, _message("user", "Până când plătesc?"))
+            store.mark_new("s1")
+            store.append_message("s1", MUNICIPALITY, _message("assistant", "Până la 31 martie."))
+            await asyncio.sleep(0.1)
+            assert store.stats()["pending_writes"] == 2 and stored_messages() == 0
+
+            store.append_message("s2", MUNICIPALITY, _message("user", "Ce bonificație primesc?"))
+            for _ in range(50):
+                if store.stats()["flushed_messages"] == 3:
+                    break
+                await asyncio.sleep(0.02)
+            assert stored_messages() == 3 and store.stats()["flushed_messages"] == 3
+
+            # La oprire se scriu mesajele rămase în coadă
+            store.append_message("s2", MUNICIPALITY, _message("assistant", "10%."))
+            await store.stop()
+            assert stored_messages() == 4 and store.stats()["pending_writes"] == 0
+
+        asyncio.run(write_behind())
+
+        # O sesiune evacuată din memorie se reîncarcă din baza de date prin /api/chat/history
+        original_store = main.conversations_db
+        main.conversations_db = SessionStore(max_sessions=1, ttl_seconds=60)
+        main.conversations_db.enable_persistence(session_factory)
+        try:
+            client = TestClient(main.app)
+            assert client.get("/api/chat/history/s1").status_code == 200
+            assert "s1" in main.conversations_db and "s2" not in main.conversations_db
+
+            history = client.get("/api/chat/history/s2").json()
+            assert history["municipality"] == MUNICIPALITY["name"]
+            assert [(m["role"], m["content"]) for m in history["messages"]] == [
+                ("user", "Ce bonificație primesc?"), ("assistant", "10%.")
+            ]
+            assert history["messages"][1]["sources"] == ["HCL 45/2024"]
+            assert main.conversations_db.stats()["reloads"] == 2
+            assert "s1" not in main.conversations_db
+
+            assert client.get("/api/chat/history/necunoscuta").status_code == 404
+        finally:
+            main.conversations_db = original_store
+            engine.dispose()
+    print("✅ Session store-ul funcționează!")
+
+if __name__ == "__main__":
+    test_session_store()
@@ -0,0 +1,72 @@
+import asyncio
+import functools
+import os
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from ai.crawler import Crawler
+from ai.site_crawler import SiteCrawler, normalize_url
+
+PAGES = {
+    "index.html": ['a.html', 'b.html#sectiunea-2', 'a.html?utm_source=newsletter', 'http://example.com/', 'hcl.pdf'],
+    "a.html": ['/c.html'],
+    "b.html": ['index.html'],
+    "c.html": ['d.html'],
+    "d.html": []
+}
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def _make_site(root: str, base: str):
+    for name, links in PAGES.items():
+        anchors = "".join(f'<a href="{link}">link</a>' for link in links)
+        with open(os.path.join(root, name), "w", encoding="utf-8") as f:
+            f.write(f"<html><head><title>{name}</title></head><body>{anchors}</body></html>")
+    with open(os.path.join(root, "sitemap.xml"), "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                + "".join(f"<url><loc>{base}/{name}</loc></url>" for name in ("a.html", "b.html")) + "</urlset>")
+
+def test_site_crawler():
+    assert normalize_url("HTTP://Primaria.RO:80/taxe?b=2&a=1&utm_source=x#top") == "http://primaria.ro/taxe?a=1&b=2"
+    assert normalize_url("mailto:contact@primaria.ro") is None
+
+    with tempfile.TemporaryDirectory() as root:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=root))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        _make_site(root, base)
+        crawler = Crawler(max_workers=4, per_host_rate=0, max_retries=0)
+
+        try:
+            processed = []
+
+            async def handle(url, response):
+                processed.append(url.rsplit("/", 1)[-1])
+
+            # Adâncime 1: doar index și linkurile lui directe, deduplicate, fără domenii externe și PDF
+            result = asyncio.run(SiteCrawler(f"{base}/index.html", handle, max_depth=1, crawler=crawler).run())
+            assert sorted(processed) == ["a.html", "b.html", "index.html"]
+            assert result["finished"] and result["fetched"] == 3
+
+            # Buget de 2 pagini, apoi reluare din frontiera salvată
+            processed.clear()
+            state_path = os.path.join(root, "state", "crawl.json")
+            first = asyncio.run(SiteCrawler(f"{base}/index.html", handle, max_pages=2, crawler=crawler, state_path=state_path).run())
+            assert not first["finished"] and os.path.exists(state_path)
+            second = asyncio.run(SiteCrawler(f"{base}/index.html", handle, max_pages=100, crawler=crawler, state_path=state_path).run())
+            assert second["resumed"] and second["finished"] and not os.path.exists(state_path)
+            assert sorted(processed) == ["a.html", "b.html", "c.html", "d.html", "index.html"]
+
+            # Sitemap: paginile listate sunt punctul de pornire
+            processed.clear()
+            asyncio.run(SiteCrawler(f"{base}/sitemap.xml", handle, max_depth=0, crawler=crawler).run())
+            assert sorted(processed) == ["a.html", "b.html"]
+            print("✅ Crawler-ul de site funcționează!")
+        finally:
+            server.shutdown()
+
+if __name__ == "__main__":
+    test_site_crawler()
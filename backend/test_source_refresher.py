@@ -0,0 +1,123 @@
+import asyncio
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Înainte de importul main: fără snapshot implicit și fără reîmprospătare în fundal
+os.environ["RAG_SNAPSHOT_PATH"] = ""
+os.environ["SOURCE_REFRESH_INTERVAL"] = "0"
+
+from main import IntegratedRAGSystem
+from services.source_refresher import SourceRefresher
+
+def _body(article: str) -> bytes:
+    paragraphs = "".join(
+        f"<p>Art. {i}. - Impozitul pe clădiri se plătește anual, în două rate egale, până la 31 martie. {article}</p>"
+        for i in range(1, 4)
+    )
+    return f"<html><head><title>HCL {article}</title></head><body>{paragraphs}</body></html>".encode("utf-8")
+
+class _Handler(BaseHTTPRequestHandler):
+    # path -> {"body", "etag", "conditional" (răspunde 304 la If-None-Match), "status"}
+    pages = {}
+    requests = []  # (path, If-None-Match primit)
+    lock = threading.Lock()
+
+    def do_GET(self):
+        page = _Handler.pages[self.path]
+        if_none_match = self.headers.get("If-None-Match")
+        with _Handler.lock:
+            _Handler.requests.append((self.path, if_none_match))
+
+        if page.get("status", 200) != 200:
+            self.send_response(page["status"])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if page.get("conditional") and if_none_match == page["etag"]:
+            self.send_response(304)
+            self.send_header("ETag", page["etag"])
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", page["etag"])
+        self.send_header("Content-Length", str(len(page["body"])))
+        self.end_headers()
+        self.wfile.write(page["body"])
+
+    def log_message(self, *args):
+        pass
+
+def _if_none_match(path: str):
+    """If-None-Match trimis la ultima cerere pentru path"""
+    return [header for request_path, header in _Handler.requests if request_path == path][-1]
+
+def test_source_refresher():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    _Handler.pages.update({
+        "/etag": {"body": _body("etag"), "etag": '"e1"', "conditional": True},
+        "/rotating": {"body": _body("rotating"), "etag": '"v1"'},
+        "/changed": {"body": _body("vechi"), "etag": '"c1"'},
+        "/gone": {"body": _body("gone"), "etag": '"g1"'},
+        "/titled": {"body": _body("titlu"), "etag": '"t1"'},
+    })
+    urls = [f"{base}{path}" for path in ("/etag", "/rotating", "/changed", "/gone")]
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot = os.path.join(directory, "rag.bin")
+            rag = IntegratedRAGSystem(snapshot_path=snapshot)
+            assert asyncio.run(rag.process_multiple_html_urls(urls, "1"))["successful"] == 4
+            titled = asyncio.run(rag.process_html_url(f"{base}/titled", "1", "Regulament taxe locale"))
+            assert titled["success"] and rag.documents[titled["document_id"]]["title"] == "Regulament taxe locale"
+            changed_id = rag.url_index[("1", f"{base}/changed")]
+            generation = rag.get_index_generation("1")
+
+            # /etag răspunde 304, /rotating trimite același conținut cu alt ETag,
+            # /changed are conținut nou, /gone a dispărut
+            _Handler.pages["/rotating"]["etag"] = '"v2"'
+            _Handler.pages["/changed"].update(body=_body("nou"), etag='"c2"')
+            _Handler.pages["/gone"]["status"] = 404
+            _Handler.pages["/titled"].update(body=_body("titlu nou"), etag='"t2"')
+
+            refresher = SourceRefresher(rag, interval=0)
+            run = asyncio.run(refresher.refresh())
+            assert (run["checked"], run["unchanged"], run["updated"], run["failed"]) == (5, 2, 2, 1)
+            assert _if_none_match("/etag") == '"e1"' and _if_none_match("/rotating") == '"v1"'
+            assert "/gone" in run["errors"][0]
+
+            # Același id pentru pagina schimbată; doar ea schimbă generația indexului
+            assert rag.url_index[("1", f"{base}/changed")] == changed_id
+            assert "nou" in rag.documents[changed_id]["content"]
+            assert rag.get_index_generation("1") == generation + 4  # ștergere + adăugare, pentru 2 pagini
+            assert rag.documents[rag.url_index[("1", f"{base}/rotating")]]["etag"] == '"v2"'
+
+            # Pagina încărcată cu titlu propriu își păstrează titlul, nu primește <title>-ul paginii
+            titled_doc = rag.documents[titled["document_id"]]
+            assert "titlu nou" in titled_doc["content"] and titled_doc["title"] == "Regulament taxe locale"
+            assert rag.documents[changed_id]["title"] == "HCL nou"
+
+            # După restart, documentele păstrează validatoarele noi: /rotating trimite "v2"
+            restarted = IntegratedRAGSystem(snapshot_path=snapshot)
+            assert restarted.documents[rag.url_index[("1", f"{base}/rotating")]]["etag"] == '"v2"'
+            assert "nou" in restarted.documents[changed_id]["content"]
+            assert restarted.documents[titled["document_id"]]["custom_title"]
+            _Handler.pages["/gone"]["status"] = 200
+
+            _Handler.pages["/titled"].update(body=_body("titlu schimbat"), etag='"t3"')
+
+            run = asyncio.run(SourceRefresher(restarted, interval=0).refresh())
+            assert (run["checked"], run["unchanged"], run["updated"], run["failed"]) == (5, 4, 1, 0)
+            assert _if_none_match("/rotating") == '"v2"' and _if_none_match("/changed") == '"c2"'
+            assert restarted.documents[titled["document_id"]]["title"] == "Regulament taxe locale"
+            assert refresher.stats()["totals"] == {"checked": 5, "unchanged": 2, "updated": 2, "failed": 1}
+        print("✅ Reîmprospătarea surselor funcționează!")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_source_refresher()